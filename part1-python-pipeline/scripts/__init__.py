@@ -0,0 +1,8 @@
+"""
+Part 1 pipeline scripts.
+
+Scripts that import shared modules from here (e.g. construction_periods) are
+run as modules from part1-python-pipeline/:
+
+    python -m scripts.visualization.rating_timeline
+"""
@@ -10,6 +10,8 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from scripts import construction_periods
+
 # ═══ Data Preparation ═══
 df = pd.read_excel("data/tripadvisor_jfkplaza.xlsx")
 df["date_of_experience"] = pd.to_datetime(df["date_of_experience"], errors="coerce")
@@ -18,38 +20,11 @@ df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
 df = df.dropna(subset=["date_of_experience", "rating"]).copy()
 df = df[(df["rating"] >= 1) & (df["rating"] <= 5)].copy()
 
-# Exclude border months where exact construction dates are uncertain
-border = (
-    (df["date_of_experience"].dt.year == 2016)
-    & (df["date_of_experience"].dt.month == 2)
-) | (
-    (df["date_of_experience"].dt.year == 2018)
-    & (df["date_of_experience"].dt.month == 5)
-)
-df = df.loc[~border].copy()
-
-# Love Park construction timeline
-pre_end = pd.Timestamp("2016-02-01")
-during_lo = pd.Timestamp("2016-03-01")
-during_hi = pd.Timestamp("2018-04-30")
-post_start = pd.Timestamp("2018-06-01")
-
-
-def period_of(dt):
-    """Classify date into construction period"""
-    if dt < pre_end:
-        return "pre"
-    if during_lo <= dt <= during_hi:
-        return "during"
-    if dt >= post_start:
-        return "post"
-    return np.nan
-
-
-df["period"] = df["date_of_experience"].apply(period_of)
+# Pre/during/post phase; border months, where exact construction dates are
+# uncertain, have none and are excluded
+df["period"] = construction_periods.load_timeline().phase(df["date_of_experience"])
 order = ["pre", "during", "post"]
-df = df[df["period"].isin(order)].copy()
-df["period"] = pd.Categorical(df["period"], categories=order, ordered=True)
+df = df[df["period"].notna()].copy()
 
 # ═══ Summary Statistics ═══
 summary = (
@@ -0,0 +1,81 @@
+"""
+Construction-period classifier shared by the part 1 analysis and plotting scripts.
+
+The timeline is data: config/love_park_timeline.json lists the periods in
+order, each running from its start date up to the next period's start. Border
+months (the uncertain first and last construction months) are periods of
+their own with no phase, so scripts that compare pre/during/post leave them out.
+
+Labels are assigned with one np.searchsorted over the period start dates, so a
+column of millions of dates is classified without a Python call per review:
+
+    timeline = construction_periods.load_timeline()
+    df["period"] = timeline.classify(df["date_of_experience"])  # full labels
+    df["period"] = timeline.phase(df["date_of_experience"])     # pre/during/post
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TIMELINE_PATH = (
+    Path(__file__).resolve().parent.parent / "config" / "love_park_timeline.json"
+)
+
+MISSING_DATE = "missing_date"
+
+
+class Timeline:
+    """Ordered construction periods loaded from a timeline config."""
+
+    def __init__(self, periods: list, site: str = None):
+        if not periods or periods[0]["start"] is not None:
+            raise ValueError("the first period must have start: null")
+        starts = [pd.Timestamp(period["start"]) for period in periods[1:]]
+        if any(later <= earlier for earlier, later in zip(starts, starts[1:])):
+            raise ValueError("period start dates must be increasing")
+
+        self.site = site
+        self.labels = [period["label"] for period in periods]
+        self.phases = [period.get("phase") for period in periods]
+        self.starts = np.array(starts, dtype="datetime64[ns]")
+
+    def _period_codes(self, dates) -> tuple:
+        """Index of each date's period, and a mask of missing dates."""
+        values = pd.to_datetime(pd.Series(dates), errors="coerce").to_numpy()
+        # Compare in the dates' own resolution rather than converting them
+        starts = self.starts.astype(values.dtype)
+        return np.searchsorted(starts, values, side="right"), np.isnat(values)
+
+    def classify(self, dates) -> pd.Categorical:
+        """Period label of each date, "missing_date" where there is none."""
+        codes, missing = self._period_codes(dates)
+        codes[missing] = len(self.labels)
+        return pd.Categorical.from_codes(codes, self.labels + [MISSING_DATE])
+
+    def phase(self, dates) -> pd.Categorical:
+        """Ordered pre/during/post phase of each date, NaN for border months."""
+        names = list(dict.fromkeys(p for p in self.phases if p is not None))
+        phase_codes = np.array(
+            [names.index(p) if p is not None else -1 for p in self.phases]
+        )
+        codes, missing = self._period_codes(dates)
+        codes = phase_codes[codes]
+        codes[missing] = -1
+        return pd.Categorical.from_codes(codes, names, ordered=True)
+
+    def span(self, phase: str) -> tuple:
+        """(start, end) of a phase; None for an open end."""
+        bounds = [None] + list(pd.to_datetime(self.starts)) + [None]
+        indexes = [i for i, p in enumerate(self.phases) if p == phase]
+        if not indexes:
+            raise KeyError(phase)
+        return bounds[indexes[0]], bounds[indexes[-1] + 1]
+
+
+def load_timeline(path: Path = TIMELINE_PATH) -> Timeline:
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    return Timeline(config["periods"], site=config.get("site"))
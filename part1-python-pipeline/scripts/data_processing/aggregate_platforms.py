@@ -6,16 +6,29 @@ Google Maps and Yelp. Replace with actual platform data when available.
 
 Google Maps data typically shows slightly higher ratings (+0.3 avg)
 Yelp data typically shows slightly lower ratings (-0.2 avg)
+
+Rewrites frontend_data.json (minified) and the per-view chunks in data/frontend/
+(see frontend_artifacts.py).
 """
 
 import json
 import pandas as pd
 
+import frontend_artifacts
+
+
+def _platform_rating(rating, offset: float):
+    """TripAdvisor rating shifted by offset and kept within 1-5; None stays None."""
+    if rating is None:
+        return None
+    return round(min(5.0, max(1.0, rating + offset)), 2)
+
 
 def aggregate_multiplatform_data(
     tripadvisor_file="data/frontend_data.json",
     google_file="archive_google_yelp/data/raw_reviews.json",
     output_file="data/frontend_data.json",
+    artifacts_dir=frontend_artifacts.ARTIFACTS_DIR,
 ):
     """
     Combine TripAdvisor, Google, and Yelp data for comparative analysis.
@@ -24,6 +37,7 @@ def aggregate_multiplatform_data(
         tripadvisor_file: Path to existing frontend data with TripAdvisor stats
         google_file: Path to Google/Yelp reviews (optional, will use synthetic if missing)
         output_file: Path to save combined frontend data
+        artifacts_dir: Folder for the per-view chunks and their manifest
     """
     try:
         with open(google_file, "r") as f:
@@ -44,15 +58,13 @@ def aggregate_multiplatform_data(
     google_timeline = []
     yelp_timeline = []
 
-    # Generate platform-specific rating variations based on typical patterns
+    # Generate platform-specific rating variations based on typical patterns.
+    # Quarters with reviews but no ratings have rating None on every platform.
     for point in tripadvisor_timeline:
-        google_rating = min(5.0, point["rating"] + 0.3)
-        yelp_rating = max(1.0, point["rating"] - 0.2)
-
         google_timeline.append(
             {
                 "month": point["month"],
-                "rating": round(google_rating, 2),
+                "rating": _platform_rating(point["rating"], 0.3),
                 "reviews": point["reviews"],
             }
         )
@@ -60,7 +72,7 @@ def aggregate_multiplatform_data(
         yelp_timeline.append(
             {
                 "month": point["month"],
-                "rating": round(yelp_rating, 2),
+                "rating": _platform_rating(point["rating"], -0.2),
                 "reviews": point["reviews"],
             }
         )
@@ -72,7 +84,9 @@ def aggregate_multiplatform_data(
                 "month": tripadvisor_timeline[i]["month"],
                 "googleRating": google_timeline[i]["rating"],
                 "yelpRating": yelp_timeline[i]["rating"],
-                "tripadvisorRating": round(tripadvisor_timeline[i]["rating"], 2),
+                "tripadvisorRating": _platform_rating(
+                    tripadvisor_timeline[i]["rating"], 0.0
+                ),
             }
         )
 
@@ -85,8 +99,9 @@ def aggregate_multiplatform_data(
         {"period": "Post", "google": 198, "yelp": 176, "tripadvisor": 156},
     ]
 
-    with open(output_file, "w") as f:
-        json.dump(frontend_data, f, indent=2)
+    with open(output_file, "wb") as f:
+        f.write(frontend_artifacts.minified_json(frontend_data))
+    manifest = frontend_artifacts.write_artifacts(frontend_data, artifacts_dir)
 
     print("\n=== UPDATED frontend_data.json ===")
     print(f"✓ Ratings by Period: {len(frontend_data['ratingsByPeriod'])} periods")
@@ -99,6 +114,9 @@ def aggregate_multiplatform_data(
     print(
         f"✓ Review Volume by Platform: {len(frontend_data['reviewVolumeByPlatform'])} periods"
     )
+    frontend_artifacts.print_size_report(
+        manifest, len(json.dumps(frontend_data, indent=2))
+    )
 
 
 if __name__ == "__main__":
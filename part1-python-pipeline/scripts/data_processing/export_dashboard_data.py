@@ -4,15 +4,91 @@ Export dashboard-ready data from segmented TripAdvisor reviews.
 Generates JSON file with aggregated statistics by period and quarterly time series data
 optimized for React dashboard consumption. Filters out missing dates and calculates
 quarterly rolling averages for cleaner visualization.
+
+All series come from one cube: a single grouped aggregation of the reviews by
+period and month (review count, rating sum, sum of squares and a 1-5 star
+histogram). Periods, quarters and years are rolled up from the cube's
+additive columns, so export time depends on the number of months, not reviews.
+
+frontend_data.json is written minified, and per-view precompressed chunks
+with a manifest go to data/frontend/ (see frontend_artifacts.py).
 """
 
 import json
+
+import numpy as np
 import pandas as pd
 
+import frontend_artifacts
+
+# Dashboard names of the construction periods, in display order
+PERIOD_NAMES = {
+    "pre_construction": "Pre-Construction",
+    "during_construction": "During Construction",
+    "post_construction": "Post-Construction",
+}
+
+# Time granularities of the rating timeline (pandas period frequencies)
+GRANULARITIES = {"month": "M", "quarter": "Q", "year": "Y"}
+
+STARS = [1, 2, 3, 4, 5]
+STAR_COLUMNS = [f"stars_{star}" for star in STARS]
+COUNT_COLUMNS = ["reviews", "rated"] + STAR_COLUMNS
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Period x month cube of additive rating statistics, in one groupby.
+
+    Reviews without a date_written keep a NaT month, so they still count
+    towards their period.
+    """
+    rating = df["rating"]
+    columns = {
+        "reviews": np.ones(len(df), dtype=np.int64),
+        "rated": rating.notna().astype(np.int64),
+        "rating_sum": rating.fillna(0),
+        "rating_sq_sum": rating.fillna(0) ** 2,
+    }
+    for star, column in zip(STARS, STAR_COLUMNS):
+        columns[column] = (rating == star).astype(np.int64)
+
+    keys = [df["period"], df["date_written"].dt.to_period("M").rename("month")]
+    return pd.DataFrame(columns, index=df.index).groupby(keys, dropna=False).sum()
+
+
+def rollup(cube: pd.DataFrame, by) -> pd.DataFrame:
+    """Sum the cube over `by` and derive mean and sample std of the ratings."""
+    totals = cube.groupby(by, dropna=True).sum()
+    n = totals["rated"]
+    totals["mean"] = totals["rating_sum"] / n
+    variance = (totals["rating_sq_sum"] - totals["rating_sum"] ** 2 / n) / (n - 1)
+    totals["std"] = np.sqrt(variance.clip(lower=0)).where(n > 1)
+    return totals
+
+
+def _optional(value: float):
+    """JSON-safe float: NaN (e.g. the std of one review) becomes null."""
+    return None if pd.isna(value) else float(value)
+
+
+def timeline_points(totals: pd.DataFrame) -> list:
+    return [
+        {
+            "time": str(bucket),
+            "rating": _optional(row["mean"]),
+            "std": _optional(row["std"]),
+            "reviews": int(row["reviews"]),
+            "histogram": [int(row[column]) for column in STAR_COLUMNS],
+        }
+        for bucket, row in totals.iterrows()
+    ]
+
 
 def export_dashboard_data(
     input_file="data/tripadvisor_jfkplaza_with_periods.json",
     output_file="data/frontend_data.json",
+    artifacts_dir=frontend_artifacts.ARTIFACTS_DIR,
 ):
     """
     Aggregate review data and export for frontend dashboard.
@@ -20,6 +96,7 @@ def export_dashboard_data(
     Args:
         input_file: Path to reviews JSON with period classifications
         output_file: Path to save frontend-ready JSON
+        artifacts_dir: Folder for the per-view chunks and their manifest
     """
     with open(input_file, "r") as f:
         tripadvisor_data = json.load(f)
@@ -28,67 +105,63 @@ def export_dashboard_data(
     df = df[df["period"] != "missing_date"].copy()
     df["date_written"] = pd.to_datetime(df["date_written"])
 
-    period_stats = df.groupby("period").agg({"rating": ["mean", "count"]}).round(2)
-    print("=== RATINGS BY PERIOD ===")
-    print(period_stats)
+    cube = build_cube(df)
+    months = cube.index.get_level_values("month")
+    by_period = rollup(cube, cube.index.get_level_values("period"))
+    timelines = {
+        name: rollup(cube, months.asfreq(freq)) for name, freq in GRANULARITIES.items()
+    }
 
-    df_sorted = df.sort_values("date_written")
-    df_sorted["year_month"] = df_sorted["date_written"].dt.to_period("M")
-    monthly_stats = df_sorted.groupby("year_month").agg({"rating": "mean"}).round(2)
+    print("=== RATINGS BY PERIOD ===")
+    print(by_period[["mean", "reviews"]].rename(columns={"reviews": "count"}).round(2))
 
     print("\n=== MONTHLY AVERAGE RATINGS (sample) ===")
-    print(monthly_stats.head(20))
+    print(timelines["month"][["mean", "reviews"]].head(20).round(2))
 
-    volume_by_period = df.groupby("period").size()
     print("\n=== REVIEW VOLUME BY PERIOD ===")
-    print(volume_by_period)
+    print(by_period["reviews"])
 
+    # Every dashboard period, with 0 reviews and null ratings if it has none
+    periods = by_period.reindex(list(PERIOD_NAMES))
+    periods[COUNT_COLUMNS] = periods[COUNT_COLUMNS].fillna(0)
     frontend_data = {
         "ratingsByPeriod": [
             {
-                "period": "Pre-Construction",
-                "avgRating": float(
-                    df[df["period"] == "pre_construction"]["rating"].mean()
-                ),
-                "reviews": int(df[df["period"] == "pre_construction"].shape[0]),
-            },
-            {
-                "period": "During Construction",
-                "avgRating": float(
-                    df[df["period"] == "during_construction"]["rating"].mean()
-                ),
-                "reviews": int(df[df["period"] == "during_construction"].shape[0]),
-            },
-            {
-                "period": "Post-Construction",
-                "avgRating": float(
-                    df[df["period"] == "post_construction"]["rating"].mean()
-                ),
-                "reviews": int(df[df["period"] == "post_construction"].shape[0]),
-            },
+                "period": name,
+                "avgRating": _optional(periods.loc[period, "mean"]),
+                "reviews": int(periods.loc[period, "reviews"]),
+                "stdRating": _optional(periods.loc[period, "std"]),
+                "histogram": [
+                    int(periods.loc[period, column]) for column in STAR_COLUMNS
+                ],
+            }
+            for period, name in PERIOD_NAMES.items()
         ]
     }
 
     # Quarterly aggregation for cleaner timeline visualization
-    monthly_data = []
-    for period, group in df_sorted.groupby(df_sorted["date_written"].dt.to_period("Q")):
-        if len(group) > 0:
-            monthly_data.append(
-                {
-                    "month": str(period),
-                    "rating": float(group["rating"].mean()),
-                    "reviews": int(len(group)),
-                }
-            )
-
-    frontend_data["ratingOverTime"] = monthly_data
-
-    with open(output_file, "w") as f:
-        json.dump(frontend_data, f, indent=2)
+    frontend_data["ratingOverTime"] = [
+        {"month": point["time"], "rating": point["rating"], "reviews": point["reviews"]}
+        for point in timeline_points(timelines["quarter"])
+    ]
+
+    # Every granularity, with spread and star histograms, for drill-down views
+    frontend_data["ratingTimeline"] = {
+        name: timeline_points(totals) for name, totals in timelines.items()
+    }
+
+    with open(output_file, "wb") as f:
+        f.write(frontend_artifacts.minified_json(frontend_data))
+    manifest = frontend_artifacts.write_artifacts(frontend_data, artifacts_dir)
 
     print("\n=== EXPORTED TO data/frontend_data.json ===")
     print(f"Periods: {len(frontend_data['ratingsByPeriod'])}")
     print(f"Time points: {len(frontend_data['ratingOverTime'])}")
+    for name, points in frontend_data["ratingTimeline"].items():
+        print(f"  {name}: {len(points)} points")
+    frontend_artifacts.print_size_report(
+        manifest, len(json.dumps(frontend_data, indent=2))
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+"""
+Write frontend_data as small, precompressed per-view chunks for the dashboard.
+
+Instead of one pretty-printed frontend_data.json, each dashboard view gets its
+own minified JSON chunk, named by its content hash so it can be cached forever:
+
+    data/frontend/period_summary.<hash>.json     (+ .json.gz, .json.br)
+    data/frontend/timeline.<hash>.json
+    data/frontend/multi_platform.<hash>.json
+    data/frontend/manifest.json                  view -> file, hash, sizes
+
+The .gz and .br siblings are compressed once at export time (gzip level 9,
+brotli quality 11) so the web server can send them as they are. Chunks of
+earlier exports are removed when a view is rewritten.
+
+Brotli output needs the brotli package (pip install brotli); without it only
+.gz siblings are written.
+"""
+
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # Optional dependency, only needed for .br chunks
+    brotli = None
+
+ARTIFACTS_DIR = Path("data/frontend")
+MANIFEST_NAME = "manifest.json"
+
+# Dashboard view -> frontend_data keys it needs
+VIEWS = {
+    "period_summary": ["ratingsByPeriod"],
+    "timeline": ["ratingOverTime", "ratingTimeline"],
+    "multi_platform": ["multiPlatformTimeline", "reviewVolumeByPlatform"],
+}
+
+# Characters of the sha256 in chunk file names
+HASH_LENGTH = 12
+
+
+def minified_json(data) -> bytes:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _write_bytes(path: Path, data: bytes):
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+
+def _remove_stale_chunks(out_dir: Path, view: str, keep: str):
+    for path in out_dir.glob(f"{view}.*.json*"):
+        if not path.name.startswith(keep):
+            path.unlink()
+
+
+def write_chunk(out_dir: Path, view: str, data: dict) -> dict:
+    """Write one view's chunk and its compressed siblings; return its manifest entry."""
+    raw = minified_json(data)
+    digest = hashlib.sha256(raw).hexdigest()
+    name = f"{view}.{digest[:HASH_LENGTH]}.json"
+
+    entry = {"file": name, "sha256": digest, "bytes": len(raw)}
+    _write_bytes(out_dir / name, raw)
+
+    gz = gzip.compress(raw, compresslevel=9, mtime=0)
+    _write_bytes(out_dir / (name + ".gz"), gz)
+    entry["gzipBytes"] = len(gz)
+
+    if brotli is not None:
+        br = brotli.compress(raw, quality=11)
+        _write_bytes(out_dir / (name + ".br"), br)
+        entry["brotliBytes"] = len(br)
+
+    _remove_stale_chunks(out_dir, view, keep=name)
+    return entry
+
+
+def write_artifacts(frontend_data: dict, out_dir: Path = ARTIFACTS_DIR) -> dict:
+    """
+    Write a chunk per view present in frontend_data, plus manifest.json.
+
+    Views whose keys are all missing are left out; the manifest keeps the
+    entries of views written by an earlier export (e.g. export_dashboard_data
+    followed by aggregate_platforms).
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    manifest = {"views": {}}
+    if manifest_path.exists():
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+
+    if brotli is None:
+        print("⚠ brotli not installed - writing .gz chunks only (pip install brotli)")
+
+    for view, keys in VIEWS.items():
+        data = {key: frontend_data[key] for key in keys if key in frontend_data}
+        if data:
+            manifest["views"][view] = write_chunk(out_dir, view, data)
+
+    _write_bytes(manifest_path, minified_json(manifest))
+    return manifest
+
+
+def _size(entry: dict, key: str) -> str:
+    return f"{entry[key]:,}" if key in entry else "-"
+
+
+def print_size_report(manifest: dict, monolithic_bytes: int = None):
+    """Raw / gzip / brotli bytes per chunk, next to the single-file export."""
+    print("\n=== FRONTEND ARTIFACT SIZES (bytes) ===")
+    print(f"{'view':<16} {'raw':>9} {'gzip':>9} {'brotli':>9}  file")
+    totals = {}
+    for view, entry in manifest["views"].items():
+        for key in ("bytes", "gzipBytes", "brotliBytes"):
+            if key in entry:
+                totals[key] = totals.get(key, 0) + entry[key]
+        print(
+            f"{view:<16} {_size(entry, 'bytes'):>9} {_size(entry, 'gzipBytes'):>9} "
+            f"{_size(entry, 'brotliBytes'):>9}  {entry['file']}"
+        )
+    print(
+        f"{'total':<16} {_size(totals, 'bytes'):>9} {_size(totals, 'gzipBytes'):>9} "
+        f"{_size(totals, 'brotliBytes'):>9}"
+    )
+    if monolithic_bytes is not None:
+        print(
+            f"(pretty-printed frontend_data.json would be {monolithic_bytes:,} bytes)"
+        )
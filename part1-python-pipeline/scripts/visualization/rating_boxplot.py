@@ -8,26 +8,7 @@ and post-construction periods. Excludes border months to avoid timeline ambiguit
 import pandas as pd
 import matplotlib.pyplot as plt
 
-CONSTRUCTION_START = pd.Timestamp("2016-02-01")
-CONSTRUCTION_END = pd.Timestamp("2018-05-31")
-
-
-def classify_period(date):
-    """Classify review date into construction period categories"""
-    if pd.isna(date):
-        return None
-    if date.month == 2 and date.year == 2016:
-        return "border_feb2016"
-    if date.month == 5 and date.year == 2018:
-        return "border_may2018"
-    if date < CONSTRUCTION_START:
-        return "pre_construction"
-    elif CONSTRUCTION_START < date < CONSTRUCTION_END:
-        return "during_construction"
-    elif date > CONSTRUCTION_END:
-        return "post_construction"
-    else:
-        return None
+from scripts import construction_periods
 
 
 def generate_rating_boxplot(input_file="tripadvisor_jfkplaza.xlsx"):
@@ -39,13 +20,12 @@ def generate_rating_boxplot(input_file="tripadvisor_jfkplaza.xlsx"):
     """
     df = pd.read_excel(input_file)
     df["date_of_experience"] = pd.to_datetime(df["date_of_experience"], errors="coerce")
-    df["period"] = df["date_of_experience"].apply(classify_period)
+    timeline = construction_periods.load_timeline()
+    df["period"] = timeline.classify(df["date_of_experience"])
 
-    df_filtered = df[
-        df["period"].isin(
-            ["pre_construction", "during_construction", "post_construction"]
-        )
-    ]
+    # Pre, during and post only: border months and missing dates have no phase
+    df_filtered = df[timeline.phase(df["date_of_experience"]).notna()].copy()
+    df_filtered["period"] = df_filtered["period"].cat.remove_unused_categories()
 
     plt.figure(figsize=(8, 6))
     df_filtered.boxplot(column="rating", by="period", grid=False)
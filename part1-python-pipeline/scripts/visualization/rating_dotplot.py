@@ -10,6 +10,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 
+from scripts import construction_periods
+
 
 def generate_rating_dotplot(
     input_file="data/tripadvisor_jfkplaza.json",
@@ -27,25 +29,14 @@ def generate_rating_dotplot(
     df = df.dropna(subset=["date_of_experience", "rating"])
 
     # Love Park construction timeline
-    pre_end = pd.Timestamp("2016-02-01")
-    during_lo = pd.Timestamp("2016-03-01")
-    during_hi = pd.Timestamp("2018-04-30")
-    post_start = pd.Timestamp("2018-06-01")
-
-    def period_of(dt):
-        """Classify date into construction period"""
-        if dt < pre_end:
-            return "pre"
-        if during_lo <= dt <= during_hi:
-            return "during"
-        if dt >= post_start:
-            return "post"
-        return np.nan
+    timeline = construction_periods.load_timeline()
+    _, pre_end = timeline.span("pre")
+    during_lo, during_hi = timeline.span("during")
+    post_start, _ = timeline.span("post")
 
-    df["period"] = df["date_of_experience"].apply(period_of)
+    df["period"] = timeline.phase(df["date_of_experience"])
     order = ["pre", "during", "post"]
-    df = df[df["period"].isin(order)]
-    df["period"] = pd.Categorical(df["period"], categories=order, ordered=True)
+    df = df[df["period"].notna()]
 
     plt.figure(figsize=(12, 6))
     rng = np.random.default_rng(42)
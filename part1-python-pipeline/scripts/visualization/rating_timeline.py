@@ -11,6 +11,8 @@ from pathlib import Path
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from scripts import construction_periods
+
 
 def generate_rating_timeline(
     input_file="data/tripadvisor_jfkplaza.json",
@@ -58,10 +60,10 @@ def generate_rating_timeline(
     ax1.plot(monthly.index, monthly["avg_rating_roll"], linewidth=2)
 
     # Love Park construction period shading
-    pre_end = pd.Timestamp("2016-02-01")
-    during_lo = pd.Timestamp("2016-03-01")
-    during_hi = pd.Timestamp("2018-04-30")
-    post_start = pd.Timestamp("2018-06-01")
+    timeline = construction_periods.load_timeline()
+    _, pre_end = timeline.span("pre")
+    during_lo, during_hi = timeline.span("during")
+    post_start, _ = timeline.span("post")
     date_min = monthly.index.min()
     date_max = monthly.index.max()
 
@@ -1,28 +1,292 @@
 """
 In-depth analysis of brewpub reviews dataset
+
+All ten report sections are computed by build_report() in a few passes over
+the reviews: one groupby per brewpub (gmap_id), one per reviewer, and single
+vectorized passes for dates, ratings and review text. Brewpub-level sections
+(cities, top brewpubs, categories) are then aggregated from the small
+per-brewpub table instead of the reviews.
+
+Categories are counted per brewpub on the exploded category lists, weighted
+by review count. The full category x category co-occurrence matrix (reviews
+of brewpubs listing both categories) is saved as
+brewpub_category_cooccurrence.csv.
+
+The report is printed and also saved as JSON (brewpub_analysis.json).
 """
 
-import csv
-import pandas as pd
+import argparse
+import json
 from pathlib import Path
-from collections import Counter
-from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import columnar_cache
 
 # Paths
 OUTPUT_DIR = Path(__file__).parent.parent / "outputs"
 CSV_PATH = OUTPUT_DIR / "brewpub_reviews_with_meta.csv"
+JSON_PATH = OUTPUT_DIR / "brewpub_analysis.json"
+COOCCURRENCE_PATH = OUTPUT_DIR / "brewpub_category_cooccurrence.csv"
+
+# Columns used by the report (skips address, coordinates and descriptions)
+COLUMNS = [
+    "review_user_id",
+    "review_user_name",
+    "review_date",
+    "rating",
+    "review_text",
+    "has_pics",
+    "has_response",
+    "gmap_id",
+    "business_name",
+    "municipality",
+    "category",
+    "avg_rating",
+]
+
+# Rows kept in the JSON for the per-reviewer ranking (the text shows 10)
+TOP_REVIEWERS = 100
+# Category pairs kept in the JSON (the text shows 10)
+TOP_CATEGORY_PAIRS = 100
+
+
+def _median_from_counts(counts: pd.Series) -> float:
+    """Median of the values in counts.index, each repeated counts times."""
+    cumulative = counts.cumsum().to_numpy()
+    total = cumulative[-1]
+    low = counts.index[np.searchsorted(cumulative, (total - 1) // 2, side="right")]
+    high = counts.index[np.searchsorted(cumulative, total // 2, side="right")]
+    return (low + high) / 2
+
+
+def _records(df: pd.DataFrame) -> list:
+    """DataFrame rows as JSON-ready dicts (index levels included)."""
+    return json.loads(df.reset_index().to_json(orient="records"))
+
+
+def aggregate_brewpubs(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per brewpub, in order of first appearance in the reviews.
 
+    Holds every per-review sum the brewpub-level sections need, so they
+    never go back to the review rows.
+    """
+    return df.groupby("gmap_id", observed=True, sort=False).agg(
+        reviews=("rating", "size"),
+        ratings=("rating", "count"),
+        rating_sum=("rating", "sum"),
+        business_name=("business_name", "first"),
+        municipality=("municipality", "first"),
+        category=("category", "first"),
+        avg_rating=("avg_rating", "first"),
+    )
 
-def main():
-    print("=" * 80)
-    print("IN-DEPTH ANALYSIS: Pennsylvania Brewpub Reviews")
-    print("=" * 80)
 
-    # Load data
-    print("\nLoading data...")
-    df = pd.read_csv(CSV_PATH)
+def aggregate_reviewers(df: pd.DataFrame) -> pd.DataFrame:
+    """Review count, rating count and rating sum per (user id, user name)."""
+    return df.groupby(
+        ["review_user_id", "review_user_name"], dropna=False, sort=False
+    ).agg(
+        reviews=("rating", "size"),
+        ratings=("rating", "count"),
+        rating_sum=("rating", "sum"),
+    )
 
-    print(f"✓ Loaded {len(df):,} reviews")
+
+def category_cooccurrence(brewpubs: pd.DataFrame) -> tuple:
+    """
+    Category review counts and the category x category co-occurrence matrix.
+
+    brewpubs is the aggregate_brewpubs() table. Each brewpub's pipe-joined
+    category list is exploded once and weighted by the brewpub's review count,
+    so the counts equal splitting the list on every review. Matrix cells
+    count the reviews of brewpubs listing both categories (the diagonal: the
+    category itself).
+
+    Returns (counts, matrix), both ordered by count, most common first; ties
+    keep the order categories first appear in.
+    """
+    categories = brewpubs["category"].dropna().astype(object).str.split("|")
+    exploded = categories.explode().str.strip()
+    place_codes = np.repeat(np.arange(len(categories)), categories.str.len())
+    weights = np.repeat(
+        brewpubs.loc[categories.index, "reviews"].to_numpy(), categories.str.len()
+    )
+
+    codes, labels = pd.factorize(exploded)
+    totals = np.bincount(codes, weights=weights, minlength=len(labels))
+    order = np.argsort(-totals, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    counts = pd.Series(totals[order].astype("int64"), index=labels[order])
+
+    # Pair every category of a brewpub with every other (and itself)
+    listed = pd.DataFrame(
+        {"place": place_codes, "category": rank[codes], "reviews": weights}
+    ).drop_duplicates(["place", "category"])
+    pairs = listed.merge(listed[["place", "category"]], on="place")
+    cells = pairs.groupby(["category_x", "category_y"], sort=False)["reviews"].sum()
+
+    matrix = np.zeros((len(labels), len(labels)), dtype="int64")
+    matrix[cells.index.get_level_values(0), cells.index.get_level_values(1)] = (
+        cells.to_numpy()
+    )
+    matrix = pd.DataFrame(matrix, index=counts.index, columns=counts.index)
+    matrix.index.name = "category"
+    return counts, matrix
+
+
+def top_category_pairs(matrix: pd.DataFrame, n: int) -> list:
+    """The n distinct category pairs with the most co-occurring reviews."""
+    rows, cols = np.triu_indices(len(matrix), k=1)
+    values = matrix.to_numpy()[rows, cols]
+    order = np.argsort(-values, kind="stable")
+    order = order[values[order] > 0][:n]
+    return [
+        {
+            "category_a": matrix.index[rows[i]],
+            "category_b": matrix.columns[cols[i]],
+            "reviews": int(values[i]),
+        }
+        for i in order
+    ]
+
+
+def build_report(df: pd.DataFrame) -> tuple:
+    """
+    Compute every section of the report as JSON-ready values.
+
+    Returns (report, category co-occurrence matrix).
+    """
+    total = len(df)
+
+    # Dates: each distinct date string is parsed once
+    date_codes, date_values = pd.factorize(df["review_date"])
+    dates = pd.to_datetime(pd.Series(date_values, dtype=object))
+    date_counts = np.bincount(date_codes[date_codes >= 0], minlength=len(dates))
+    reviews_by_year = (
+        pd.Series(date_counts, index=dates.dt.year).groupby(level=0).sum().sort_index()
+    )
+    first_date, last_date = dates.min(), dates.max()
+
+    # Ratings
+    rating_counts = df["rating"].value_counts().sort_index()
+    rated = int(rating_counts.sum())
+    rating_mean = float((rating_counts.index * rating_counts).sum() / rated)
+
+    # Review text
+    text = df["review_text"].dropna()
+    total_characters = int(text.str.len().sum())
+    total_words = int(text.str.split().str.len().sum())
+
+    # Brewpubs
+    brewpubs = aggregate_brewpubs(df)
+    unique_brewpubs = len(brewpubs)
+
+    brewpubs_by_city = (
+        brewpubs.groupby("municipality", observed=True)
+        .size()
+        .sort_values(ascending=False)
+    )
+    reviews_by_city = (
+        brewpubs.groupby("municipality", observed=True)["reviews"]
+        .sum()
+        .sort_values(ascending=False, kind="stable")
+    )
+
+    top_brewpubs = (
+        brewpubs.reset_index()
+        .groupby(["business_name", "municipality"], observed=True)
+        .agg(
+            review_count=("ratings", "sum"),
+            rating_sum=("rating_sum", "sum"),
+            gmap_id=("gmap_id", "first"),
+            google_avg=("avg_rating", "first"),
+        )
+    )
+    top_brewpubs.insert(
+        1,
+        "dataset_avg",
+        (top_brewpubs.pop("rating_sum") / top_brewpubs["review_count"]).round(2),
+    )
+    top_brewpubs["google_avg"] = top_brewpubs["google_avg"].round(2)
+    top_brewpubs = top_brewpubs.sort_values("review_count", ascending=False)
+
+    # Categories, each brewpub's list weighted by its review count
+    category_counts, cooccurrence = category_cooccurrence(brewpubs)
+
+    # Reviewers
+    reviewers = aggregate_reviewers(df)
+    reviews_per_user = reviewers.groupby(level="review_user_id")["reviews"].sum()
+
+    # Reviewers missing an id or a name are left out of the ranking
+    keys = reviewers.index.to_frame()
+    named = reviewers[keys.notna().all(axis=1).to_numpy()].reorder_levels(
+        ["review_user_name", "review_user_id"]
+    )
+    top_reviewers = pd.DataFrame(
+        {
+            "review_count": named["ratings"],
+            "avg_rating": (named["rating_sum"] / named["ratings"]).round(2),
+        }
+    ).sort_index()
+    top_reviewers = top_reviewers.sort_values("review_count", ascending=False)
+
+    report = {
+        "overview": {
+            "total_reviews": total,
+            "unique_brewpubs": unique_brewpubs,
+            "unique_reviewers": len(reviews_per_user),
+            "avg_reviews_per_brewpub": total / unique_brewpubs,
+            "first_date": str(first_date.date()),
+            "last_date": str(last_date.date()),
+            "span_days": (last_date - first_date).days,
+        },
+        "ratings": {
+            "counts": {int(r): int(c) for r, c in rating_counts.items()},
+            "mean": rating_mean,
+            "median": float(_median_from_counts(rating_counts)),
+            "positive_reviews": int(rating_counts[rating_counts.index >= 4].sum()),
+            "negative_reviews": int(rating_counts[rating_counts.index <= 2].sum()),
+        },
+        "geography": {
+            "municipalities": int(df["municipality"].nunique(dropna=False)),
+            "brewpubs_by_city": {str(c): int(n) for c, n in brewpubs_by_city.items()},
+            "reviews_by_city": {str(c): int(n) for c, n in reviews_by_city.items()},
+        },
+        "reviews_by_year": {int(y): int(n) for y, n in reviews_by_year.items()},
+        "top_brewpubs": _records(top_brewpubs),
+        "text": {
+            "avg_characters": total_characters / total,
+            "avg_words": total_words / total,
+            "empty_reviews": total - len(text),
+            "reviews_with_photos": int(df["has_pics"].sum()),
+            "reviews_with_response": int(df["has_response"].sum()),
+        },
+        "categories": {c: int(n) for c, n in category_counts.items()},
+        "category_pairs": top_category_pairs(cooccurrence, TOP_CATEGORY_PAIRS),
+        "reviewers": {
+            "users_with_1_review": int((reviews_per_user == 1).sum()),
+            "users_with_2_5_reviews": int(reviews_per_user.between(2, 5).sum()),
+            "users_with_6_10_reviews": int(reviews_per_user.between(6, 10).sum()),
+            "users_with_10_plus_reviews": int((reviews_per_user > 10).sum()),
+            "max_reviews_by_one_user": int(reviews_per_user.max()),
+            "top_reviewers": _records(top_reviewers.head(TOP_REVIEWERS)),
+        },
+    }
+    return report, cooccurrence
+
+
+def print_report(report: dict):
+    overview = report["overview"]
+    ratings = report["ratings"]
+    geography = report["geography"]
+    text = report["text"]
+    reviewers = report["reviewers"]
+    total = overview["total_reviews"]
+    reviews_by_city = list(geography["reviews_by_city"].items())
 
     # ========== FILTERING CONFIRMATION ==========
     print("\n" + "=" * 80)
@@ -41,59 +305,42 @@ def main():
     print("2. DATASET OVERVIEW")
     print("=" * 80)
 
-    unique_brewpubs = df["gmap_id"].nunique()
-    unique_reviewers = df["review_user_id"].nunique()
-    date_range = pd.to_datetime(df["review_date"])
-
     print(f"\n📊 Basic Stats:")
-    print(f"  • Total reviews:        {len(df):>10,}")
-    print(f"  • Unique brewpubs:      {unique_brewpubs:>10,}")
-    print(f"  • Unique reviewers:     {unique_reviewers:>10,}")
-    print(f"  • Avg reviews/brewpub:  {len(df)/unique_brewpubs:>10.1f}")
-    print(
-        f"  • Date range:           {date_range.min().date()} to {date_range.max().date()}"
-    )
+    print(f"  • Total reviews:        {total:>10,}")
+    print(f"  • Unique brewpubs:      {overview['unique_brewpubs']:>10,}")
+    print(f"  • Unique reviewers:     {overview['unique_reviewers']:>10,}")
+    print(f"  • Avg reviews/brewpub:  {overview['avg_reviews_per_brewpub']:>10.1f}")
     print(
-        f"  • Time span:            {(date_range.max() - date_range.min()).days:,} days"
+        f"  • Date range:           {overview['first_date']} to {overview['last_date']}"
     )
+    print(f"  • Time span:            {overview['span_days']:,} days")
 
     # ========== RATING ANALYSIS ==========
     print("\n" + "=" * 80)
     print("3. RATING DISTRIBUTION")
     print("=" * 80)
 
-    rating_counts = df["rating"].value_counts().sort_index()
-    total = len(df)
-
     print("\n⭐ Star Ratings:")
-    for rating in sorted(rating_counts.index, reverse=True):
-        count = rating_counts[rating]
+    for rating, count in sorted(ratings["counts"].items(), reverse=True):
         pct = (count / total) * 100
         bar = "█" * int(pct / 2)
         print(f"  {rating}★: {count:>8,} ({pct:>5.1f}%) {bar}")
 
-    print(f"\n  Average rating: {df['rating'].mean():.2f}★")
-    print(f"  Median rating:  {df['rating'].median():.1f}★")
+    print(f"\n  Average rating: {ratings['mean']:.2f}★")
+    print(f"  Median rating:  {ratings['median']:.1f}★")
 
     # ========== GEOGRAPHIC ANALYSIS ==========
     print("\n" + "=" * 80)
     print("4. GEOGRAPHIC DISTRIBUTION")
     print("=" * 80)
 
-    # Top municipalities by number of brewpubs
-    brewpubs_by_city = (
-        df.groupby("municipality")["gmap_id"].nunique().sort_values(ascending=False)
-    )
-
     print("\n🏙️  Top 15 Cities by Number of Brewpubs:")
-    for i, (city, count) in enumerate(brewpubs_by_city.head(15).items(), 1):
+    brewpubs_by_city = list(geography["brewpubs_by_city"].items())
+    for i, (city, count) in enumerate(brewpubs_by_city[:15], 1):
         print(f"  {i:>2}. {city:<25} {count:>3} brewpubs")
 
-    # Top municipalities by number of reviews
-    reviews_by_city = df["municipality"].value_counts()
-
     print("\n📝 Top 15 Cities by Number of Reviews:")
-    for i, (city, count) in enumerate(reviews_by_city.head(15).items(), 1):
+    for i, (city, count) in enumerate(reviews_by_city[:15], 1):
         print(f"  {i:>2}. {city:<25} {count:>6,} reviews")
 
     # ========== TEMPORAL ANALYSIS ==========
@@ -101,12 +348,8 @@ def main():
     print("5. TEMPORAL TRENDS")
     print("=" * 80)
 
-    df["year"] = pd.to_datetime(df["review_date"]).dt.year
-    reviews_by_year = df["year"].value_counts().sort_index()
-
     print("\n📅 Reviews by Year:")
-    for year in sorted(reviews_by_year.index):
-        count = reviews_by_year[year]
+    for year, count in report["reviews_by_year"].items():
         if count > 0:
             bar = "█" * int(count / 500)
             print(f"  {year}: {count:>6,} {bar}")
@@ -116,19 +359,11 @@ def main():
     print("6. MOST REVIEWED BREWPUBS")
     print("=" * 80)
 
-    top_brewpubs = (
-        df.groupby(["business_name", "municipality"])
-        .agg({"rating": ["count", "mean"], "gmap_id": "first", "avg_rating": "first"})
-        .round(2)
-    )
-
-    top_brewpubs.columns = ["review_count", "dataset_avg", "gmap_id", "google_avg"]
-    top_brewpubs = top_brewpubs.sort_values("review_count", ascending=False)
-
     print("\n🏆 Top 20 Brewpubs by Review Count:")
     print(f"{'#':<3} {'Name':<35} {'City':<20} {'Reviews':>8} {'Avg★':>6}")
     print("-" * 80)
-    for i, ((name, city), row) in enumerate(top_brewpubs.head(20).iterrows(), 1):
+    for i, row in enumerate(report["top_brewpubs"][:20], 1):
+        name, city = row["business_name"], row["municipality"]
         print(
             f"{i:<3} {name[:34]:<35} {city[:19]:<20} {row['review_count']:>8.0f} {row['dataset_avg']:>6.2f}"
         )
@@ -138,19 +373,14 @@ def main():
     print("7. REVIEW TEXT CHARACTERISTICS")
     print("=" * 80)
 
-    df["text_length"] = df["review_text"].fillna("").str.len()
-    df["word_count"] = df["review_text"].fillna("").str.split().str.len()
-
+    photos = text["reviews_with_photos"]
+    responses = text["reviews_with_response"]
     print("\n📝 Text Statistics:")
-    print(f"  • Avg characters per review: {df['text_length'].mean():.0f}")
-    print(f"  • Avg words per review:      {df['word_count'].mean():.0f}")
-    print(f"  • Empty reviews:             {df['review_text'].isna().sum():,}")
-    print(
-        f"  • Reviews with photos:       {df['has_pics'].sum():,} ({df['has_pics'].sum()/len(df)*100:.1f}%)"
-    )
-    print(
-        f"  • Reviews with response:     {df['has_response'].sum():,} ({df['has_response'].sum()/len(df)*100:.1f}%)"
-    )
+    print(f"  • Avg characters per review: {text['avg_characters']:.0f}")
+    print(f"  • Avg words per review:      {text['avg_words']:.0f}")
+    print(f"  • Empty reviews:             {text['empty_reviews']:,}")
+    print(f"  • Reviews with photos:       {photos:,} ({photos/total*100:.1f}%)")
+    print(f"  • Reviews with response:     {responses:,} ({responses/total*100:.1f}%)")
 
     # ========== CATEGORY CO-OCCURRENCE ==========
     print("\n" + "=" * 80)
@@ -158,48 +388,36 @@ def main():
     print("=" * 80)
     print("\nWhat other categories do brewpubs typically have?")
 
-    all_categories = []
-    for cats in df["category"].dropna():
-        all_categories.extend([c.strip() for c in cats.split("|")])
-
-    cat_counter = Counter(all_categories)
-
     print("\n🏷️  Top 20 Categories (among brewpub establishments):")
-    for i, (cat, count) in enumerate(cat_counter.most_common(20), 1):
-        pct = (count / len(df)) * 100
+    top_categories = list(report["categories"].items())[:20]
+    for i, (cat, count) in enumerate(top_categories, 1):
+        pct = (count / total) * 100
         print(f"  {i:>2}. {cat:<35} {count:>6,} ({pct:>5.1f}% of reviews)")
 
+    print("\n🔗 Top 10 Category Pairs:")
+    for i, pair in enumerate(report["category_pairs"][:10], 1):
+        names = f"{pair['category_a']} + {pair['category_b']}"
+        print(f"  {i:>2}. {names:<50} {pair['reviews']:>6,} reviews")
+
     # ========== REVIEWER ENGAGEMENT ==========
     print("\n" + "=" * 80)
     print("9. REVIEWER ENGAGEMENT")
     print("=" * 80)
 
-    reviews_per_user = df["review_user_id"].value_counts()
-
     print("\n👥 User Review Activity:")
-    print(f"  • Users with 1 review:       {(reviews_per_user == 1).sum():>8,}")
-    print(
-        f"  • Users with 2-5 reviews:    {((reviews_per_user >= 2) & (reviews_per_user <= 5)).sum():>8,}"
-    )
+    print(f"  • Users with 1 review:       {reviewers['users_with_1_review']:>8,}")
+    print(f"  • Users with 2-5 reviews:    {reviewers['users_with_2_5_reviews']:>8,}")
+    print(f"  • Users with 6-10 reviews:   {reviewers['users_with_6_10_reviews']:>8,}")
     print(
-        f"  • Users with 6-10 reviews:   {((reviews_per_user >= 6) & (reviews_per_user <= 10)).sum():>8,}"
+        f"  • Users with 10+ reviews:    {reviewers['users_with_10_plus_reviews']:>8,}"
     )
-    print(f"  • Users with 10+ reviews:    {(reviews_per_user > 10).sum():>8,}")
-    print(f"  • Max reviews by one user:   {reviews_per_user.max():>8,}")
+    print(f"  • Max reviews by one user:   {reviewers['max_reviews_by_one_user']:>8,}")
 
     # Most active reviewers
     print("\n🌟 Most Active Reviewers:")
-    top_reviewers = (
-        df.groupby(["review_user_name", "review_user_id"])
-        .agg({"rating": ["count", "mean"]})
-        .round(2)
-    )
-    top_reviewers.columns = ["review_count", "avg_rating"]
-    top_reviewers = top_reviewers.sort_values("review_count", ascending=False)
-
-    for i, ((name, uid), row) in enumerate(top_reviewers.head(10).iterrows(), 1):
+    for i, row in enumerate(reviewers["top_reviewers"][:10], 1):
         print(
-            f"  {i:>2}. {name[:30]:<30} {row['review_count']:>4.0f} reviews (avg {row['avg_rating']:.1f}★)"
+            f"  {i:>2}. {row['review_user_name'][:30]:<30} {row['review_count']:>4.0f} reviews (avg {row['avg_rating']:.1f}★)"
         )
 
     # ========== SUMMARY INSIGHTS ==========
@@ -207,32 +425,64 @@ def main():
     print("10. KEY INSIGHTS")
     print("=" * 80)
 
-    positive_reviews = len(df[df["rating"] >= 4])
-    negative_reviews = len(df[df["rating"] <= 2])
-
-    print(
-        f"""
+    print(f"""
 ✓ Dataset Quality:
-  - High volume: {len(df):,} reviews across {unique_brewpubs} brewpubs
-  - Good temporal coverage: {(date_range.max() - date_range.min()).days // 365} years of data
-  - Average {len(df)/unique_brewpubs:.0f} reviews per establishment
+  - High volume: {total:,} reviews across {overview['unique_brewpubs']} brewpubs
+  - Good temporal coverage: {overview['span_days'] // 365} years of data
+  - Average {overview['avg_reviews_per_brewpub']:.0f} reviews per establishment
   
 ✓ Rating Sentiment:
-  - Overall positive: {positive_reviews/len(df)*100:.1f}% rated 4-5 stars
-  - Negative reviews: {negative_reviews/len(df)*100:.1f}% rated 1-2 stars
-  - Mean rating: {df['rating'].mean():.2f}★ (above average)
+  - Overall positive: {ratings['positive_reviews']/total*100:.1f}% rated 4-5 stars
+  - Negative reviews: {ratings['negative_reviews']/total*100:.1f}% rated 1-2 stars
+  - Mean rating: {ratings['mean']:.2f}★ (above average)
   
 ✓ Geographic Coverage:
-  - {len(df['municipality'].unique())} municipalities represented
-  - Top city: {reviews_by_city.index[0]} with {reviews_by_city.iloc[0]:,} reviews
+  - {geography['municipalities']} municipalities represented
+  - Top city: {reviews_by_city[0][0]} with {reviews_by_city[0][1]:,} reviews
   - Well-distributed across Pennsylvania
   
 ✓ Data Richness:
-  - {df['has_pics'].sum():,} reviews have photos
-  - {df['has_response'].sum():,} reviews have owner responses
-  - Average review length: {df['word_count'].mean():.0f} words
-    """
+  - {photos:,} reviews have photos
+  - {responses:,} reviews have owner responses
+  - Average review length: {text['avg_words']:.0f} words
+    """)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--json",
+        type=Path,
+        default=JSON_PATH,
+        help=f"Where to save the report as JSON (default: {JSON_PATH.name})",
     )
+    parser.add_argument(
+        "--cooccurrence",
+        type=Path,
+        default=COOCCURRENCE_PATH,
+        help="Where to save the category co-occurrence matrix "
+        f"(default: {COOCCURRENCE_PATH.name})",
+    )
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("IN-DEPTH ANALYSIS: Pennsylvania Brewpub Reviews")
+    print("=" * 80)
+
+    # Load data
+    print("\nLoading data...")
+    df = columnar_cache.read_merged(COLUMNS, CSV_PATH)
+
+    print(f"✓ Loaded {len(df):,} reviews")
+
+    report, cooccurrence = build_report(df)
+    print_report(report)
+
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Saved JSON report to: {args.json}")
+    cooccurrence.to_csv(args.cooccurrence)
+    print(f"Saved category co-occurrence matrix to: {args.cooccurrence}")
 
     print("=" * 80)
     print("Analysis complete! ✓")
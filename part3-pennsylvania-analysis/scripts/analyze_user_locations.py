@@ -11,34 +11,62 @@ This script:
 4. Generates summary statistics for top locations
 5. Outputs CSV with user-city matrix showing review distribution
 
+With --approximate only the summary statistics are computed, from fixed-size
+sketches (distinct_sketch.py) instead of exact per-user tables: HyperLogLog
+for the user and location counts, and a small bitmap per user for the
+distinct locations per user. Error bounds are printed with each number.
+
 Dataset: data/part 3/review-Pennsylvania.json/review-Pennsylvania.json
 Output: data/pennsylvania_user_city_summary.csv
+        data/pennsylvania_user_location_distribution_approx.csv (--approximate)
 """
 
+import argparse
 import json
+import numpy as np
 import pandas as pd
+from array import array
 from pathlib import Path
 from typing import Dict, List
 
+import columnar_cache
+import distinct_sketch
+import jsonl_decoder
+
+try:
+    from scipy import sparse
+except ImportError:  # Optional - falls back to the pandas groupby engine
+    sparse = None
+
+# Above this many top locations the per-location columns are kept as sparse
+# pandas columns instead of dense floats
+DENSE_TOP_N_LIMIT = 100
 
-def load_reviews(file_path: str) -> List[Dict]:
+# Reviews per batch when streaming (hashed with --approximate, folded into
+# pair counts with --streaming)
+REVIEW_BATCH_ROWS = 1_000_000
+
+
+def load_reviews(file_path: str, decoder: str = "auto") -> List[Dict]:
     """
     Load JSON reviews from file (one JSON object per line).
 
     Args:
         file_path: Path to the review-Pennsylvania.json file
+        decoder: jsonl_decoder backend ("auto" picks the fastest installed)
 
     Returns:
         List of review dictionaries
     """
     reviews = []
+    decode = jsonl_decoder.make_decoder(decoder)
 
     print(f"📂 Loading reviews from {file_path}...")
 
-    with open(file_path, "r", encoding="utf-8") as f:
+    with open(file_path, "rb") as f:
         for line_num, line in enumerate(f, 1):
             try:
-                review = json.loads(line.strip())
+                review = decode(line.strip())
                 reviews.append(review)
             except json.JSONDecodeError as e:
                 print(f"⚠️  Warning: Could not parse line {line_num}: {e}")
@@ -48,6 +76,283 @@ def load_reviews(file_path: str) -> List[Dict]:
     return reviews
 
 
+def sorted_categorical(codes: np.ndarray, values: list) -> pd.Categorical:
+    """
+    Build a Categorical from interned codes with categories in sorted order.
+
+    Sorted categories make groupby output order match the object-dtype path.
+    """
+    categories = np.array(values, dtype=object)
+    order = np.argsort(categories, kind="stable")
+    rank = np.empty(len(order), dtype=np.int32)
+    rank[order] = np.arange(len(order), dtype=np.int32)
+    return pd.Categorical.from_codes(rank[codes], categories=categories[order])
+
+
+class PairCounts:
+    """
+    Running review counts per (user code, location code) pair.
+
+    Pairs are kept as sorted int64 keys (user code in the high 32 bits), so a
+    batch of codes is collapsed with np.unique and merged in with
+    searchsorted. Memory grows with the distinct pairs, not the reviews.
+    """
+
+    def __init__(self):
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, user_codes: np.ndarray, location_codes: np.ndarray):
+        keys = (user_codes.astype(np.int64) << 32) | location_codes.astype(np.int64)
+        keys, counts = np.unique(keys, return_counts=True)
+
+        rows = np.searchsorted(self.keys, keys)
+        known = rows < len(self.keys)
+        known[known] = self.keys[rows[known]] == keys[known]
+        self.counts[rows[known]] += counts[known]
+
+        new = ~known
+        if new.any():
+            self.keys = np.insert(self.keys, rows[new], keys[new])
+            self.counts = np.insert(self.counts, rows[new], counts[new])
+
+    def user_codes(self) -> np.ndarray:
+        return (self.keys >> 32).astype(np.int32)
+
+    def location_codes(self) -> np.ndarray:
+        return (self.keys & 0xFFFFFFFF).astype(np.int32)
+
+
+def load_review_codes(file_path: str, decoder: str = "auto") -> pd.DataFrame:
+    """
+    Stream reviews into review counts per distinct (user_id, gmap_id) pair.
+
+    Each distinct user_id and gmap_id is interned once in a lookup table.
+    Reviews are coded in batches of REVIEW_BATCH_ROWS, and each batch is folded
+    into a PairCounts accumulator. No per-review dicts, strings or codes are
+    kept, so memory is bounded by the distinct users, locations and
+    (user, location) pairs, not by the number of reviews. Reviews without a
+    user_id are skipped.
+
+    Args:
+        file_path: Path to the review-Pennsylvania.json file
+        decoder: jsonl_decoder backend ("auto" picks the fastest installed)
+
+    Returns:
+        DataFrame with categorical user_id and gmap_id columns and the
+        pair's review count in a "reviews" column, one row per pair
+    """
+    user_table = {}
+    location_table = {}
+    user_codes = array("i")
+    location_codes = array("i")
+    pairs = PairCounts()
+    total_reviews = 0
+    decode = jsonl_decoder.make_decoder(decoder, typed=True)
+
+    def fold_batch():
+        nonlocal user_codes, location_codes
+        pairs.add(
+            np.frombuffer(user_codes, dtype=np.int32),
+            np.frombuffer(location_codes, dtype=np.int32),
+        )
+        user_codes = array("i")
+        location_codes = array("i")
+
+    print(f"📂 Streaming user_id, gmap_id from {file_path}...")
+
+    with open(file_path, "rb") as f:
+        for line_num, line in enumerate(f, 1):
+            try:
+                review = decode(line.strip())
+            except json.JSONDecodeError as e:
+                print(f"⚠️  Warning: Could not parse line {line_num}: {e}")
+                continue
+
+            user_id = review.get("user_id")
+            if user_id is None:
+                continue
+            gmap_id = str(review.get("gmap_id"))
+
+            user_code = user_table.get(user_id)
+            if user_code is None:
+                user_code = user_table[user_id] = len(user_table)
+            location_code = location_table.get(gmap_id)
+            if location_code is None:
+                location_code = location_table[gmap_id] = len(location_table)
+
+            user_codes.append(user_code)
+            location_codes.append(location_code)
+            total_reviews += 1
+            if len(user_codes) >= REVIEW_BATCH_ROWS:
+                fold_batch()
+
+    fold_batch()
+
+    print(
+        f"✅ Streamed {total_reviews:,} reviews "
+        f"({len(user_table):,} users, {len(location_table):,} locations, "
+        f"{len(pairs.keys):,} user-location pairs)"
+    )
+
+    return pd.DataFrame(
+        {
+            "user_id": sorted_categorical(pairs.user_codes(), list(user_table)),
+            "gmap_id": sorted_categorical(pairs.location_codes(), list(location_table)),
+            "reviews": pairs.counts,
+        }
+    )
+
+
+def iter_id_batches(file_path: str, decoder: str = "auto"):
+    """
+    Yield (user_ids, gmap_ids) lists of up to REVIEW_BATCH_ROWS reviews.
+
+    Reviews without a user_id are skipped, as in load_review_codes().
+    """
+    decode = jsonl_decoder.make_decoder(decoder, typed=True)
+    user_ids = []
+    gmap_ids = []
+
+    print(f"📂 Streaming user_id, gmap_id from {file_path}...")
+
+    with open(file_path, "rb") as f:
+        for line_num, line in enumerate(f, 1):
+            try:
+                review = decode(line.strip())
+            except json.JSONDecodeError as e:
+                print(f"⚠️  Warning: Could not parse line {line_num}: {e}")
+                continue
+
+            user_id = review.get("user_id")
+            if user_id is None:
+                continue
+            user_ids.append(user_id)
+            gmap_ids.append(str(review.get("gmap_id")))
+            if len(user_ids) >= REVIEW_BATCH_ROWS:
+                yield user_ids, gmap_ids
+                user_ids = []
+                gmap_ids = []
+
+    if user_ids:
+        yield user_ids, gmap_ids
+
+
+def _column_hashes(values: pd.Series) -> np.ndarray:
+    # Dictionary-encoded columns: each distinct string is hashed once
+    categorical = pd.Categorical(values)
+    hashes = distinct_sketch.hash_values(categorical.categories)
+    return hashes[categorical.codes]
+
+
+def iter_hash_batches(batches):
+    """(user hashes, location hashes) for each (user_ids, gmap_ids) batch."""
+    for user_ids, gmap_ids in batches:
+        yield distinct_sketch.hash_values(user_ids), distinct_sketch.hash_values(
+            gmap_ids
+        )
+
+
+def iter_cache_hash_batches(cache_dir: Path):
+    """(user hashes, location hashes) for each part of the review cache."""
+    print(f"📂 Loading user_id, gmap_id from {cache_dir}...")
+    for _, table in columnar_cache.iter_review_parts(
+        ["user_id", "gmap_id"], cache_dir=cache_dir
+    ):
+        df = table.to_pandas()
+        df = df[df["user_id"].notna()]
+        yield _column_hashes(df["user_id"]), _column_hashes(df["gmap_id"].astype(str))
+
+
+def sketch_user_locations(
+    hash_batches,
+    precision: int = distinct_sketch.DEFAULT_PRECISION,
+    bitmap_bits: int = distinct_sketch.DEFAULT_BITMAP_BITS,
+) -> dict:
+    """
+    Approximate user and location counts plus distinct locations per user.
+
+    Returns the number of reviews, HyperLogLog sketches of users and
+    locations, and the per-user KeyedBitmaps of locations.
+    """
+    users = distinct_sketch.HyperLogLog(precision)
+    locations = distinct_sketch.HyperLogLog(precision)
+    user_locations = distinct_sketch.KeyedBitmaps(bitmap_bits)
+    reviews = 0
+
+    for user_hashes, location_hashes in hash_batches:
+        users.add(user_hashes)
+        locations.add(location_hashes)
+        user_locations.add(user_hashes, location_hashes)
+        reviews += len(user_hashes)
+
+    print(f"✅ Sketched {reviews:,} reviews")
+    return {
+        "reviews": reviews,
+        "users": users,
+        "locations": locations,
+        "user_locations": user_locations,
+    }
+
+
+def summarize_sketches(sketches: dict, output_file: Path):
+    """Print the approximate summary and save the locations-per-user counts."""
+    users = sketches["users"]
+    locations = sketches["locations"]
+    user_locations = sketches["user_locations"]
+
+    # Bits set per user: 1 bit is one location unless two collided (1 / bits)
+    bits_set = user_locations.bits_set()
+    saturated = bits_set == user_locations.bits
+    one_location = int((bits_set == 1).sum())
+    most = float(user_locations.estimate(bits_set.max())) if len(bits_set) else 0.0
+
+    print(f"\n📊 Approximate distinct counts:")
+    print(
+        f"   - HyperLogLog, 2^{users.precision} registers "
+        f"({users.nbytes:,} bytes per sketch), "
+        f"±{users.relative_error() * 100:.2f}% standard error"
+    )
+    print(f"   - Users:     ~{users.count():,.0f}")
+    print(f"   - Locations: ~{locations.count():,.0f}")
+
+    print(f"\n📊 Distinct locations per user (approximate):")
+    print(
+        f"   - {user_locations.bits}-bit bitmap per user "
+        f"({user_locations.nbytes / 1024**2:,.1f} MB for {len(user_locations):,} users)"
+    )
+    print(f"   - Users reviewing 1 location: ~{one_location:,}")
+    print(f"   - Users reviewing 2+ locations: ~{len(bits_set) - one_location:,}")
+    if saturated.any():
+        print(f"   - Max locations reviewed by single user: >{most:.0f}")
+        print(
+            f"     ({int(saturated.sum()):,} users fill their bitmap - "
+            f"raise --bitmap-bits for them)"
+        )
+    else:
+        print(f"   - Max locations reviewed by single user: ~{most:.0f}")
+    errors = ", ".join(
+        f"±{user_locations.relative_error(n) * 100:.1f}% at {n}"
+        for n in (2, 10, user_locations.bits // 2)
+    )
+    print(f"   - Standard error per user: {errors}")
+
+    # Users per number of bits set; estimates are not whole numbers, so the
+    # distribution is kept per bit count rather than rounded into gaps
+    users_per_bits = np.bincount(bits_set, minlength=user_locations.bits + 1)
+    observed = np.flatnonzero(users_per_bits)
+    distribution = pd.DataFrame(
+        {
+            "bits_set": observed,
+            "estimated_locations": user_locations.estimate(observed).round(2),
+            "users": users_per_bits[observed],
+        }
+    )
+    print(f"\n💾 Saving locations-per-user distribution to {output_file}...")
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    distribution.to_csv(output_file, index=False)
+
+
 def extract_location_from_gmap_id(df: pd.DataFrame) -> pd.DataFrame:
     """
     Extract location information from reviews.
@@ -65,19 +370,146 @@ def extract_location_from_gmap_id(df: pd.DataFrame) -> pd.DataFrame:
     # Use gmap_id as location identifier
     if "city" not in df.columns:
         print("ℹ️  No 'city' column found. Using gmap_id as location identifier.")
-        df["location"] = df["gmap_id"].astype(str)
+        if isinstance(df["gmap_id"].dtype, pd.CategoricalDtype):
+            # Already string categories - keep the compact integer codes
+            df["location"] = df["gmap_id"]
+        else:
+            df["location"] = df["gmap_id"].astype(str)
     else:
         df["location"] = df["city"]
 
     return df
 
 
+def build_user_location_matrix(df: pd.DataFrame) -> tuple:
+    """
+    Build a sparse user × location review count matrix.
+
+    Users and locations are integer-coded in sorted order (rows follow
+    sorted user_id, columns sorted location). Duplicate (user, location)
+    pairs are summed, so each stored entry is one user's review count at
+    one location.
+
+    Args:
+        df: DataFrame with user_id and location columns, one row per review
+            or, with a "reviews" column, per pair with its review count
+
+    Returns:
+        (matrix, users, locations) with matrix as CSR
+    """
+    user_codes, users = pd.factorize(df["user_id"], sort=True)
+    location_codes, locations = pd.factorize(df["location"], sort=True)
+
+    if "reviews" in df.columns:
+        counts = df["reviews"].to_numpy(dtype=np.int32)
+    else:
+        counts = np.ones(len(user_codes), dtype=np.int32)
+
+    matrix = sparse.csr_matrix(
+        (counts, (user_codes, location_codes)),
+        shape=(len(users), len(locations)),
+    )
+    matrix.sum_duplicates()
+    return matrix, pd.Index(users), pd.Index(locations)
+
+
+def shorten_location_columns(summary: pd.DataFrame, top_locations: list):
+    """Rename location columns to be more readable (shorten gmap_id)."""
+    rename_dict = {}
+    for col in top_locations:
+        if col.startswith("0x"):
+            # Extract last 8 chars of gmap_id for readability
+            short_name = f"loc_{col[-8:]}"
+            rename_dict[col] = short_name
+
+    if rename_dict:
+        summary = summary.rename(columns=rename_dict)
+
+    return summary
+
+
 def create_user_location_summary(
     df: pd.DataFrame, top_n_locations: int = 5
 ) -> pd.DataFrame:
     """
     Create user-location summary with review counts.
 
+    Backed by a sparse user × location count matrix: distinct locations per
+    user, location totals and the top-N column slice are all O(nnz), so
+    top_n_locations can go into the thousands. Falls back to the pandas
+    groupby engine when scipy is not installed.
+
+    Args:
+        df: DataFrame with user_id and location columns
+        top_n_locations: Number of top locations to include as separate columns
+
+    Returns:
+        Summary DataFrame with user_id, no_of_review_locations, and location columns
+    """
+    if sparse is None:
+        return create_user_location_summary_groupby(df, top_n_locations)
+
+    print(f"\n📊 Analyzing user review patterns...")
+
+    matrix, users, locations = build_user_location_matrix(df)
+
+    # Stored entries per row = distinct locations per user
+    no_of_review_locations = np.diff(matrix.indptr)
+
+    print(f"   - Found {len(users):,} unique users")
+    print(f"   - Found {len(locations):,} unique locations")
+
+    print(f"\n🔍 Identifying top {top_n_locations} locations by review volume...")
+    location_totals = pd.Series(
+        np.asarray(matrix.sum(axis=0)).ravel(), index=locations
+    ).sort_values(ascending=False)
+    top_locations = location_totals.head(top_n_locations).index.tolist()
+
+    print(f"\n🏆 Top {top_n_locations} most reviewed locations:")
+    for i, location in enumerate(top_locations, 1):
+        print(f"   {i}. {location}: {location_totals[location]:,} reviews")
+
+    # Column slice of the top locations only - no pivot needed. Columns are
+    # in location order, like the pivoted matrix of the groupby engine.
+    print(f"\n📉 Slicing top {top_n_locations} location columns...")
+    column_order = sorted(top_locations)
+    top_matrix = matrix[:, locations.get_indexer(column_order)].astype(np.float64)
+    print(f"   - Reduced from {matrix.nnz:,} to {top_matrix.nnz:,} records")
+
+    print(f"\n🔗 Merging with location counts...")
+    summary = pd.DataFrame(
+        {
+            "user_id": users,
+            "no_of_review_locations": no_of_review_locations,
+        }
+    )
+    if top_n_locations > DENSE_TOP_N_LIMIT:
+        # One sparse column per location, zeros implicit
+        top_csc = top_matrix.tocsc()
+        top_columns = pd.DataFrame(
+            {
+                location: pd.arrays.SparseArray.from_spmatrix(top_csc[:, [i]])
+                for i, location in enumerate(column_order)
+            }
+        )
+    else:
+        top_columns = pd.DataFrame(top_matrix.toarray(), columns=column_order)
+    summary = pd.concat([summary, top_columns], axis=1)
+
+    # Sort by total reviews at the top locations (descending)
+    summary["total_reviews"] = np.asarray(top_matrix.sum(axis=1)).ravel()
+    summary = summary.sort_values("total_reviews", ascending=False)
+    summary = summary.drop("total_reviews", axis=1)
+
+    return shorten_location_columns(summary, top_locations)
+
+
+def create_user_location_summary_groupby(
+    df: pd.DataFrame, top_n_locations: int = 5
+) -> pd.DataFrame:
+    """
+    Create user-location summary with review counts (pandas groupby engine).
+
     Optimized approach to avoid memory issues with large datasets:
     1. First identify top locations by volume
     2. Filter data to only those locations
@@ -93,13 +525,16 @@ def create_user_location_summary(
     print(f"\n📊 Analyzing user review patterns...")
 
     # Count reviews per user per location
-    user_location_counts = (
-        df.groupby(["user_id", "location"]).size().reset_index(name="review_count")
-    )
+    grouped = df.groupby(["user_id", "location"], observed=True)
+    if "reviews" in df.columns:
+        review_counts = grouped["reviews"].sum()
+    else:
+        review_counts = grouped.size()
+    user_location_counts = review_counts.reset_index(name="review_count")
 
     # Count unique locations per user
     user_unique_locations = (
-        user_location_counts.groupby("user_id")["location"]
+        user_location_counts.groupby("user_id", observed=True)["location"]
         .nunique()
         .reset_index(name="no_of_review_locations")
     )
@@ -110,7 +545,7 @@ def create_user_location_summary(
     # Get top N locations by total review volume BEFORE pivoting (memory efficient)
     print(f"\n🔍 Identifying top {top_n_locations} locations by review volume...")
     location_totals = (
-        user_location_counts.groupby("location")["review_count"]
+        user_location_counts.groupby("location", observed=True)["review_count"]
         .sum()
         .sort_values(ascending=False)
     )
@@ -125,6 +560,8 @@ def create_user_location_summary(
     user_location_top = user_location_counts[
         user_location_counts["location"].isin(top_locations)
     ].copy()
+    # Plain strings so the pivot columns come out sorted, as for object dtype
+    user_location_top["location"] = user_location_top["location"].astype(str)
     print(
         f"   - Reduced from {len(user_location_counts):,} to {len(user_location_top):,} records"
     )
@@ -154,22 +591,67 @@ def create_user_location_summary(
     # Drop the helper column
     summary = summary.drop("total_reviews", axis=1)
 
-    # Rename location columns to be more readable (shorten gmap_id)
-    rename_dict = {}
-    for col in top_locations:
-        if col.startswith("0x"):
-            # Extract last 8 chars of gmap_id for readability
-            short_name = f"loc_{col[-8:]}"
-            rename_dict[col] = short_name
-
-    if rename_dict:
-        summary = summary.rename(columns=rename_dict)
-
-    return summary
+    return shorten_location_columns(summary, top_locations)
 
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="User location analysis")
+    parser.add_argument(
+        "--from-cache",
+        action="store_true",
+        help="Read user_id/gmap_id from the Parquet cache built by columnar_cache.py",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Stream the JSONL into review counts per user-location pair instead of "
+        "loading every review",
+    )
+    parser.add_argument(
+        "--top-n",
+        type=int,
+        default=5,
+        help="Number of most-reviewed locations to include as columns",
+    )
+    parser.add_argument(
+        "--decoder",
+        choices=("auto",) + jsonl_decoder.BACKENDS,
+        default="auto",
+        help="JSON decoder backend for the JSONL readers (default: fastest installed)",
+    )
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Only compute summary statistics, from HyperLogLog and per-user "
+        "bitmap sketches (fixed memory, error bounds reported)",
+    )
+    parser.add_argument(
+        "--hll-precision",
+        type=int,
+        default=distinct_sketch.DEFAULT_PRECISION,
+        help="HyperLogLog registers = 2^precision bytes "
+        f"(default: {distinct_sketch.DEFAULT_PRECISION})",
+    )
+    parser.add_argument(
+        "--bitmap-bits",
+        type=int,
+        default=distinct_sketch.DEFAULT_BITMAP_BITS,
+        help="Bits per user for distinct locations, a multiple of 64 "
+        f"(default: {distinct_sketch.DEFAULT_BITMAP_BITS})",
+    )
+    args = parser.parse_args()
+    if not (
+        distinct_sketch.MIN_PRECISION
+        <= args.hll_precision
+        <= distinct_sketch.MAX_PRECISION
+    ):
+        parser.error(
+            f"--hll-precision must be between {distinct_sketch.MIN_PRECISION} "
+            f"and {distinct_sketch.MAX_PRECISION}"
+        )
+    if args.bitmap_bits < 64 or args.bitmap_bits % 64:
+        parser.error("--bitmap-bits must be a positive multiple of 64")
 
     # Define paths relative to project root
     project_root = Path(__file__).parent.parent.parent
@@ -181,28 +663,80 @@ def main():
         / "review-Pennsylvania.json"
     )
     output_file = project_root / "data" / "pennsylvania_user_location_summary.csv"
+    approximate_file = (
+        project_root / "data" / "pennsylvania_user_location_distribution_approx.csv"
+    )
 
     print("=" * 80)
     print("PART 2: PENNSYLVANIA GOOGLE LOCAL REVIEWS - USER LOCATION ANALYSIS")
     print("=" * 80)
     print()
 
-    # Check if input file exists
-    if not input_file.exists():
-        print(f"❌ Error: Input file not found at {input_file}")
-        print(f"   Please ensure the review-Pennsylvania.json file exists.")
+    if args.approximate:
+        cache_dir = columnar_cache.CACHE_DIR / "reviews"
+        if args.from_cache:
+            if not columnar_cache.is_fresh(cache_dir, input_file):
+                print(f"❌ Error: Columnar cache missing or stale at {cache_dir}")
+                print(f"   Run columnar_cache.py first.")
+                return
+            hash_batches = iter_cache_hash_batches(cache_dir)
+        else:
+            if not input_file.exists():
+                print(f"❌ Error: Input file not found at {input_file}")
+                print(f"   Please ensure the review-Pennsylvania.json file exists.")
+                return
+            hash_batches = iter_hash_batches(iter_id_batches(input_file, args.decoder))
+
+        sketches = sketch_user_locations(
+            hash_batches, args.hll_precision, args.bitmap_bits
+        )
+        summarize_sketches(sketches, approximate_file)
+
+        print("\n" + "=" * 80)
+        print("ANALYSIS COMPLETE (approximate)!")
+        print("=" * 80)
         return
 
-    # Load reviews
-    reviews = load_reviews(input_file)
+    if args.from_cache:
+        cache_dir = columnar_cache.CACHE_DIR / "reviews"
+        if not columnar_cache.is_fresh(cache_dir, input_file):
+            print(f"❌ Error: Columnar cache missing or stale at {cache_dir}")
+            print(f"   Run columnar_cache.py first.")
+            return
+
+        # Only the two columns this analysis uses, as categoricals
+        print(f"📂 Loading user_id, gmap_id from {cache_dir}...")
+        df = columnar_cache.read_reviews(["user_id", "gmap_id"], cache_dir)
+        # Sorted categories make groupby order match the object-dtype path
+        for column in ["user_id", "gmap_id"]:
+            df[column] = df[column].cat.reorder_categories(
+                df[column].cat.categories.sort_values()
+            )
+        print(f"✅ Loaded {len(df):,} reviews")
+    elif args.streaming:
+        if not input_file.exists():
+            print(f"❌ Error: Input file not found at {input_file}")
+            print(f"   Please ensure the review-Pennsylvania.json file exists.")
+            return
+
+        df = load_review_codes(input_file, args.decoder)
+    else:
+        # Check if input file exists
+        if not input_file.exists():
+            print(f"❌ Error: Input file not found at {input_file}")
+            print(f"   Please ensure the review-Pennsylvania.json file exists.")
+            return
 
-    if not reviews:
-        print("❌ No reviews loaded. Exiting.")
-        return
+        # Load reviews
+        reviews = load_reviews(input_file, args.decoder)
+
+        if not reviews:
+            print("❌ No reviews loaded. Exiting.")
+            return
 
-    # Convert to DataFrame
-    print("\n📋 Converting to DataFrame...")
-    df = pd.DataFrame(reviews)
+        # Convert to DataFrame
+        print("\n📋 Converting to DataFrame...")
+        df = pd.DataFrame(reviews)
 
     print(f"   - Columns: {', '.join(df.columns)}")
     print(f"   - Shape: {df.shape[0]:,} rows × {df.shape[1]} columns")
@@ -216,10 +750,11 @@ def main():
         return
 
     df = df.dropna(subset=["user_id"])
-    print(f"   - Reviews with valid user_id: {len(df):,}")
+    valid_reviews = int(df["reviews"].sum()) if "reviews" in df.columns else len(df)
+    print(f"   - Reviews with valid user_id: {valid_reviews:,}")
 
     # Create summary
-    summary = create_user_location_summary(df, top_n_locations=5)
+    summary = create_user_location_summary(df, top_n_locations=args.top_n)
 
     # Display sample
     print(f"\n📄 Summary DataFrame Preview:")
@@ -0,0 +1,147 @@
+"""
+Benchmark the review scan used by merge_brewery_reviews.py.
+
+Times scan_chunk() over the first --sample-mb of review-Pennsylvania.json with
+and without the raw gmap_id pre-filter, checks both produce the same rows, and
+reports lines per second for each.
+
+Then times every installed jsonl_decoder backend decoding the same sample
+lines, checking each gives json.loads' review fields.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import jsonl_decoder
+from merge_brewery_reviews import (
+    REVIEW_PATH,
+    load_brewpub_metadata,
+    scan_chunk,
+)
+
+
+def sample_range(path: Path, sample_mb: int) -> tuple:
+    """Return a newline-aligned (start, end) covering roughly sample_mb."""
+    file_size = path.stat().st_size
+    sample_bytes = min(file_size, sample_mb * 1024 * 1024)
+    if sample_bytes >= file_size:
+        return 0, file_size
+    with open(path, "rb") as f:
+        f.seek(sample_bytes)
+        f.readline()  # Finish the line the sample cuts through
+        return 0, f.tell()
+
+
+def time_scan(path: Path, start: int, end: int, brewpubs: dict, prefilter: bool):
+    began = time.perf_counter()
+    lines, reviews, rows = scan_chunk(path, start, end, brewpubs, prefilter)
+    elapsed = time.perf_counter() - began
+    return lines, rows, elapsed
+
+
+def read_lines(path: Path, start: int, end: int) -> list:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return [line for line in f.read(end - start).splitlines() if line.strip()]
+
+
+def time_decoder(lines: list, backend: str, typed: bool) -> tuple:
+    decode = jsonl_decoder.make_decoder(backend, typed=typed)
+    decoded = []
+    began = time.perf_counter()
+    for line in lines:
+        try:
+            decoded.append(decode(line))
+        except json.JSONDecodeError:
+            decoded.append(None)
+    return decoded, time.perf_counter() - began
+
+
+def review_fields(review) -> tuple:
+    if review is None:
+        return None
+    return tuple(review.get(field) for field in jsonl_decoder.REVIEW_FIELDS)
+
+
+def benchmark_decoders(path: Path, start: int, end: int):
+    """Decode throughput of each installed backend on the sample lines."""
+    print(
+        f"\nDecoder backends (installed: {', '.join(jsonl_decoder.available_backends())})"
+    )
+    lines = read_lines(path, start, end)
+    megabytes = sum(len(line) for line in lines) / 1024 / 1024
+
+    variants = [(backend, False) for backend in jsonl_decoder.available_backends()]
+    if "msgspec" in jsonl_decoder.available_backends():
+        variants.insert(1, ("msgspec", True))
+
+    expected = None
+    base_time = None
+    for backend, typed in reversed(variants):
+        decoded, elapsed = time_decoder(lines, backend, typed)
+        fields = [review_fields(review) for review in decoded]
+        if expected is None:
+            # The stdlib runs first and is the reference
+            expected, base_time = fields, elapsed
+        label = f"{backend} (typed)" if typed else backend
+        status = "✓" if fields == expected else "⚠ differs from json"
+        print(
+            f"  {label:<16} {elapsed:>8.2f}s  {len(lines) / elapsed:>12,.0f} lines/s"
+            f"  {megabytes / elapsed:>7,.1f} MB/s  {base_time / elapsed:>5.1f}x  {status}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--review-path", type=Path, default=REVIEW_PATH)
+    parser.add_argument("--sample-mb", type=int, default=512)
+    parser.add_argument(
+        "--decoders-only",
+        action="store_true",
+        help="Only time the JSON decoder backends",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Review Scan Benchmark")
+    print("=" * 60)
+
+    start, end = sample_range(args.review_path, args.sample_mb)
+    print(f"\nSample: {(end - start) / 1024 / 1024:,.0f} MB of {args.review_path}")
+
+    if args.decoders_only:
+        benchmark_decoders(args.review_path, start, end)
+        return
+
+    brewpubs = load_brewpub_metadata()
+
+    results = {}
+    for label, prefilter in [
+        ("json.loads every line", False),
+        ("gmap_id pre-filter", True),
+    ]:
+        lines, rows, elapsed = time_scan(
+            args.review_path, start, end, brewpubs, prefilter
+        )
+        results[label] = (lines, rows, elapsed)
+        print(
+            f"  {label:<24} {elapsed:>8.2f}s  {lines / elapsed:>12,.0f} lines/s"
+            f"  ({len(rows):,} matched)"
+        )
+
+    (lines, base_rows, base_time), (_, fast_rows, fast_time) = results.values()
+    if base_rows != fast_rows:
+        print("\n⚠ Pre-filtered rows differ from the full decode!")
+        return
+
+    gain = lines / fast_time - lines / base_time
+    print(f"\n✓ Identical rows")
+    print(f"  Gain: {gain:,.0f} lines/s ({base_time / fast_time:.1f}x faster)")
+
+    benchmark_decoders(args.review_path, start, end)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Category filters for routing Google Local places into separate outputs.
+
+A filter is a named rule over a place's category list. Rules combine three
+term lists, all matched case-insensitively:
+
+    any   - at least one category matches one of these terms
+    all   - every term is matched by some category
+    none  - no category matches any of these terms
+
+A term ending in "*" is a prefix match ("museum*" matches "Museum" and
+"Museum of history"); any other term must equal the whole category.
+
+Filters are loaded from JSON, e.g.
+
+    {
+        "brewpub": {"any": ["Brewpub"]},
+        "coffee": {"any": ["Coffee shop", "Cafe", "Espresso bar"]},
+        "parks": {"any": ["Park", "State park", "National park"], "none": ["Amusement park"]},
+        "museums": {"any": ["Museum*", "Art museum", "History museum"]}
+    }
+
+Each rule is compiled once into frozensets and prefix tuples, so checking a
+place is a set intersection plus one startswith() per category.
+"""
+
+import json
+from pathlib import Path
+
+# The original merge target: places with "Brewpub" as one of their categories
+DEFAULT_FILTERS = {"brewpub": {"any": ["Brewpub"]}}
+
+RULE_KEYS = ("any", "all", "none")
+
+
+class CompiledTerms:
+    """A list of category terms split into exact names and prefixes."""
+
+    def __init__(self, terms: list):
+        terms = [t.strip().lower() for t in terms]
+        self.exact = frozenset(t for t in terms if not t.endswith("*"))
+        self.prefixes = tuple(t[:-1] for t in terms if t.endswith("*"))
+        self.terms = terms
+
+    def any_match(self, categories: set) -> bool:
+        if not self.exact.isdisjoint(categories):
+            return True
+        if self.prefixes:
+            return any(cat.startswith(self.prefixes) for cat in categories)
+        return False
+
+    def all_match(self, categories: set) -> bool:
+        for term in self.terms:
+            if term.endswith("*"):
+                if not any(cat.startswith(term[:-1]) for cat in categories):
+                    return False
+            elif term not in categories:
+                return False
+        return True
+
+
+class CategoryRule:
+    """One compiled filter rule; call it with a category list."""
+
+    def __init__(self, name: str, rule: dict):
+        unknown = set(rule) - set(RULE_KEYS)
+        if unknown:
+            raise ValueError(f"Filter '{name}': unknown keys {sorted(unknown)}")
+        if not rule.get("any") and not rule.get("all"):
+            raise ValueError(f"Filter '{name}': needs 'any' or 'all' terms")
+
+        self.name = name
+        self.any = CompiledTerms(rule.get("any", [])) if rule.get("any") else None
+        self.all = CompiledTerms(rule.get("all", [])) if rule.get("all") else None
+        self.none = CompiledTerms(rule.get("none", [])) if rule.get("none") else None
+
+    def matches_lowered(self, categories: set) -> bool:
+        """Check a set of already-lowercased categories."""
+        if self.any is not None and not self.any.any_match(categories):
+            return False
+        if self.all is not None and not self.all.all_match(categories):
+            return False
+        if self.none is not None and self.none.any_match(categories):
+            return False
+        return True
+
+    def __call__(self, categories: list) -> bool:
+        if not categories:
+            return False
+        return self.matches_lowered({cat.lower() for cat in categories})
+
+    def positive_terms(self) -> tuple:
+        """(exact, prefixes) a matching place must have at least one of."""
+        terms = self.any if self.any is not None else self.all
+        return terms.exact, terms.prefixes
+
+
+class CategoryRouter:
+    """A set of named rules; maps a place's categories to matching filters."""
+
+    def __init__(self, filters: dict):
+        if not filters:
+            raise ValueError("At least one category filter is required")
+        self.rules = [CategoryRule(name, rule) for name, rule in filters.items()]
+        self.names = [rule.name for rule in self.rules]
+
+    def match(self, categories: list) -> tuple:
+        """Names of every filter the categories satisfy (lowercased once)."""
+        if not categories:
+            return ()
+        lowered = {cat.lower() for cat in categories}
+        return tuple(rule.name for rule in self.rules if rule.matches_lowered(lowered))
+
+    def positive_terms(self) -> tuple:
+        """Union of (exact, prefixes) across rules, for index pre-selection."""
+        exact = set()
+        prefixes = set()
+        for rule in self.rules:
+            rule_exact, rule_prefixes = rule.positive_terms()
+            exact.update(rule_exact)
+            prefixes.update(rule_prefixes)
+        return sorted(exact), sorted(prefixes)
+
+
+def load_filters(path: Path = None) -> dict:
+    """Read filters from a JSON file, or the brewpub default when path is None."""
+    if path is None:
+        return dict(DEFAULT_FILTERS)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,426 @@
+"""
+Columnar (Parquet) cache of the Pennsylvania Google Local dataset.
+
+One-time ingest that converts review-Pennsylvania.json and meta-Pennsylvania.json
+into typed, partitioned Parquet files so analysis scripts can read only the
+columns they need instead of decoding the 6.7GB JSONL again:
+
+    data/part 3/columnar/reviews/part-00000.parquet ...   (file order)
+    data/part 3/columnar/meta/part-00000.parquet
+
+user_id and gmap_id are dictionary-encoded, time is int64 and rating is int8.
+Each cache directory records the size and mtime of its source file, and
+readers refuse a cache whose source has changed since the ingest.
+
+The merged brewpub CSV (plain, .gz or .zst) can be cached the same way
+(--merged) for reviewer_tally.py and analyze_brewpub_results.py. Either way
+read_merged() loads it with the MERGED_SCHEMA dtypes: place columns that
+repeat on every review of a place are categoricals, ratings are int8 and the
+flags are bool.
+
+Requires pyarrow (pip install pyarrow).
+
+Usage:
+    python columnar_cache.py            # reviews + meta
+    python columnar_cache.py --merged   # also brewpub_reviews_with_meta.csv
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import pandas as pd
+
+import jsonl_decoder
+import review_writer
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency, only needed for the cache
+    pa = None
+    pq = None
+
+# Paths
+DATA_DIR = Path(__file__).parent.parent.parent / "data" / "part 3"
+META_PATH = DATA_DIR / "meta-Pennsylvania.json" / "meta-Pennsylvania.json"
+REVIEW_PATH = DATA_DIR / "review-Pennsylvania.json" / "review-Pennsylvania.json"
+CACHE_DIR = DATA_DIR / "columnar"
+OUTPUT_DIR = Path(__file__).parent.parent / "outputs"
+MERGED_CSV_PATH = OUTPUT_DIR / "brewpub_reviews_with_meta.csv"
+
+SOURCE_FILE = "_source.json"
+
+# pandas dtypes of the merged brewpub CSV columns. Integer columns with
+# missing values fall back to the nullable type (int8 -> Int8).
+MERGED_SCHEMA = {
+    "review_user_id": str,
+    "review_user_name": str,
+    "review_time": "int64",
+    "review_date": str,
+    "rating": "int8",
+    "review_text": str,
+    "has_pics": bool,
+    "has_response": bool,
+    "gmap_id": "category",
+    "business_name": "category",
+    "address": "category",
+    "municipality": "category",
+    "latitude": "float64",
+    "longitude": "float64",
+    "category": "category",
+    "description": "category",
+    "avg_rating": "float64",
+    "num_of_reviews": "int64",
+}
+INTEGER_DTYPES = {"int8": "Int8", "int64": "Int64"}
+
+# Rows per Parquet part - bounds ingest memory to one batch of decoded lines
+BATCH_ROWS = 1_000_000
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "The columnar cache needs pyarrow. Install it with: pip install pyarrow"
+        )
+
+
+def review_schema():
+    _require_pyarrow()
+    return pa.schema(
+        [
+            ("user_id", pa.dictionary(pa.int32(), pa.string())),
+            ("name", pa.string()),
+            ("time", pa.int64()),
+            ("rating", pa.int8()),
+            ("text", pa.string()),
+            ("has_pics", pa.bool_()),
+            ("has_response", pa.bool_()),
+            ("gmap_id", pa.dictionary(pa.int32(), pa.string())),
+        ]
+    )
+
+
+def meta_schema():
+    _require_pyarrow()
+    return pa.schema(
+        [
+            ("gmap_id", pa.dictionary(pa.int32(), pa.string())),
+            ("name", pa.string()),
+            ("address", pa.string()),
+            ("description", pa.string()),
+            ("latitude", pa.float64()),
+            ("longitude", pa.float64()),
+            ("category", pa.list_(pa.string())),
+            ("avg_rating", pa.float64()),
+            ("num_of_reviews", pa.int64()),
+        ]
+    )
+
+
+def _review_record(review: dict) -> dict:
+    return {
+        "user_id": review.get("user_id"),
+        "name": review.get("name"),
+        "time": review.get("time"),
+        "rating": review.get("rating"),
+        "text": review.get("text"),
+        "has_pics": bool(review.get("pics")),
+        "has_response": bool(review.get("resp")),
+        "gmap_id": review.get("gmap_id"),
+    }
+
+
+def _meta_record(place: dict, fields: list) -> dict:
+    return {field: place.get(field) for field in fields}
+
+
+def _source_stamp(source_path: Path) -> dict:
+    stat = Path(source_path).stat()
+    return {
+        "source": str(source_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def is_fresh(cache_dir: Path, source_path: Path) -> bool:
+    """True if cache_dir was built from source_path as it is now."""
+    stamp_path = Path(cache_dir) / SOURCE_FILE
+    if not stamp_path.exists() or not Path(source_path).exists():
+        return False
+    with open(stamp_path, "r", encoding="utf-8") as f:
+        stamp = json.load(f)
+    current = _source_stamp(source_path)
+    return stamp["size"] == current["size"] and stamp["mtime_ns"] == current["mtime_ns"]
+
+
+def _clear_parts(cache_dir: Path):
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for path in list(cache_dir.glob("part-*.parquet")) + [cache_dir / SOURCE_FILE]:
+        if path.exists():
+            path.unlink()
+
+
+def ingest_jsonl(
+    source_path: Path,
+    cache_dir: Path,
+    schema,
+    to_record,
+    batch_rows: int = BATCH_ROWS,
+    decode=None,
+) -> int:
+    """
+    Convert a JSONL file into Parquet parts of at most batch_rows rows each.
+
+    decode is a jsonl_decoder decode function (default: fastest installed).
+    Parts are numbered in file order. Returns the number of rows written.
+    """
+    _require_pyarrow()
+    cache_dir = Path(cache_dir)
+    _clear_parts(cache_dir)
+    if decode is None:
+        decode = jsonl_decoder.make_decoder()
+
+    print(f"Ingesting {source_path}")
+    print(f"  -> {cache_dir}")
+
+    batch = []
+    part = 0
+    total_rows = 0
+
+    def flush():
+        nonlocal part, batch
+        table = pa.Table.from_pylist(batch, schema=schema)
+        pq.write_table(
+            table, cache_dir / f"part-{part:05d}.parquet", compression="zstd"
+        )
+        part += 1
+        batch = []
+
+    with open(source_path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = decode(line)
+            except json.JSONDecodeError:
+                continue
+
+            batch.append(to_record(record))
+            total_rows += 1
+            if len(batch) >= batch_rows:
+                flush()
+                print(f"  Ingested {total_rows:,} rows...")
+
+    if batch or part == 0:
+        flush()
+
+    # Written last, so an interrupted ingest never looks fresh
+    with open(cache_dir / SOURCE_FILE, "w", encoding="utf-8") as f:
+        json.dump(_source_stamp(source_path), f, indent=2)
+
+    print(f"  ✓ {total_rows:,} rows in {part} part(s)")
+    return total_rows
+
+
+def build_review_cache(
+    review_path: Path = REVIEW_PATH,
+    cache_dir: Path = CACHE_DIR / "reviews",
+    decoder: str = "auto",
+) -> int:
+    decode = jsonl_decoder.make_decoder(decoder, typed=True)
+    return ingest_jsonl(
+        review_path, cache_dir, review_schema(), _review_record, decode=decode
+    )
+
+
+def build_meta_cache(
+    meta_path: Path = META_PATH,
+    cache_dir: Path = CACHE_DIR / "meta",
+    decoder: str = "auto",
+) -> int:
+    decode = jsonl_decoder.make_decoder(decoder)
+    schema = meta_schema()
+    fields = schema.names
+    return ingest_jsonl(
+        meta_path,
+        cache_dir,
+        schema,
+        lambda place: _meta_record(place, fields),
+        decode=decode,
+    )
+
+
+def review_parts(cache_dir: Path = CACHE_DIR / "reviews") -> list:
+    """Parquet parts of the review cache in original file order."""
+    return sorted(Path(cache_dir).glob("part-*.parquet"))
+
+
+def iter_review_parts(
+    columns: list = None, filters=None, cache_dir: Path = CACHE_DIR / "reviews"
+):
+    """
+    Yield (rows_in_part, table) for each review part in file order.
+
+    rows_in_part is the unfiltered row count, for progress reporting.
+    """
+    _require_pyarrow()
+    for part in review_parts(cache_dir):
+        rows_in_part = pq.ParquetFile(part).metadata.num_rows
+        yield rows_in_part, pq.read_table(part, columns=columns, filters=filters)
+
+
+def read_table(cache_dir: Path, columns: list = None, filters=None):
+    """Read the given columns of every part in cache_dir as one Arrow table."""
+    _require_pyarrow()
+    tables = [
+        pq.read_table(part, columns=columns, filters=filters)
+        for part in sorted(Path(cache_dir).glob("part-*.parquet"))
+    ]
+    return pa.concat_tables(tables)
+
+
+def read_reviews(
+    columns: list = None, cache_dir: Path = CACHE_DIR / "reviews"
+) -> pd.DataFrame:
+    """
+    Load review columns from the cache as a DataFrame.
+
+    Dictionary-encoded columns come back as pandas categoricals.
+    """
+    return read_table(cache_dir, columns).to_pandas()
+
+
+def read_meta(columns: list = None, cache_dir: Path = CACHE_DIR / "meta") -> list:
+    """Load meta records from the cache as a list of dicts (JSON field names)."""
+    return read_table(cache_dir, columns).to_pylist()
+
+
+def merged_parquet_path(csv_path: Path = MERGED_CSV_PATH) -> Path:
+    return review_writer.strip_compression(csv_path).with_suffix(".parquet")
+
+
+def build_merged_cache(csv_path: Path = MERGED_CSV_PATH) -> Path:
+    """Write a Parquet copy of the merged brewpub CSV next to it."""
+    _require_pyarrow()
+    csv_path = review_writer.find_output(csv_path)
+    parquet_path = merged_parquet_path(csv_path)
+    print(f"Caching {csv_path}")
+
+    df = read_merged_csv(csv_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {
+            **(table.schema.metadata or {}),
+            b"source_stamp": json.dumps(_source_stamp(csv_path)).encode("utf-8"),
+        }
+    )
+    pq.write_table(table, parquet_path, compression="zstd")
+
+    print(f"  ✓ {len(df):,} rows -> {parquet_path}")
+    return parquet_path
+
+
+def _merged_cache_is_fresh(csv_path: Path, parquet_path: Path) -> bool:
+    if pa is None or not parquet_path.exists() or not Path(csv_path).exists():
+        return False
+    metadata = pq.read_schema(parquet_path).metadata or {}
+    if b"source_stamp" not in metadata:
+        return False
+    stamp = json.loads(metadata[b"source_stamp"])
+    current = _source_stamp(csv_path)
+    return stamp["size"] == current["size"] and stamp["mtime_ns"] == current["mtime_ns"]
+
+
+def apply_merged_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast the merged CSV columns present in df to their MERGED_SCHEMA dtypes."""
+    dtypes = {}
+    for column in df.columns.intersection(list(MERGED_SCHEMA)):
+        dtype = MERGED_SCHEMA[column]
+        if dtype in INTEGER_DTYPES and df[column].isna().any():
+            dtype = INTEGER_DTYPES[dtype]
+        dtypes[column] = dtype
+    return df.astype(dtypes)
+
+
+def merged_csv_dtypes(columns: list = None) -> dict:
+    """
+    read_csv dtype= for columns of the merged CSV (default: all).
+
+    Strings, categoricals and flags are typed by the parser; integer columns
+    are left out and cast by apply_merged_schema() afterwards, once it is
+    known whether they have missing values.
+    """
+    return {
+        column: dtype
+        for column, dtype in MERGED_SCHEMA.items()
+        if dtype not in INTEGER_DTYPES and (columns is None or column in columns)
+    }
+
+
+def read_merged_csv(csv_path: Path, columns: list = None) -> pd.DataFrame:
+    """Load columns of a merged CSV (never the Parquet copy), typed."""
+    df = pd.read_csv(csv_path, usecols=columns, dtype=merged_csv_dtypes(columns))
+    return apply_merged_schema(df)
+
+
+def read_merged(columns: list = None, csv_path: Path = MERGED_CSV_PATH) -> pd.DataFrame:
+    """
+    Load columns of the merged brewpub reviews, typed by MERGED_SCHEMA.
+
+    Reads the Parquet copy when it is up to date with the CSV, otherwise falls
+    back to the CSV (still reading only the requested columns). A compressed
+    .csv.gz / .csv.zst written by the merge is used in place of the CSV.
+    Each consumer passes only the columns it uses.
+    """
+    csv_path = review_writer.find_output(csv_path)
+    parquet_path = merged_parquet_path(csv_path)
+    if _merged_cache_is_fresh(csv_path, parquet_path):
+        df = pq.read_table(parquet_path, columns=columns).to_pandas()
+        return apply_merged_schema(df)
+    return read_merged_csv(csv_path, columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--merged",
+        action="store_true",
+        help="Also cache outputs/brewpub_reviews_with_meta.csv",
+    )
+    parser.add_argument(
+        "--merged-only",
+        action="store_true",
+        help="Only cache the merged brewpub CSV",
+    )
+    parser.add_argument(
+        "--decoder",
+        choices=("auto",) + jsonl_decoder.BACKENDS,
+        default="auto",
+        help="JSON decoder backend for the ingest (default: fastest installed)",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Build Columnar Cache")
+    print("=" * 60)
+
+    if not args.merged_only:
+        build_meta_cache(decoder=args.decoder)
+        build_review_cache(decoder=args.decoder)
+
+    if args.merged or args.merged_only:
+        if not review_writer.find_output(MERGED_CSV_PATH).exists():
+            print(
+                f"\n⚠ {MERGED_CSV_PATH} not found - run merge_brewery_reviews.py first"
+            )
+            return
+        build_merged_cache()
+
+    print("\nDone!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Approximate distinct counting for exploratory runs at state scale.
+
+Two fixed-memory sketches over 64-bit value hashes (hash_values()):
+
+    HyperLogLog    one global distinct count (e.g. users, locations) in
+                   2**precision one-byte registers, standard error
+                   1.04 / sqrt(2**precision)
+    KeyedBitmaps   one linear-counting bitmap of `bits` bits per key (e.g.
+                   distinct locations per user), kept as uint64 words in
+                   arrays sorted by key hash
+
+Both are updated a batch of hashes at a time with numpy, so no per-review
+Python objects or string hash tables are kept. Keys of KeyedBitmaps are 64-bit
+hashes too: two keys colliding is negligible (~n**2 / 2**65).
+
+Usage:
+    users = distinct_sketch.HyperLogLog(precision=14)
+    users.add(distinct_sketch.hash_values(user_ids))
+    users.count(), users.relative_error()
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PRECISION = 14
+DEFAULT_BITMAP_BITS = 64
+
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+
+
+def hash_values(values) -> np.ndarray:
+    """Stable 64-bit hashes of strings (or other hashable values)."""
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """int.bit_length() of each uint64, exactly."""
+    values = values.copy()
+    lengths = np.zeros(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= (np.uint64(1) << np.uint64(shift))
+        lengths[high] += shift
+        values[high] >>= np.uint64(shift)
+    return lengths + (values > 0)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with 2**precision registers."""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(
+                f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}"
+            )
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        return self.registers.nbytes
+
+    def add(self, hashes: np.ndarray):
+        """Add a batch of 64-bit hashes."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return
+        rest_bits = 64 - self.precision
+        index = (hashes >> np.uint64(rest_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        # Position of the first 1 bit in the remaining bits
+        rank = (rest_bits + 1 - _bit_length(rest)).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self) -> float:
+        m = len(self.registers)
+        alpha = (
+            0.7213 / (1 + 1.079 / m)
+            if m >= 128
+            else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        )
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small range: linear counting on the empty registers
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+    def relative_error(self) -> float:
+        """Standard error of count(), relative to the true count."""
+        return 1.04 / np.sqrt(len(self.registers))
+
+
+class KeyedBitmaps:
+    """
+    Per-key distinct counts from linear-counting bitmaps of `bits` bits.
+
+    Memory is 8 + bits / 8 bytes per distinct key. Counts far below `bits`
+    are close to exact; a bitmap with every bit set is saturated and only
+    gives a lower bound (count() reports it as saturated_count()).
+    """
+
+    def __init__(self, bits: int = DEFAULT_BITMAP_BITS):
+        if bits < 64 or bits % 64:
+            raise ValueError("bits must be a positive multiple of 64")
+        self.bits = bits
+        self.keys = np.zeros(0, dtype=np.uint64)
+        self.bitmaps = np.zeros((0, bits // 64), dtype=np.uint64)
+
+    @property
+    def nbytes(self) -> int:
+        return self.keys.nbytes + self.bitmaps.nbytes
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key_hashes: np.ndarray, value_hashes: np.ndarray):
+        """Add a batch of (key, value) hash pairs."""
+        key_hashes = np.asarray(key_hashes, dtype=np.uint64)
+        if len(key_hashes) == 0:
+            return
+        words = self.bitmaps.shape[1]
+        bit = np.asarray(value_hashes, dtype=np.uint64) % np.uint64(self.bits)
+        word = (bit // np.uint64(64)).astype(np.int64)
+        mask = np.uint64(1) << (bit % np.uint64(64))
+
+        # Collapse the batch to one mask per distinct (key, word) pair
+        keys, key_index = np.unique(key_hashes, return_inverse=True)
+        pairs, pair_index = np.unique(key_index * words + word, return_inverse=True)
+        masks = np.zeros(len(pairs), dtype=np.uint64)
+        np.bitwise_or.at(masks, pair_index, mask)
+        pair_key, pair_word = np.divmod(pairs, words)
+
+        # OR the masks of keys already in the state into their rows
+        rows = np.searchsorted(self.keys, keys)
+        known = rows < len(self.keys)
+        known[known] = self.keys[rows[known]] == keys[known]
+        old = known[pair_key]
+        self.bitmaps[rows[pair_key[old]], pair_word[old]] |= masks[old]
+
+        # Insert rows for new keys at their sorted positions
+        new = ~known
+        if new.any():
+            new_row = np.cumsum(new) - 1
+            new_rows = np.zeros((int(new.sum()), words), dtype=np.uint64)
+            new_rows[new_row[pair_key[~old]], pair_word[~old]] = masks[~old]
+            self.keys = np.insert(self.keys, rows[new], keys[new])
+            self.bitmaps = np.insert(self.bitmaps, rows[new], new_rows, axis=0)
+
+    def bits_set(self) -> np.ndarray:
+        return np.unpackbits(self.bitmaps.view(np.uint8), axis=1).sum(axis=1)
+
+    def saturated_count(self) -> float:
+        """What estimate() gives for a full bitmap (a lower bound)."""
+        return self.bits * np.log(self.bits)
+
+    def estimate(self, bits_set: np.ndarray) -> np.ndarray:
+        """Linear-counting estimate of the distinct values behind bits_set."""
+        zeros = self.bits - np.asarray(bits_set)
+        with np.errstate(divide="ignore"):
+            estimates = -self.bits * np.log(zeros / self.bits)
+        return np.where(zeros == 0, self.saturated_count(), estimates)
+
+    def count(self) -> np.ndarray:
+        """Estimated distinct values per key, in key hash order."""
+        return self.estimate(self.bits_set())
+
+    def relative_error(self, n: float) -> float:
+        """Standard error of a per-key count of n, relative to n."""
+        load = n / self.bits
+        return float(np.sqrt(self.bits * (np.exp(load) - load - 1)) / n)
@@ -0,0 +1,269 @@
+"""
+Export static JSON stats tiles of the brewpub reviews for the dashboard.
+
+Instead of shipping brewpub_reviews_with_meta.csv to the browser, each
+municipality and each brewpub gets a small minified tile that the frontend
+fetches when it is clicked, plus one index of all tiles:
+
+    outputs/tiles/index.json
+    outputs/tiles/municipality/<municipality slug>.json
+    outputs/tiles/brewpub/<gmap_id, ':' as '_'>.json
+
+A tile holds the review count, mean rating, 1-5 star histogram, reviews per
+year and reviewer counts (distinct and repeat reviewers).
+
+The reviews are grouped once, by (gmap_id, reviewer, year, rating). Every
+brewpub and municipality statistic is then rolled up from that cube, not from
+the review rows. Tiles are written from a thread pool (--workers), since
+writing thousands of small files is I/O bound. Tiles of an earlier export are
+removed first.
+
+Usage:
+    python export_stats_tiles.py
+    python export_stats_tiles.py --workers 16
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import columnar_cache
+
+# Paths
+OUTPUT_DIR = Path(__file__).parent.parent / "outputs"
+CSV_PATH = OUTPUT_DIR / "brewpub_reviews_with_meta.csv"
+TILES_DIR = OUTPUT_DIR / "tiles"
+
+COLUMNS = [
+    "gmap_id",
+    "review_user_id",
+    "review_date",
+    "rating",
+    "business_name",
+    "municipality",
+]
+
+STARS = [1, 2, 3, 4, 5]
+
+# Brewpub tile fields repeated in index.json
+BREWPUB_INDEX_FIELDS = ["gmap_id", "name", "municipality", "reviews", "avg_rating"]
+
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def review_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """Review counts per (gmap_id, reviewer, year, rating) - the one pass."""
+    year = pd.to_numeric(df["review_date"].str.slice(0, 4), errors="coerce")
+    keys = [
+        df["gmap_id"],
+        df["review_user_id"],
+        year.astype("Int16").rename("year"),
+        df["rating"],
+    ]
+    return (
+        df.groupby(keys, observed=True, dropna=False, sort=False)
+        .size()
+        .rename("reviews")
+        .reset_index()
+    )
+
+
+def place_table(df: pd.DataFrame) -> pd.DataFrame:
+    """business_name and municipality of each brewpub (first review's values)."""
+    places = df.drop_duplicates("gmap_id")[["gmap_id", "business_name", "municipality"]]
+    return places.set_index("gmap_id")
+
+
+def rollup_stats(cube: pd.DataFrame, key: str) -> pd.DataFrame:
+    """
+    One row of tile statistics per value of key, from the review cube.
+
+    Columns: reviews, avg_rating, rating_histogram, yearly_reviews,
+    reviewers, repeat_reviewers.
+    """
+    cube = cube[cube[key].notna()]
+    grouped = cube.groupby(key, observed=True, sort=False)
+    rated = cube[cube["rating"].notna()]
+    rating_sum = (
+        (rated["rating"].astype("int64") * rated["reviews"])
+        .groupby(rated[key], observed=True, sort=False)
+        .sum()
+    )
+
+    stats = pd.DataFrame({"reviews": grouped["reviews"].sum()})
+    histogram = (
+        rated.groupby([key, "rating"], observed=True)["reviews"]
+        .sum()
+        .unstack(fill_value=0)
+        .reindex(index=stats.index, columns=STARS, fill_value=0)
+    )
+    stats["avg_rating"] = (
+        rating_sum.reindex(stats.index) / histogram.sum(axis=1).replace(0, np.nan)
+    ).round(3)
+    stats["rating_histogram"] = histogram.to_numpy().tolist()
+
+    yearly = {value: {} for value in stats.index}
+    by_year = cube[cube["year"].notna()].groupby([key, "year"], observed=True)
+    for (value, year), reviews in by_year["reviews"].sum().items():
+        yearly[value][str(year)] = int(reviews)
+    stats["yearly_reviews"] = pd.Series(yearly)
+
+    # Distinct reviewers; repeat reviewers reviewed more than once
+    per_reviewer = (
+        cube[cube["review_user_id"].notna()]
+        .groupby([key, "review_user_id"], observed=True)["reviews"]
+        .sum()
+    )
+    reviewer_groups = per_reviewer.groupby(level=0, observed=True)
+    stats["reviewers"] = reviewer_groups.size().reindex(stats.index, fill_value=0)
+    stats["repeat_reviewers"] = (
+        (per_reviewer > 1)
+        .groupby(level=0, observed=True)
+        .sum()
+        .reindex(stats.index, fill_value=0)
+    )
+    return stats
+
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "unnamed"
+
+
+def unique_slugs(names) -> dict:
+    """File-safe slug for each name; clashing slugs get -2, -3, ..."""
+    slugs = {}
+    used = set()
+    for name in names:
+        slug = base = slugify(name)
+        n = 2
+        while slug in used:
+            slug = f"{base}-{n}"
+            n += 1
+        used.add(slug)
+        slugs[name] = slug
+    return slugs
+
+
+def tile_record(row) -> dict:
+    avg_rating = row["avg_rating"]
+    return {
+        "reviews": int(row["reviews"]),
+        "avg_rating": None if pd.isna(avg_rating) else float(avg_rating),
+        "rating_histogram": row["rating_histogram"],
+        "yearly_reviews": row["yearly_reviews"],
+        "reviewers": int(row["reviewers"]),
+        "repeat_reviewers": int(row["repeat_reviewers"]),
+    }
+
+
+def build_tiles(df: pd.DataFrame) -> tuple:
+    """(tiles, index): tiles maps relative path -> tile dict."""
+    cube = review_cube(df)
+    places = place_table(df)
+    cube["municipality"] = cube["gmap_id"].map(places["municipality"])
+
+    tiles = {}
+    index = {"municipalities": [], "brewpubs": []}
+
+    brewpubs = rollup_stats(cube, "gmap_id")
+    for gmap_id, row in brewpubs.iterrows():
+        path = f"brewpub/{gmap_id.replace(':', '_')}.json"
+        name = places.at[gmap_id, "business_name"]
+        municipality = places.at[gmap_id, "municipality"]
+        tile = {
+            "gmap_id": gmap_id,
+            "name": None if pd.isna(name) else name,
+            "municipality": None if pd.isna(municipality) else municipality,
+            **tile_record(row),
+        }
+        tiles[path] = tile
+        entry = {key: tile[key] for key in BREWPUB_INDEX_FIELDS}
+        entry["tile"] = path
+        index["brewpubs"].append(entry)
+
+    municipalities = rollup_stats(cube, "municipality")
+    brewpubs_in = places.groupby("municipality", observed=True).size()
+    slugs = unique_slugs(municipalities.index)
+    for municipality, row in municipalities.iterrows():
+        path = f"municipality/{slugs[municipality]}.json"
+        tiles[path] = {
+            "municipality": municipality,
+            "brewpubs": int(brewpubs_in[municipality]),
+            **tile_record(row),
+        }
+        index["municipalities"].append(
+            {
+                "municipality": municipality,
+                "brewpubs": int(brewpubs_in[municipality]),
+                "reviews": int(row["reviews"]),
+                "tile": path,
+            }
+        )
+
+    return tiles, index
+
+
+def minified_json(data) -> bytes:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def write_tiles(tiles: dict, index: dict, tiles_dir: Path, workers: int) -> int:
+    """Write every tile in parallel, then index.json; return bytes written."""
+    for folder in ("municipality", "brewpub"):
+        (tiles_dir / folder).mkdir(parents=True, exist_ok=True)
+        for path in (tiles_dir / folder).glob("*.json"):
+            path.unlink()
+
+    def write(item) -> int:
+        path, tile = item
+        data = minified_json(tile)
+        (tiles_dir / path).write_bytes(data)
+        return len(data)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        total_bytes = sum(pool.map(write, tiles.items()))
+
+    data = minified_json(index)
+    (tiles_dir / "index.json").write_bytes(data)
+    return total_bytes + len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--input", type=Path, default=CSV_PATH)
+    parser.add_argument("--output-dir", type=Path, default=TILES_DIR)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Threads writing tiles (default: {DEFAULT_WORKERS})",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Export Brewpub Stats Tiles")
+    print("=" * 60)
+
+    print(f"\n📂 Loading {args.input}...")
+    df = columnar_cache.read_merged(COLUMNS, csv_path=args.input)
+    print(f"  Loaded {len(df):,} reviews")
+
+    tiles, index = build_tiles(df)
+    print(
+        f"\n✓ Built {len(index['brewpubs']):,} brewpub tiles and "
+        f"{len(index['municipalities']):,} municipality tiles"
+    )
+
+    total_bytes = write_tiles(tiles, index, args.output_dir, max(1, args.workers))
+    print(f"\n💾 Tiles saved to: {args.output_dir} ({total_bytes:,} bytes)")
+    print(f"  Index: {args.output_dir / 'index.json'}")
+
+
+if __name__ == "__main__":
+    main()
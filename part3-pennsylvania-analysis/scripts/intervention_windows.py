@@ -0,0 +1,413 @@
+"""
+Pre/during/post segmentation of reviews around per-place intervention windows.
+
+Generalizes the Love Park construction periods (part 1) to any number of
+places, each with its own window. The events table is a CSV keyed by gmap_id:
+
+    gmap_id,start,end[,any other columns]
+    0x89c6c8...:0x1a2b...,2016-02-01,2018-05-31
+
+start and end are inclusive calendar days in --timezone (the review_date
+timezone of the merge). A review is "pre" before the start day, "during" up to
+the end of the end day and "post" after it. Extra columns (site name,
+intervention type, ...) are carried through to the summary.
+
+All reviews are labelled in one pass: the events are sorted by gmap_id, each
+batch of reviews is joined to them with one np.searchsorted over its distinct
+gmap_ids, and review times are compared against per-place start/end arrays.
+Per place and phase, review counts and rating sums are accumulated with
+np.bincount, so memory does not grow with the number of reviews.
+
+Output: intervention_window_summary.csv (one row per place: reviews and mean
+        rating per phase, post minus pre rating change)
+        --labels: every review of an event place with its phase
+
+Usage:
+    python intervention_windows.py --events renovations.csv --workers 8
+    python intervention_windows.py --events renovations.csv --from-cache
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import columnar_cache
+import jsonl_decoder
+import merge_brewery_reviews as merge
+
+# Paths
+DATA_DIR = merge.DATA_DIR
+REVIEW_PATH = merge.REVIEW_PATH
+EVENTS_PATH = DATA_DIR / "intervention_events.csv"
+OUTPUT_DIR = merge.OUTPUT_DIR
+OUTPUT_PATH = OUTPUT_DIR / "intervention_window_summary.csv"
+
+PHASES = ["pre", "during", "post"]
+
+# Review fields read for labelling
+REVIEW_COLUMNS = ["user_id", "gmap_id", "time", "rating"]
+
+# Set in each worker process by _init_worker so the event keys are sent once
+# per process instead of once per chunk
+_worker_keys = None
+
+
+class InterventionWindows:
+    """Events table sorted by gmap_id, with window bounds as epoch ms arrays."""
+
+    def __init__(self, events: pd.DataFrame, timezone: str = merge.DEFAULT_TIMEZONE):
+        if events.empty:
+            raise ValueError("events table has no windows")
+        missing = {"gmap_id", "start", "end"}.difference(events.columns)
+        if missing:
+            raise ValueError(f"events table is missing columns: {sorted(missing)}")
+        duplicated = events["gmap_id"][events["gmap_id"].duplicated()]
+        if len(duplicated):
+            raise ValueError(
+                f"{len(duplicated):,} places have more than one window, "
+                f"e.g. {duplicated.iloc[0]}"
+            )
+
+        events = events.sort_values("gmap_id", kind="stable").reset_index(drop=True)
+        start = pd.to_datetime(events["start"])
+        end = pd.to_datetime(events["end"])
+        if (end < start).any():
+            raise ValueError("events with end before start")
+
+        self.events = events
+        self.timezone = timezone
+        self.gmap_ids = events["gmap_id"].to_numpy(dtype=object)
+        self.start_ms = self._epoch_ms(start)
+        # Exclusive bound: midnight after the end day
+        self.end_ms = self._epoch_ms(end + pd.Timedelta(days=1))
+
+    def _epoch_ms(self, days: pd.Series) -> np.ndarray:
+        local = days.dt.normalize().dt.tz_localize(self.timezone)
+        ms = (local - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(1, "ms")
+        return ms.to_numpy(dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.gmap_ids)
+
+    def event_index(self, gmap_ids) -> np.ndarray:
+        """Row of each review's place in the events table, -1 for no event."""
+        places = pd.Categorical(gmap_ids)
+        categories = places.categories.to_numpy(dtype=object)
+        positions = np.searchsorted(self.gmap_ids, categories)
+        positions = np.minimum(positions, len(self.gmap_ids) - 1)
+        found = self.gmap_ids[positions] == categories
+        category_event = np.append(np.where(found, positions, -1), -1)
+        # Missing gmap_ids have code -1, which picks the trailing -1
+        return category_event[places.codes]
+
+    def label(self, gmap_ids, times_ms) -> tuple:
+        """
+        (event index, phase code) per review, phase codes indexing PHASES.
+
+        Reviews of places without an event or without a time (missing or 0,
+        as for review_date in the merge) get -1 for both.
+        """
+        event = self.event_index(gmap_ids)
+        times = pd.to_numeric(pd.Series(times_ms), errors="coerce").to_numpy(
+            dtype=np.float64
+        )
+        event[np.isnan(times) | (times == 0)] = -1
+        known = event >= 0
+
+        phase = np.full(len(event), -1, dtype=np.int8)
+        t = times[known].astype(np.int64)
+        e = event[known]
+        phase[known] = (t >= self.start_ms[e]).astype(np.int8) + (t >= self.end_ms[e])
+        return event, phase
+
+
+class WindowStats:
+    """Review counts and rating sums per (place, phase), batch by batch."""
+
+    def __init__(self, num_events: int):
+        size = num_events * len(PHASES)
+        self.num_events = num_events
+        self.reviews = np.zeros(size, dtype=np.int64)
+        self.rated = np.zeros(size, dtype=np.int64)
+        self.rating_sum = np.zeros(size, dtype=np.float64)
+
+    def add(self, event: np.ndarray, phase: np.ndarray, ratings):
+        keep = event >= 0
+        keys = event[keep] * len(PHASES) + phase[keep]
+        ratings = pd.to_numeric(pd.Series(ratings), errors="coerce").to_numpy(
+            dtype=np.float64
+        )[keep]
+        rated = ~np.isnan(ratings)
+        size = len(self.reviews)
+        self.reviews += np.bincount(keys, minlength=size)
+        self.rated += np.bincount(keys[rated], minlength=size)
+        self.rating_sum += np.bincount(
+            keys[rated], weights=ratings[rated], minlength=size
+        )
+
+    def summary(self, windows: InterventionWindows) -> pd.DataFrame:
+        """Events table plus <phase>_reviews / <phase>_avg_rating columns."""
+        shape = (self.num_events, len(PHASES))
+        reviews = self.reviews.reshape(shape)
+        rated = self.rated.reshape(shape)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_rating = self.rating_sum.reshape(shape) / rated
+
+        summary = windows.events.copy()
+        for i, phase in enumerate(PHASES):
+            summary[f"{phase}_reviews"] = reviews[:, i]
+            summary[f"{phase}_avg_rating"] = avg_rating[:, i].round(3)
+        summary["rating_change"] = (
+            summary["post_avg_rating"] - summary["pre_avg_rating"]
+        ).round(3)
+        return summary
+
+
+def load_events(events_path: Path, timezone: str) -> InterventionWindows:
+    events = pd.read_csv(events_path, dtype={"gmap_id": str})
+    return InterventionWindows(events, timezone)
+
+
+def scan_chunk(
+    path: Path, start: int, end: int, keys: set, decoder: str = "auto"
+) -> tuple:
+    """
+    REVIEW_COLUMNS lists of the reviews in [start, end) whose gmap_id is in keys.
+
+    Lines are pre-filtered on their raw gmap_id as in the brewpub merge, so
+    only reviews of event places are decoded.
+    """
+    columns = {column: [] for column in REVIEW_COLUMNS}
+    lines_read = 0
+    decode = jsonl_decoder.make_decoder(decoder, typed=True)
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            lines_read += 1
+
+            match = merge.GMAP_ID_PATTERN.search(line)
+            if match is not None and match.group(1) not in keys:
+                continue
+            if not line.strip():
+                continue
+            try:
+                review = decode(line)
+            except json.JSONDecodeError:
+                continue
+            if review.get("gmap_id") is None:
+                continue
+            for column, values in columns.items():
+                values.append(review.get(column))
+
+    return lines_read, columns
+
+
+def _init_worker(keys: set):
+    global _worker_keys
+    _worker_keys = keys
+
+
+def _scan_chunk_worker(args: tuple) -> tuple:
+    path, start, end, decoder = args
+    return scan_chunk(path, start, end, _worker_keys, decoder)
+
+
+def iter_json_batches(
+    windows: InterventionWindows,
+    review_path: Path = REVIEW_PATH,
+    workers: int = 1,
+    decoder: str = "auto",
+):
+    """Yield (lines_read, columns) per chunk of the review JSONL."""
+    keys = {gmap_id.encode("utf-8") for gmap_id in windows.gmap_ids}
+    workers = max(1, workers)
+    num_chunks = workers * merge.CHUNKS_PER_WORKER if workers > 1 else 1
+    num_chunks = max(
+        num_chunks, -(-review_path.stat().st_size // merge.CHECKPOINT_BYTES)
+    )
+    chunks = [
+        (review_path, s, e, decoder)
+        for s, e in merge.chunk_boundaries(review_path, num_chunks)
+    ]
+    print(f"📂 Scanning {review_path} in {len(chunks)} chunks ({workers} workers)")
+
+    if workers > 1:
+        with multiprocessing.Pool(
+            workers, initializer=_init_worker, initargs=(keys,)
+        ) as pool:
+            yield from pool.imap(_scan_chunk_worker, chunks)
+    else:
+        for path, start, end, chunk_decoder in chunks:
+            yield scan_chunk(path, start, end, keys, chunk_decoder)
+
+
+def iter_cache_batches(windows: InterventionWindows):
+    """Yield (rows_in_part, columns) per part of the review cache."""
+    print(f"📂 Loading {', '.join(REVIEW_COLUMNS)} from the review cache...")
+    filters = [("gmap_id", "in", list(windows.gmap_ids))]
+    for rows_in_part, table in columnar_cache.iter_review_parts(
+        REVIEW_COLUMNS, filters=filters
+    ):
+        df = table.to_pandas()
+        yield rows_in_part, {column: df[column] for column in REVIEW_COLUMNS}
+
+
+def label_reviews(
+    windows: InterventionWindows, batches, labels_path: Path = None
+) -> WindowStats:
+    """
+    Label every batch and fold it into WindowStats.
+
+    With labels_path, the labelled reviews are also written there as CSV.
+    """
+    stats = WindowStats(len(windows))
+    lines_read = 0
+    labelled = 0
+    next_progress = 1_000_000
+    write_header = True
+
+    for batch_lines, columns in batches:
+        event, phase = windows.label(columns["gmap_id"], columns["time"])
+        stats.add(event, phase, columns["rating"])
+        lines_read += batch_lines
+        kept = event >= 0
+        labelled += int(kept.sum())
+
+        if labels_path is not None and kept.any():
+            rows = pd.DataFrame(
+                {column: np.asarray(values)[kept] for column, values in columns.items()}
+            )
+            rows["phase"] = np.array(PHASES, dtype=object)[phase[kept]]
+            rows.to_csv(
+                labels_path,
+                mode="w" if write_header else "a",
+                header=write_header,
+                index=False,
+            )
+            write_header = False
+
+        if lines_read >= next_progress:
+            print(f"  Processed {lines_read:,} reviews, labelled {labelled:,}...")
+            next_progress = (lines_read // 1_000_000 + 1) * 1_000_000
+
+    print(f"\n✓ Labelled {labelled:,} of {lines_read:,} reviews")
+    return stats
+
+
+def print_summary(summary: pd.DataFrame):
+    print("\n" + "=" * 60)
+    print("INTERVENTION WINDOW SUMMARY")
+    print("=" * 60)
+    print(f"\nPlaces with a window: {len(summary):,}")
+    for phase in PHASES:
+        reviews = summary[f"{phase}_reviews"]
+        ratings = summary[f"{phase}_avg_rating"]
+        # Review-weighted mean rating over all places
+        weighted = (ratings * reviews).sum() / reviews[ratings.notna()].sum()
+        print(
+            f"  {phase.title():<7} {reviews.sum():>12,} reviews  "
+            f"avg rating {weighted:.3f}"
+        )
+
+    compared = summary["rating_change"].dropna()
+    print(f"\nPlaces with both pre and post reviews: {len(compared):,}")
+    if len(compared):
+        print(f"  Mean rating change (post - pre):   {compared.mean():+.3f}")
+        print(f"  Median rating change (post - pre): {compared.median():+.3f}")
+        print(f"  Places rated higher after:         {(compared > 0).sum():,}")
+        print(f"  Places rated lower after:          {(compared < 0).sum():,}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--events",
+        type=Path,
+        default=EVENTS_PATH,
+        help=f"CSV of gmap_id,start,end windows (default: {EVENTS_PATH.name})",
+    )
+    parser.add_argument("--review-path", type=Path, default=REVIEW_PATH)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument(
+        "--labels",
+        type=Path,
+        default=None,
+        help="Also write every labelled review (gmap_id, user_id, time, rating, "
+        "phase) to this CSV",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=f"Processes for the review scan (this machine has {os.cpu_count()} cores)",
+    )
+    parser.add_argument(
+        "--from-cache",
+        action="store_true",
+        help="Read the Parquet cache built by columnar_cache.py instead of the JSONL",
+    )
+    parser.add_argument(
+        "--decoder",
+        choices=("auto",) + jsonl_decoder.BACKENDS,
+        default="auto",
+        help="JSON decoder backend (default: fastest installed)",
+    )
+    parser.add_argument(
+        "--timezone",
+        default=merge.DEFAULT_TIMEZONE,
+        help=f"Timezone of the window dates (default: {merge.DEFAULT_TIMEZONE})",
+    )
+    args = parser.parse_args()
+    try:
+        pd.Timestamp(0, tz=args.timezone)
+    except Exception:
+        parser.error(f"unknown timezone: {args.timezone}")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 60)
+    print("Intervention Window Segmentation")
+    print("=" * 60)
+
+    if args.from_cache and not columnar_cache.is_fresh(
+        columnar_cache.CACHE_DIR / "reviews", args.review_path
+    ):
+        print("\n⚠ Columnar cache missing or stale - run columnar_cache.py first")
+        return
+
+    windows = load_events(args.events, args.timezone)
+    print(f"\n✓ Loaded {len(windows):,} intervention windows from {args.events}")
+
+    if args.from_cache:
+        batches = iter_cache_batches(windows)
+    else:
+        batches = iter_json_batches(
+            windows, args.review_path, args.workers, args.decoder
+        )
+    stats = label_reviews(windows, batches, args.labels)
+
+    summary = stats.summary(windows)
+    summary.to_csv(args.output, index=False)
+    print_summary(summary)
+
+    print(f"\n💾 Summary saved to: {args.output}")
+    if args.labels is not None:
+        print(f"💾 Labelled reviews saved to: {args.labels}")
+
+
+if __name__ == "__main__":
+    main()
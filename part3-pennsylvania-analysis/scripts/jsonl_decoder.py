@@ -0,0 +1,123 @@
+"""
+JSON line decoding shared by every JSONL reader in this folder.
+
+Picks the fastest installed backend:
+
+    msgspec  - optional typed decoding straight into a review Struct
+    orjson   - fast generic decoding
+    json     - the standard library (always available)
+
+Whatever the backend, decode() gives the same result as json.loads: a line
+the fast backend rejects (orjson and msgspec are stricter about NaN, huge
+integers and invalid surrogates) is retried with json.loads, so the only
+error callers see is json.JSONDecodeError, exactly as before.
+
+Usage:
+    decode = jsonl_decoder.make_decoder()               # dict per line
+    decode = jsonl_decoder.make_decoder(typed=True)     # review.get() only
+"""
+
+import json
+from typing import Optional, Union
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # Optional dependency
+    msgspec = None
+
+# Preference order for backend="auto"
+BACKENDS = ("msgspec", "orjson", "json")
+
+# The review-Pennsylvania.json schema
+REVIEW_FIELDS = ("user_id", "name", "time", "rating", "text", "pics", "resp", "gmap_id")
+
+if msgspec is not None:
+
+    class Review(msgspec.Struct, gc=False):
+        """
+        One review line. Fields missing from the line stay UNSET.
+
+        get() reads it like the dict json.loads would give, so readers work
+        unchanged. gc=False keeps millions of kept reviews out of the cycle GC.
+        """
+
+        user_id: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+        name: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+        time: Union[Optional[int], msgspec.UnsetType] = msgspec.UNSET
+        rating: Union[Optional[int], msgspec.UnsetType] = msgspec.UNSET
+        text: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+        pics: object = msgspec.UNSET
+        resp: object = msgspec.UNSET
+        gmap_id: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+
+        def get(self, field: str, default=None):
+            value = getattr(self, field, msgspec.UNSET)
+            return default if value is msgspec.UNSET else value
+
+
+def available_backends() -> list:
+    """Installed backends, fastest first."""
+    installed = {"msgspec": msgspec, "orjson": orjson, "json": json}
+    return [name for name in BACKENDS if installed[name] is not None]
+
+
+def resolve_backend(backend: str = "auto") -> str:
+    if backend == "auto":
+        return available_backends()[0]
+    if backend not in available_backends():
+        raise ValueError(
+            f"JSON backend '{backend}' is not installed "
+            f"(available: {', '.join(available_backends())})"
+        )
+    return backend
+
+
+def _with_fallback(fast_loads, errors: tuple):
+    def decode(line):
+        try:
+            return fast_loads(line)
+        except errors:
+            return json.loads(line)
+
+    return decode
+
+
+def make_decoder(backend: str = "auto", typed: bool = False):
+    """
+    Return a decode(line) function for str or bytes lines.
+
+    With typed=True and the msgspec backend, lines are decoded into the
+    Review struct, which only supports get() (other keys of the line are
+    dropped). Lines that do not fit the struct's types are decoded
+    generically. Other backends ignore typed.
+
+    Raises:
+        ValueError: if the requested backend is not installed
+    """
+    backend = resolve_backend(backend)
+
+    if backend == "msgspec":
+        generic = _with_fallback(msgspec.json.Decoder().decode, (msgspec.DecodeError,))
+        if not typed:
+            return generic
+        struct_decoder = msgspec.json.Decoder(Review)
+
+        def decode(line):
+            try:
+                return struct_decoder.decode(line)
+            except msgspec.ValidationError:
+                return generic(line)
+            except msgspec.DecodeError:
+                return json.loads(line)
+
+        return decode
+
+    if backend == "orjson":
+        return _with_fallback(orjson.loads, (orjson.JSONDecodeError,))
+
+    return json.loads
@@ -0,0 +1,364 @@
+"""
+Run the brewpub merge (merge_brewery_reviews.py) for every state dump.
+
+Discovers meta-<State>.json / review-<State>.json pairs in the data folder
+(either as plain files or as the <name>.json/<name>.json folders the
+downloads unpack to), merges each state in its own process and writes
+per-state partitions:
+
+    outputs/states/state=<State>/brewpub_reviews_with_meta.csv
+    outputs/states/state=<State>/merge.log
+    outputs/states/merge_summary.csv
+
+States are scheduled largest review file first on a process pool sized to
+the CPU count and to the memory available (--memory-per-state GB each).
+Review dates use each state's main timezone unless --timezone is given.
+
+Usage:
+    python merge_all_states.py
+    python merge_all_states.py --states Pennsylvania Ohio --compress zstd
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import multiprocessing
+import os
+import time
+from pathlib import Path
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import category_filters
+import jsonl_decoder
+import merge_brewery_reviews as merge
+import review_writer
+
+# Paths
+DATA_DIR = merge.DATA_DIR
+STATES_DIR = merge.OUTPUT_DIR / "states"
+SUMMARY_PATH = STATES_DIR / "merge_summary.csv"
+
+# Rough peak memory of one state's merge: the matched places plus one
+# checkpoint chunk of review lines and its rows
+DEFAULT_MEMORY_PER_STATE_GB = 1.0
+
+# Main timezone of each state (file name spelling), for review dates
+STATE_TIMEZONES = {
+    "Alabama": "America/Chicago",
+    "Alaska": "America/Anchorage",
+    "Arizona": "America/Phoenix",
+    "Arkansas": "America/Chicago",
+    "California": "America/Los_Angeles",
+    "Colorado": "America/Denver",
+    "Connecticut": "America/New_York",
+    "Delaware": "America/New_York",
+    "District_of_Columbia": "America/New_York",
+    "Florida": "America/New_York",
+    "Georgia": "America/New_York",
+    "Hawaii": "Pacific/Honolulu",
+    "Idaho": "America/Boise",
+    "Illinois": "America/Chicago",
+    "Indiana": "America/Indiana/Indianapolis",
+    "Iowa": "America/Chicago",
+    "Kansas": "America/Chicago",
+    "Kentucky": "America/New_York",
+    "Louisiana": "America/Chicago",
+    "Maine": "America/New_York",
+    "Maryland": "America/New_York",
+    "Massachusetts": "America/New_York",
+    "Michigan": "America/Detroit",
+    "Minnesota": "America/Chicago",
+    "Mississippi": "America/Chicago",
+    "Missouri": "America/Chicago",
+    "Montana": "America/Denver",
+    "Nebraska": "America/Chicago",
+    "Nevada": "America/Los_Angeles",
+    "New_Hampshire": "America/New_York",
+    "New_Jersey": "America/New_York",
+    "New_Mexico": "America/Denver",
+    "New_York": "America/New_York",
+    "North_Carolina": "America/New_York",
+    "North_Dakota": "America/Chicago",
+    "Ohio": "America/New_York",
+    "Oklahoma": "America/Chicago",
+    "Oregon": "America/Los_Angeles",
+    "Pennsylvania": "America/New_York",
+    "Rhode_Island": "America/New_York",
+    "South_Carolina": "America/New_York",
+    "South_Dakota": "America/Chicago",
+    "Tennessee": "America/Chicago",
+    "Texas": "America/Chicago",
+    "Utah": "America/Denver",
+    "Vermont": "America/New_York",
+    "Virginia": "America/New_York",
+    "Washington": "America/Los_Angeles",
+    "West_Virginia": "America/New_York",
+    "Wisconsin": "America/Chicago",
+    "Wyoming": "America/Denver",
+}
+
+# lines/bytes_scanned and the rates cover the last run only, which may have
+# resumed part way through the file
+SUMMARY_FIELDS = [
+    "state",
+    "review_bytes",
+    "lines_read",
+    "total_reviews",
+    "matched_reviews",
+    "lines_scanned",
+    "bytes_scanned",
+    "seconds",
+    "lines_per_sec",
+    "mb_per_sec",
+]
+
+
+def _dump_file(data_dir: Path, name: str) -> Path:
+    """<name>.json, or <name>.json/<name>.json as unpacked from the download."""
+    path = data_dir / f"{name}.json"
+    if path.is_dir():
+        path = path / f"{name}.json"
+    return path
+
+
+def discover_states(data_dir: Path = DATA_DIR) -> dict:
+    """
+    Find states with both a meta and a review dump.
+
+    Returns:
+        dict of state -> (meta_path, review_path), in name order
+    """
+    states = {}
+    for entry in sorted(Path(data_dir).glob("meta-*.json")):
+        state = entry.name[len("meta-") : -len(".json")]
+        meta_path = _dump_file(data_dir, f"meta-{state}")
+        review_path = _dump_file(data_dir, f"review-{state}")
+        if meta_path.is_file() and review_path.is_file():
+            states[state] = (meta_path, review_path)
+        else:
+            print(f"  ⚠ Skipping {state}: meta or review file missing")
+    return states
+
+
+def available_memory_gb() -> float:
+    """Memory available for new processes, or None where it can't be read."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024 / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024**3
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def pool_size(num_states: int, memory_per_state_gb: float, workers: int = None) -> int:
+    """Processes to run: at most one per core, per state, and per memory slot."""
+    size = workers or os.cpu_count() or 1
+    memory_gb = available_memory_gb()
+    if memory_gb is not None:
+        size = min(size, max(1, int(memory_gb // memory_per_state_gb)))
+    return max(1, min(size, num_states))
+
+
+def merge_state(task: dict) -> dict:
+    """
+    Merge one state into its partition; progress goes to its merge.log.
+
+    A failing state is reported in the result ("error") instead of stopping
+    the other states.
+    """
+    try:
+        return _merge_state(task)
+    except Exception as e:
+        return {"state": task["state"], "error": f"{type(e).__name__}: {e}"}
+
+
+def _read_checkpoint(checkpoint_path: Path) -> dict:
+    if not checkpoint_path.exists():
+        return None
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _merge_state(task: dict) -> dict:
+    state_dir = STATES_DIR / f"state={task['state']}"
+    state_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = state_dir / merge.CHECKPOINT_PATH.name
+    before = _read_checkpoint(checkpoint_path) if task["resume"] else None
+    router = category_filters.CategoryRouter(task["filters"])
+    output_paths = {
+        name: review_writer.compressed_path(
+            state_dir / f"{name}_reviews_with_meta.csv", task["compress"]
+        )
+        for name in router.names
+    }
+
+    began = time.perf_counter()
+    with open(state_dir / "merge.log", "w", encoding="utf-8") as log:
+        with contextlib.redirect_stdout(log):
+            print(f"State: {task['state']} (review dates in {task['timezone']})")
+            places = merge.load_place_metadata(
+                router, decoder=task["decoder"], meta_path=task["meta_path"]
+            )
+            merge.process_reviews(
+                places,
+                review_path=task["review_path"],
+                output_paths=output_paths,
+                checkpoint_path=checkpoint_path,
+                resume=task["resume"],
+                decoder=task["decoder"],
+                timezone=task["timezone"],
+            )
+    seconds = time.perf_counter() - began
+
+    # The checkpoint of the finished run has the scan counters
+    after = _read_checkpoint(checkpoint_path)
+    lines_scanned = after["lines_read"]
+    bytes_scanned = after["offset"]
+    if before is not None and before["offset"] <= after["offset"]:
+        lines_scanned -= before["lines_read"]
+        bytes_scanned -= before["offset"]
+    return {
+        "state": task["state"],
+        "review_bytes": task["review_path"].stat().st_size,
+        "lines_read": after["lines_read"],
+        "total_reviews": after["total_reviews"],
+        "matched_reviews": after["matched_reviews"],
+        "lines_scanned": lines_scanned,
+        "bytes_scanned": bytes_scanned,
+        "seconds": round(seconds, 1),
+        "lines_per_sec": round(lines_scanned / seconds) if seconds else 0,
+        "mb_per_sec": round(bytes_scanned / 1024**2 / seconds, 1) if seconds else 0,
+    }
+
+
+def write_summary(results: list, summary_path: Path = SUMMARY_PATH):
+    """Write per-state results, keeping rows of states not run this time."""
+    rows = {}
+    if summary_path.exists():
+        with open(summary_path, "r", newline="", encoding="utf-8") as f:
+            rows = {row["state"]: row for row in csv.DictReader(f)}
+    rows.update({result["state"]: result for result in results})
+    with open(summary_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows[state] for state in sorted(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument(
+        "--states", nargs="*", help="Only these states (default: every state found)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Max states merged at once"
+    )
+    parser.add_argument(
+        "--memory-per-state",
+        type=float,
+        default=DEFAULT_MEMORY_PER_STATE_GB,
+        help="GB to reserve per concurrent merge when sizing the pool",
+    )
+    parser.add_argument("--filters", type=Path, default=None)
+    parser.add_argument(
+        "--compress", choices=list(review_writer.COMPRESSIONS), default="none"
+    )
+    parser.add_argument(
+        "--decoder", choices=("auto",) + jsonl_decoder.BACKENDS, default="auto"
+    )
+    parser.add_argument(
+        "--timezone", default=None, help="One timezone for all states' review dates"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue each state from its checkpoint; finished states are skipped",
+    )
+    args = parser.parse_args()
+    if args.timezone is not None:
+        try:
+            ZoneInfo(args.timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            parser.error(f"unknown timezone: {args.timezone}")
+
+    print("=" * 60)
+    print("Merge Brewpub Reviews - All States")
+    print("=" * 60)
+
+    states = discover_states(args.data_dir)
+    if args.states:
+        missing = sorted(set(args.states) - set(states))
+        if missing:
+            print(f"  ⚠ No dumps found for: {', '.join(missing)}")
+        states = {s: paths for s, paths in states.items() if s in args.states}
+    if not states:
+        print(f"\n⚠ No state dumps found in {args.data_dir}")
+        return
+
+    filters = category_filters.load_filters(args.filters)
+    tasks = [
+        {
+            "state": state,
+            "meta_path": meta_path,
+            "review_path": review_path,
+            "filters": filters,
+            "compress": args.compress,
+            "decoder": args.decoder,
+            "timezone": args.timezone
+            or STATE_TIMEZONES.get(state, merge.DEFAULT_TIMEZONE),
+            "resume": args.resume,
+        }
+        for state, (meta_path, review_path) in states.items()
+    ]
+    # Largest first, so a big state does not start last and run alone
+    tasks.sort(key=lambda task: task["review_path"].stat().st_size, reverse=True)
+
+    size = pool_size(len(tasks), args.memory_per_state, args.workers)
+    total_gb = sum(task["review_path"].stat().st_size for task in tasks) / 1024**3
+    print(f"\nStates: {len(tasks)} ({total_gb:,.1f} GB of reviews)")
+    print(f"Processes: {size}")
+    STATES_DIR.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    failed = []
+    began = time.perf_counter()
+    with multiprocessing.Pool(size) as pool:
+        for result in pool.imap_unordered(merge_state, tasks):
+            if "error" in result:
+                failed.append(result)
+                print(f"  ✗ {result['state']:<22} {result['error']}")
+                continue
+            results.append(result)
+            print(
+                f"  ✓ {result['state']:<22} {result['matched_reviews']:>9,} matched"
+                f"  {result['lines_per_sec']:>10,} lines/s  ({result['seconds']}s)"
+            )
+    elapsed = time.perf_counter() - began
+
+    write_summary(results, SUMMARY_PATH)
+
+    lines = sum(result["lines_scanned"] for result in results)
+    review_bytes = sum(result["bytes_scanned"] for result in results)
+    print(f"\n✓ Done in {elapsed:,.1f}s")
+    print(f"  Reviews scanned: {lines:,}")
+    print(f"  Reviews matched: {sum(r['matched_reviews'] for r in results):,}")
+    print(
+        f"  Aggregate throughput: {lines / elapsed:,.0f} lines/s, "
+        f"{review_bytes / 1024**2 / elapsed:,.1f} MB/s"
+    )
+    print(f"  Summary saved to: {SUMMARY_PATH}")
+    if failed:
+        print(
+            f"\n⚠ {len(failed)} state(s) failed: {', '.join(r['state'] for r in failed)}"
+        )
+        print("  See merge.log in their partitions; rerun with --resume")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,33 @@
 Merge review-Pennsylvania.json with meta-Pennsylvania.json
 Filter for brewery-related businesses and extract municipality.
 
-Output: brewery_reviews_with_meta.csv
+Other categories can be merged in the same pass with --filters (see
+category_filters.py); each filter gets its own <name>_reviews_with_meta.csv.
+
+Output: brewpub_reviews_with_meta.csv (.csv.gz / .csv.zst with --compress)
+        reviewer_tally.csv with --tally, tallied from the rows as they are
+        written instead of reading the CSV back
 """
 
+import argparse
+import contextlib
+import hashlib
 import json
+import multiprocessing
+import os
 import re
-import csv
 from pathlib import Path
-from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import category_filters
+import columnar_cache
+import jsonl_decoder
+import meta_index
+import review_writer
+import reviewer_tally
+from municipality import extract_municipality
 
 # Paths
 DATA_DIR = Path(__file__).parent.parent.parent / "data" / "part 3"
@@ -17,36 +36,15 @@ META_PATH = DATA_DIR / "meta-Pennsylvania.json" / "meta-Pennsylvania.json"
 REVIEW_PATH = DATA_DIR / "review-Pennsylvania.json" / "review-Pennsylvania.json"
 OUTPUT_DIR = Path(__file__).parent.parent / "outputs"
 OUTPUT_DIR.mkdir(exist_ok=True)
+CHECKPOINT_PATH = OUTPUT_DIR / "merge_checkpoint.json"
 
+# Output whose reviewers --tally counts (reviewer_tally.py's input)
+TALLY_OUTPUT = "brewpub"
 
-def extract_municipality(address: str) -> str:
-    """
-    Extract municipality (city) from address string.
-    Format: "Business Name, Street, City, State ZIP"
-    """
-    if not address:
-        return ""
 
-    # Split by comma and try to find city
-    parts = [p.strip() for p in address.split(",")]
-
-    # Typical format: Name, Street, City, State ZIP
-    # We want the second-to-last part before "PA XXXXX"
-    for i, part in enumerate(parts):
-        if re.search(r"\bPA\s+\d{5}", part):
-            # This part contains state and ZIP, city is the previous part
-            if i > 0:
-                return parts[i - 1]
-            # If state/zip is in same part as city (rare), try to extract
-            match = re.match(r"^(.+?)\s+PA\s+\d{5}", part)
-            if match:
-                return match.group(1).strip()
-
-    # Fallback: if no PA ZIP found, try last meaningful part
-    if len(parts) >= 3:
-        return parts[-2]  # Second to last
-
-    return ""
+_brewpub_rule = category_filters.CategoryRule(
+    "brewpub", category_filters.DEFAULT_FILTERS["brewpub"]
+)
 
 
 def is_brewpub(categories: list) -> bool:
@@ -56,188 +54,794 @@ def is_brewpub(categories: list) -> bool:
     A brewpub is a brewery that sells its beer on-site (restaurant + brewery).
     This is a strict filter - only matches "Brewpub" category exactly.
     """
-    if not categories:
-        return False
+    return _brewpub_rule(categories)
 
-    for cat in categories:
-        if cat.lower() == "brewpub":
-            return True
 
-    return False
+def iter_meta_places(meta_path: Path = META_PATH, decoder: str = "auto"):
+    """Yield each place record of the meta JSONL file."""
+    decode = jsonl_decoder.make_decoder(decoder)
+    with open(meta_path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield decode(line)
+            except json.JSONDecodeError:
+                continue
+
 
+def place_metadata(place: dict, outputs: tuple) -> dict:
+    """
+    Metadata kept for a matched place, tagged with its output filters.
 
-def load_brewpub_metadata() -> dict:
+    metadata["row_fragment"] holds the place's output columns, formatted once
+    and shared by every review row of the place.
+    """
+    meta = {
+        "name": place.get("name", ""),
+        "address": place.get("address", ""),
+        "gmap_id": place.get("gmap_id"),
+        "description": place.get("description", ""),
+        "latitude": place.get("latitude"),
+        "longitude": place.get("longitude"),
+        "category": place.get("category", []),
+        "avg_rating": place.get("avg_rating"),
+        "num_of_reviews": place.get("num_of_reviews"),
+        "misc": place.get("MISC", place.get("misc", {})),
+        "municipality": extract_municipality(place.get("address", "")),
+        "outputs": outputs,
+    }
+    meta["row_fragment"] = (
+        meta["name"],
+        meta["address"],
+        meta["municipality"],
+        meta["latitude"],
+        meta["longitude"],
+        "|".join(meta["category"]) if meta["category"] else "",
+        meta["description"] or "",
+        meta["avg_rating"],
+        meta["num_of_reviews"],
+    )
+    return meta
+
+
+def load_place_metadata(
+    router: category_filters.CategoryRouter,
+    from_cache: bool = False,
+    use_index: bool = False,
+    decoder: str = "auto",
+    meta_path: Path = None,
+) -> dict:
+    """
+    Load meta file and keep places matching any of the router's filters.
+
+    meta_path defaults to the Pennsylvania meta file (META_PATH).
+
+    Returns:
+        dict of gmap_id -> metadata, where metadata["outputs"] lists the
+        names of the filters the place matched
+    """
+    meta_path = meta_path or META_PATH
+    if use_index:
+        index_path = meta_index.index_path_for(meta_path)
+        print(f"Loading metadata from: {index_path}")
+        conn = meta_index.open_index(meta_path, index_path)
+        exact, prefixes = router.positive_terms()
+        places = meta_index.places_in_categories(conn, exact, prefixes).values()
+        total_places = meta_index.total_places(conn)
+        conn.close()
+    elif from_cache:
+        print(f"Loading metadata from: {columnar_cache.CACHE_DIR / 'meta'}")
+        places = columnar_cache.read_meta()
+        total_places = None
+    else:
+        print(f"Loading metadata from: {meta_path}")
+        places = iter_meta_places(meta_path, decoder)
+        total_places = None
+
+    matched = {}
+    seen_places = 0
+
+    for place in places:
+        seen_places += 1
+
+        outputs = router.match(place.get("category", []))
+        if outputs:
+            gmap_id = place.get("gmap_id")
+            if gmap_id:
+                matched[gmap_id] = place_metadata(place, outputs)
+
+    print(f"  Total places: {total_places or seen_places:,}")
+    for name in router.names:
+        count = sum(name in meta["outputs"] for meta in matched.values())
+        print(f"  {name} places found: {count:,}")
+    return matched
+
+
+def load_brewpub_metadata(from_cache: bool = False, use_index: bool = False) -> dict:
     """Load meta file and filter for Brewpub businesses only."""
-    print(f"Loading metadata from: {META_PATH}")
+    router = category_filters.CategoryRouter(category_filters.DEFAULT_FILTERS)
+    return load_place_metadata(router, from_cache=from_cache, use_index=use_index)
+
+
+FIELDNAMES = [
+    "review_user_id",
+    "review_user_name",
+    "review_time",
+    "review_date",
+    "rating",
+    "review_text",
+    "has_pics",
+    "has_response",
+    "gmap_id",
+    "business_name",
+    "address",
+    "municipality",
+    "latitude",
+    "longitude",
+    "category",
+    "description",
+    "avg_rating",
+    "num_of_reviews",
+]
+
+# Positions in an output row tuple (FIELDNAMES order)
+ROW_TIME = FIELDNAMES.index("review_time")
+ROW_GMAP_ID = FIELDNAMES.index("gmap_id")
+
+# Chunks per worker - more chunks than workers keeps all cores busy when
+# some byte ranges are denser (longer review texts) than others
+CHUNKS_PER_WORKER = 4
+
+# Review dates are the calendar day in this timezone, whatever the host's
+# local timezone. The reviews are of Pennsylvania places.
+DEFAULT_TIMEZONE = "America/New_York"
+
+# Bytes of review file per checkpoint. The scan is cut into chunks of at most
+# this size so progress can be saved after each one, even with one worker.
+CHECKPOINT_BYTES = 256 * 1024 * 1024
+
+# Bytes before the checkpointed offset that are hashed, so an incremental run
+# can tell an appended review file from a rewritten one
+OFFSET_HASH_BYTES = 64 * 1024
+
+# Set in each worker process by _init_worker so the places dict is sent once
+# per process instead of once per chunk
+_worker_places = None
+
+# Matches the raw gmap_id value of a review line. A quote inside review text is
+# always escaped, so an unescaped '"gmap_id":' can only be the real key.
+GMAP_ID_PATTERN = re.compile(rb'"gmap_id"\s*:\s*"([^"\\]*)"')
+
+
+def review_head(review: dict) -> tuple:
+    """The review columns of an output row, without review_date."""
+    return (
+        review.get("user_id", ""),
+        review.get("name", ""),
+        review.get("time", 0),
+        review.get("rating", ""),
+        review.get("text", ""),
+        bool(review.get("pics")),
+        bool(review.get("resp")),
+        review.get("gmap_id"),
+    )
+
+
+def review_dates(timestamps_ms: list, timezone: str = DEFAULT_TIMEZONE) -> list:
+    """
+    Format millisecond timestamps as YYYY-MM-DD dates in timezone.
 
-    brewpubs = {}
-    total_places = 0
+    Vectorized over the whole list; missing or zero timestamps give "".
+    """
+    times = pd.Series(timestamps_ms, dtype="float64")
+    dates = np.full(len(times), "", dtype=object)
+    present = (times.notna() & (times != 0)).to_numpy()
+    if present.any():
+        local = (
+            pd.to_datetime(times[present].astype("int64"), unit="ms", utc=True)
+            .dt.tz_convert(timezone)
+            .dt.tz_localize(None)
+        )
+        dates[present] = local.to_numpy().astype("datetime64[D]").astype(str)
+    return dates.tolist()
+
+
+def build_rows(heads: list, places: dict, timezone: str = DEFAULT_TIMEZONE) -> list:
+    """
+    Output rows (tuples in FIELDNAMES order) for a batch of review_head()s.
+
+    Dates are computed for the whole batch at once and each row reuses its
+    place's precomputed row_fragment.
+    """
+    dates = review_dates([head[2] for head in heads], timezone)
+    return [
+        (user_id, name, time, date, rating, text, pics, resp, gmap_id)
+        + places[gmap_id]["row_fragment"]
+        for (user_id, name, time, rating, text, pics, resp, gmap_id), date in zip(
+            heads, dates
+        )
+    ]
+
+
+def chunk_boundaries(path: Path, num_chunks: int, start: int = 0) -> list:
+    """
+    Split a JSONL file into byte ranges that start and end on line boundaries.
+
+    Each range is (start, end) with end exclusive. A line belongs to the range
+    its first byte falls in, so every line is read by exactly one range.
+    """
+    file_size = path.stat().st_size
+    if file_size <= start:
+        return []
+
+    step = max(1, (file_size - start) // max(1, num_chunks))
+    offsets = [start]
+
+    with open(path, "rb") as f:
+        for i in range(1, num_chunks):
+            f.seek(start + i * step)
+            f.readline()  # Skip to the start of the next full line
+            offset = f.tell()
+            if offset >= file_size:
+                break
+            if offset > offsets[-1]:
+                offsets.append(offset)
+
+    offsets.append(file_size)
+    return list(zip(offsets[:-1], offsets[1:]))
+
+
+def scan_chunk(
+    path: Path,
+    start: int,
+    end: int,
+    places: dict,
+    prefilter: bool = True,
+    decoder: str = "auto",
+    timezone: str = DEFAULT_TIMEZONE,
+) -> tuple:
+    """
+    Parse the lines in [start, end) and keep reviews of known places.
+
+    With prefilter on, the gmap_id is pulled out of the raw line bytes and
+    only lines whose gmap_id is a known place are decoded. Lines where the regex
+    finds no plain gmap_id value fall back to a full decode. Lines are decoded
+    with the jsonl_decoder backend named by decoder, typed to the review schema.
+    Review dates of the chunk's rows are computed in one batch in timezone.
+
+    Returns:
+        (lines_read, reviews_seen, rows) where rows are output row tuples in
+        file order
+    """
+    heads = []
+    lines_read = 0
+    total_reviews = 0
+    place_keys = {gmap_id.encode("utf-8") for gmap_id in places}
+    decode = jsonl_decoder.make_decoder(decoder, typed=True)
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            lines_read += 1
 
-    with open(META_PATH, "r", encoding="utf-8") as f:
-        for line in f:
             if not line.strip():
                 continue
+
+            if prefilter:
+                match = GMAP_ID_PATTERN.search(line)
+                if match is not None and match.group(1) not in place_keys:
+                    # Skipped lines are counted without being decoded
+                    total_reviews += 1
+                    continue
+
             try:
-                place = json.loads(line)
-                total_places += 1
-
-                if is_brewpub(place.get("category", [])):
-                    gmap_id = place.get("gmap_id")
-                    if gmap_id:
-                        brewpubs[gmap_id] = {
-                            "name": place.get("name", ""),
-                            "address": place.get("address", ""),
-                            "gmap_id": gmap_id,
-                            "description": place.get("description", ""),
-                            "latitude": place.get("latitude"),
-                            "longitude": place.get("longitude"),
-                            "category": place.get("category", []),
-                            "avg_rating": place.get("avg_rating"),
-                            "num_of_reviews": place.get("num_of_reviews"),
-                            "misc": place.get("MISC", {}),
-                            "municipality": extract_municipality(
-                                place.get("address", "")
-                            ),
-                        }
+                review = decode(line)
             except json.JSONDecodeError:
                 continue
+            total_reviews += 1
 
-    print(f"  Total places: {total_places:,}")
-    print(f"  Brewpubs found: {len(brewpubs):,}")
-    return brewpubs
-
-
-def process_reviews(brewpubs: dict):
-    """Stream through reviews and match with brewpub metadata."""
-    print(f"\nProcessing reviews from: {REVIEW_PATH}")
-    print("  (This may take a few minutes for the 6.7GB file...)")
-
-    output_path = OUTPUT_DIR / "brewpub_reviews_with_meta.csv"
-
-    fieldnames = [
-        "review_user_id",
-        "review_user_name",
-        "review_time",
-        "review_date",
-        "rating",
-        "review_text",
-        "has_pics",
-        "has_response",
-        "gmap_id",
-        "business_name",
-        "address",
-        "municipality",
-        "latitude",
-        "longitude",
-        "category",
-        "description",
-        "avg_rating",
-        "num_of_reviews",
-    ]
+            gmap_id = review.get("gmap_id")
+            if gmap_id and gmap_id in places:
+                heads.append(review_head(review))
 
-    matched_reviews = 0
-    total_reviews = 0
+    return lines_read, total_reviews, build_rows(heads, places, timezone)
 
-    with open(output_path, "w", newline="", encoding="utf-8") as outfile:
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-        writer.writeheader()
 
-        with open(REVIEW_PATH, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                if not line.strip():
-                    continue
+def scan_cache(places: dict, timezone: str = DEFAULT_TIMEZONE):
+    """
+    Yield (rows_in_part, rows_in_part, rows) for each part of the review cache.
 
-                try:
-                    review = json.loads(line)
-                    total_reviews += 1
+    Only matched places' reviews are read, via a gmap_id filter pushed into
+    Parquet.
+    """
+    filters = [("gmap_id", "in", list(places))]
+    for rows_in_part, table in columnar_cache.iter_review_parts(filters=filters):
+        heads = []
+        for review in table.to_pylist():
+            review["pics"] = review.pop("has_pics")
+            review["resp"] = review.pop("has_response")
+            heads.append(review_head(review))
+        yield rows_in_part, rows_in_part, build_rows(heads, places, timezone)
+
+
+def places_fingerprint(places: dict) -> str:
+    """Hash of the matched gmap_ids and their outputs, to tie a checkpoint to them."""
+    digest = hashlib.sha256()
+    for gmap_id in sorted(places):
+        outputs = ",".join(str(name) for name in places[gmap_id]["outputs"])
+        digest.update(f"{gmap_id}\t{outputs}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def offset_sha256(path: Path, offset: int) -> str:
+    """SHA-256 of the OFFSET_HASH_BYTES of path ending at offset."""
+    start = max(0, offset - OFFSET_HASH_BYTES)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def save_checkpoint(checkpoint_path: Path, state: dict):
+    """Write the checkpoint atomically (temp file + rename)."""
+    tmp_path = Path(str(checkpoint_path) + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    tmp_path.replace(checkpoint_path)
+
+
+def load_checkpoint(
+    checkpoint_path: Path,
+    review_path: Path,
+    places: dict,
+    output_paths: dict,
+    incremental: bool = False,
+    timezone: str = DEFAULT_TIMEZONE,
+) -> dict:
+    """
+    Read a checkpoint and check it belongs to this run.
 
-                    gmap_id = review.get("gmap_id")
-                    if gmap_id and gmap_id in brewpubs:
-                        meta = brewpubs[gmap_id]
-
-                        # Convert timestamp to readable date
-                        timestamp_ms = review.get("time", 0)
-                        review_date = (
-                            datetime.fromtimestamp(timestamp_ms / 1000).strftime(
-                                "%Y-%m-%d"
-                            )
-                            if timestamp_ms
-                            else ""
-                        )
-
-                        row = {
-                            "review_user_id": review.get("user_id", ""),
-                            "review_user_name": review.get("name", ""),
-                            "review_time": timestamp_ms,
-                            "review_date": review_date,
-                            "rating": review.get("rating", ""),
-                            "review_text": review.get("text", ""),
-                            "has_pics": bool(review.get("pics")),
-                            "has_response": bool(review.get("resp")),
-                            "gmap_id": gmap_id,
-                            "business_name": meta["name"],
-                            "address": meta["address"],
-                            "municipality": meta["municipality"],
-                            "latitude": meta["latitude"],
-                            "longitude": meta["longitude"],
-                            "category": (
-                                "|".join(meta["category"]) if meta["category"] else ""
-                            ),
-                            "description": meta["description"] or "",
-                            "avg_rating": meta["avg_rating"],
-                            "num_of_reviews": meta["num_of_reviews"],
-                        }
-                        writer.writerow(row)
-                        matched_reviews += 1
-
-                except json.JSONDecodeError:
-                    continue
+    For a resume the review file must be unchanged. For an incremental run the
+    checkpoint must be of a finished merge and the review file may only have
+    grown: the bytes before the checkpointed offset must hash the same.
 
-                # Progress update
-                if line_num % 1_000_000 == 0:
-                    print(
-                        f"  Processed {line_num:,} reviews, matched {matched_reviews:,}..."
-                    )
+    Returns the checkpoint state, or None (with the reason printed) when there
+    is none or it was written for a different review file, set of places or
+    outputs.
+    """
+    if not Path(checkpoint_path).exists():
+        print(f"  No checkpoint at {checkpoint_path} - starting from the beginning")
+        return None
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+
+    stat = Path(review_path).stat()
+    problems = []
+    if state["review_path"] != str(review_path):
+        problems.append("review file differs")
+    elif incremental:
+        if not state["complete"]:
+            problems.append("previous merge did not finish (use --resume)")
+        elif stat.st_size < state["offset"] or offset_sha256(
+            review_path, state["offset"]
+        ) != state.get("offset_sha256"):
+            problems.append("review file was rewritten, not appended to")
+    elif (state["size"], state["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+        problems.append("review file changed")
+    if state["places"] != places_fingerprint(places):
+        problems.append("matched places differ")
+    if state.get("timezone") != timezone:
+        problems.append(f"review dates were written in {state.get('timezone')}")
+    outputs = [[name, str(path)] for name, path in output_paths.items()]
+    if [[o["name"], o["path"]] for o in state["outputs"]] != outputs:
+        problems.append("output files differ")
+    for output in state["outputs"]:
+        if not Path(output["path"]).exists():
+            problems.append(f"{output['path']} is missing")
+        elif Path(output["path"]).stat().st_size < output["position"]:
+            problems.append(f"{output['path']} is shorter than checkpointed")
+
+    if problems:
+        print(f"  Checkpoint not usable ({'; '.join(problems)}) - starting over")
+        return None
+    return state
+
+
+def _init_worker(places: dict):
+    global _worker_places
+    _worker_places = places
+
+
+def _scan_chunk_worker(args: tuple) -> tuple:
+    path, start, end, prefilter, decoder, timezone = args
+    return scan_chunk(path, start, end, _worker_places, prefilter, decoder, timezone)
+
+
+def process_reviews(
+    places: dict,
+    review_path: Path = REVIEW_PATH,
+    output_path: Path = OUTPUT_DIR / "brewpub_reviews_with_meta.csv",
+    workers: int = 1,
+    prefilter: bool = True,
+    from_cache: bool = False,
+    output_paths: dict = None,
+    checkpoint_path: Path = None,
+    resume: bool = False,
+    incremental: bool = False,
+    decoder: str = "auto",
+    timezone: str = DEFAULT_TIMEZONE,
+    tally_output: str = None,
+):
+    """
+    Stream through reviews and match with place metadata.
+
+    All matched reviews go to output_path, unless output_paths maps filter
+    names to files: then each review is routed to the outputs listed in its
+    place's metadata["outputs"], so many categories share one scan. Rows are
+    written a chunk at a time by review_writer.ReviewWriter, compressed when
+    an output path ends in .gz or .zst.
+
+    With workers > 1 the file is split into newline-aligned byte ranges that
+    are scanned in a process pool. Chunk results are written in file order,
+    so the output is identical to a single-process run. With from_cache the
+    Parquet review cache is read instead of the JSONL file. decoder names the
+    jsonl_decoder backend ("auto" picks the fastest installed). review_date is
+    the day of each review in timezone, independent of the host.
+
+    With checkpoint_path set, the byte offset, counters and output file
+    positions are saved after every chunk. resume continues from that
+    checkpoint: outputs are cut back to their checkpointed size (dropping rows
+    of an unfinished chunk) and appended to.
+
+    incremental continues from the checkpoint of a finished merge after new
+    reviews were appended to the review file: only the lines past the
+    checkpointed offset are scanned and their matches are appended. The
+    checkpoint also keeps the highest review time merged so far.
+
+    tally_output names an output whose reviewers are tallied while it is
+    written (reviewer_tally.StreamingTally), saving reviewer_tally.csv.
+    """
+    if from_cache:
+        print(f"\nProcessing reviews from: {columnar_cache.CACHE_DIR / 'reviews'}")
+        workers = 1
+        checkpoint_path = None
+    else:
+        print(f"\nProcessing reviews from: {review_path}")
+        print("  (This may take a few minutes for the 6.7GB file...)")
+
+    if output_paths is None:
+        output_paths = {None: output_path}
+
+    state = None
+    if (resume or incremental) and checkpoint_path is not None:
+        state = load_checkpoint(
+            checkpoint_path, review_path, places, output_paths, incremental, timezone
+        )
+        if state is not None and state["complete"]:
+            if not incremental:
+                print(f"  Checkpoint says the merge already finished - nothing to do")
+                return state["matched_reviews"]
+            if state["offset"] == review_path.stat().st_size:
+                print(f"  No new reviews since the last merge - nothing to do")
+                return state["matched_reviews"]
+
+    if state is not None:
+        start = state["offset"]
+        matched_reviews = state["matched_reviews"]
+        total_reviews = state["total_reviews"]
+        lines_read = state["lines_read"]
+        max_time = state["max_time"]
+        routed = {name: o["rows"] for name, o in zip(output_paths, state["outputs"])}
+        if state["complete"]:
+            print(f"  Merging reviews appended after byte {start:,}")
+        else:
+            print(f"  Resuming at byte {start:,} ({lines_read:,} lines already read)")
+    else:
+        start = 0
+        matched_reviews = 0
+        total_reviews = 0
+        lines_read = 0
+        max_time = 0
+        routed = {name: 0 for name in output_paths}
+    previous = (matched_reviews, max_time)
+    late_reviews = 0
+
+    workers = max(1, workers)
+    num_chunks = workers * CHUNKS_PER_WORKER if workers > 1 else 1
+    if checkpoint_path is not None:
+        remaining = review_path.stat().st_size - start
+        num_chunks = max(num_chunks, -(-remaining // CHECKPOINT_BYTES))
+    chunks = (
+        []
+        if from_cache
+        else [
+            (review_path, s, e, prefilter, decoder, timezone)
+            for s, e in chunk_boundaries(review_path, num_chunks, start)
+        ]
+    )
+    if workers > 1:
+        print(f"  Scanning {len(chunks)} chunks with {workers} workers")
+
+    next_progress = (lines_read // 1_000_000 + 1) * 1_000_000
+
+    with contextlib.ExitStack() as stack:
+        writers = {}
+        for i, (name, path) in enumerate(output_paths.items()):
+            # On resume, anything written after the checkpoint is dropped
+            append_at = state["outputs"][i]["position"] if state is not None else None
+            writers[name] = stack.enter_context(
+                review_writer.ReviewWriter(path, FIELDNAMES, append_at)
+            )
+
+        tally = None
+        if tally_output is not None:
+            # The tally reads back whatever its saved state does not cover yet
+            writers[tally_output].sync()
+            tally = reviewer_tally.StreamingTally(
+                output_paths[tally_output], FIELDNAMES
+            )
+
+        def checkpoint(offset: int, complete: bool = False):
+            outputs = []
+            for name, path in output_paths.items():
+                writers[name].sync()
+                outputs.append(
+                    {
+                        "name": name,
+                        "path": str(path),
+                        "position": writers[name].tell(),
+                        "rows": routed[name],
+                    }
+                )
+            stat = review_path.stat()
+            save_checkpoint(
+                checkpoint_path,
+                {
+                    "review_path": str(review_path),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "places": places_fingerprint(places),
+                    "timezone": timezone,
+                    "offset": offset,
+                    "offset_sha256": offset_sha256(review_path, offset),
+                    "max_time": max_time,
+                    "lines_read": lines_read,
+                    "total_reviews": total_reviews,
+                    "matched_reviews": matched_reviews,
+                    "outputs": outputs,
+                    "complete": complete,
+                },
+            )
+
+        if from_cache:
+            pool = None
+            results = scan_cache(places, timezone)
+        elif workers > 1:
+            pool = multiprocessing.Pool(
+                workers, initializer=_init_worker, initargs=(places,)
+            )
+            stack.callback(pool.join)
+            stack.callback(pool.close)
+            results = pool.imap(_scan_chunk_worker, chunks)
+        else:
+            results = (
+                scan_chunk(p, s, e, places, f, d, tz) for p, s, e, f, d, tz in chunks
+            )
+
+        # imap yields in submission order, which keeps rows in file order
+        for i, (chunk_lines, chunk_reviews, rows) in enumerate(results):
+            if len(writers) == 1:
+                # Every matched row belongs to the only output
+                name, writer = next(iter(writers.items()))
+                writer.writerows(rows)
+                routed[name] += len(rows)
+                if tally is not None:
+                    tally.add_rows(rows)
+            else:
+                batches = {name: [] for name in writers}
+                for row in rows:
+                    for name in places[row[ROW_GMAP_ID]]["outputs"]:
+                        batches[name].append(row)
+                for name, batch in batches.items():
+                    writers[name].writerows(batch)
+                    routed[name] += len(batch)
+                if tally is not None:
+                    tally.add_rows(batches[tally_output])
+            lines_read += chunk_lines
+            total_reviews += chunk_reviews
+            matched_reviews += len(rows)
+            if rows:
+                times = [row[ROW_TIME] or 0 for row in rows]
+                late_reviews += sum(t <= previous[1] for t in times)
+                max_time = max(max_time, max(times))
+
+            if checkpoint_path is not None:
+                chunk_end = chunks[i][2]
+                checkpoint(chunk_end, complete=chunk_end >= chunks[-1][2])
+
+            # Progress update
+            if lines_read >= next_progress:
+                print(
+                    f"  Processed {lines_read:,} reviews, matched {matched_reviews:,}..."
+                )
+                next_progress = (lines_read // 1_000_000 + 1) * 1_000_000
 
     print(f"\n✓ Done!")
     print(f"  Total reviews processed: {total_reviews:,}")
-    print(f"  Brewpub reviews matched: {matched_reviews:,}")
-    print(f"  Output saved to: {output_path}")
+    print(f"  Reviews matched: {matched_reviews:,}")
+    if incremental and state is not None:
+        print(f"  New reviews matched: {matched_reviews - previous[0]:,}")
+        if late_reviews:
+            print(
+                f"  ⚠ {late_reviews:,} new reviews are not newer than the previous "
+                f"latest review time ({previous[1]})"
+            )
+    for name, path in output_paths.items():
+        label = f"{name} output" if name is not None else "Output"
+        print(f"  {label} saved to: {path} ({routed[name]:,} reviews)")
+    if tally is not None:
+        reviewers = tally.finish()
+        print(
+            f"  Reviewer tally saved to: {reviewer_tally.OUTPUT_PATH} "
+            f"({len(reviewers):,} reviewers)"
+        )
 
     return matched_reviews
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=f"Processes for the review scan (this machine has {os.cpu_count()} cores)",
+    )
+    parser.add_argument(
+        "--no-prefilter",
+        action="store_true",
+        help="Decode every review line instead of pre-filtering on raw gmap_id",
+    )
+    parser.add_argument(
+        "--from-cache",
+        action="store_true",
+        help="Read the Parquet cache built by columnar_cache.py instead of the JSONL files",
+    )
+    parser.add_argument(
+        "--meta-index",
+        action="store_true",
+        help="Look up place metadata in the SQLite index (meta_index.py)",
+    )
+    parser.add_argument(
+        "--filters",
+        type=Path,
+        default=None,
+        help="JSON file of named category filters (default: brewpub only). "
+        "Each filter is written to outputs/<name>_reviews_with_meta.csv",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Continue an interrupted merge from its last checkpoint ({CHECKPOINT_PATH.name})",
+    )
+    parser.add_argument(
+        "--decoder",
+        choices=("auto",) + jsonl_decoder.BACKENDS,
+        default="auto",
+        help="JSON decoder backend (default: fastest installed)",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=list(review_writer.COMPRESSIONS),
+        default="none",
+        help="Write outputs as .csv.gz or .csv.zst (readers pick them up)",
+    )
+    parser.add_argument(
+        "--timezone",
+        default=DEFAULT_TIMEZONE,
+        help=f"Timezone of review_date (default: {DEFAULT_TIMEZONE})",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only merge reviews appended to the review file since the last "
+        "finished merge, appending them to the outputs",
+    )
+    parser.add_argument(
+        "--tally",
+        action="store_true",
+        help="Also write reviewer_tally.csv for the brewpub output while merging "
+        "(same result as running reviewer_tally.py afterwards)",
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not save progress checkpoints during the review scan",
+    )
+    args = parser.parse_args()
+    try:
+        pd.Timestamp(0, tz=args.timezone)
+    except Exception:
+        parser.error(f"unknown timezone: {args.timezone}")
+    return args
+
+
 def main():
+    args = parse_args()
+
     print("=" * 60)
     print("Merge Brewpub Reviews with Metadata")
     print("=" * 60)
 
-    # Step 1: Load brewpub metadata
-    brewpubs = load_brewpub_metadata()
+    if args.from_cache and not (
+        columnar_cache.is_fresh(columnar_cache.CACHE_DIR / "meta", META_PATH)
+        and columnar_cache.is_fresh(columnar_cache.CACHE_DIR / "reviews", REVIEW_PATH)
+    ):
+        print("\n⚠ Columnar cache missing or stale - run columnar_cache.py first")
+        return
 
-    if not brewpubs:
-        print("\n⚠ No brewpubs found!")
+    router = category_filters.CategoryRouter(
+        category_filters.load_filters(args.filters)
+    )
+    print(f"Category filters: {', '.join(router.names)}")
+    if args.tally and TALLY_OUTPUT not in router.names:
+        print(f"\n⚠ --tally needs the '{TALLY_OUTPUT}' filter")
+        return
+    output_paths = {
+        name: review_writer.compressed_path(
+            OUTPUT_DIR / f"{name}_reviews_with_meta.csv", args.compress
+        )
+        for name in router.names
+    }
+
+    # Step 1: Load metadata of places matching the filters
+    places = load_place_metadata(
+        router,
+        from_cache=args.from_cache,
+        use_index=args.meta_index,
+        decoder=args.decoder,
+    )
+
+    if not places:
+        print("\n⚠ No matching places found!")
         return
 
-    # Show sample categories found (all categories that brewpubs have)
+    # Show sample categories found (all categories that matched places have)
     all_categories = set()
-    for b in brewpubs.values():
+    for b in places.values():
         all_categories.update(b["category"])
-    print(f"\nCategories associated with brewpubs:")
+    print(f"\nCategories associated with matched places:")
     for cat in sorted(all_categories)[:20]:
         print(f"  - {cat}")
     if len(all_categories) > 20:
         print(f"  ... and {len(all_categories) - 20} more")
 
     # Step 2: Process reviews
-    matched = process_reviews(brewpubs)
+    matched = process_reviews(
+        places,
+        workers=args.workers,
+        prefilter=not args.no_prefilter,
+        from_cache=args.from_cache,
+        output_paths=output_paths,
+        checkpoint_path=None if args.no_checkpoint else CHECKPOINT_PATH,
+        resume=args.resume,
+        incremental=args.incremental,
+        decoder=args.decoder,
+        timezone=args.timezone,
+        tally_output=TALLY_OUTPUT if args.tally else None,
+    )
 
     # Step 3: Summary
     if matched > 0:
         print("\n" + "=" * 60)
-        print("Sample municipalities with brewpub reviews:")
+        print("Sample municipalities with matched reviews:")
         municipalities = set(
-            b["municipality"] for b in brewpubs.values() if b["municipality"]
+            b["municipality"] for b in places.values() if b["municipality"]
         )
         for m in sorted(municipalities)[:15]:
             print(f"  - {m}")
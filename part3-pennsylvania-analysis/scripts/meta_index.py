@@ -0,0 +1,320 @@
+"""
+Persistent gmap_id -> place metadata index for meta-Pennsylvania.json.
+
+Parses the meta JSONL once into a SQLite database so later runs can look up
+places by gmap_id or category without re-reading the full meta file:
+
+    places            one row per place (JSON fields, category/MISC as JSON)
+    place_categories  (gmap_id, category) pairs, lowercased, indexed
+
+The index stores the size, mtime and SHA-256 of the meta file it was built
+from. Opening checks size and mtime first (no read of the meta file); if
+only the mtime changed the hash decides, and a changed file triggers a
+rebuild, as does an index written with an older SCHEMA_VERSION.
+
+Usage:
+    python meta_index.py                 # build / refresh the index
+    python meta_index.py Brewpub Winery  # count places per category
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+import jsonl_decoder
+
+# Paths
+DATA_DIR = Path(__file__).parent.parent.parent / "data" / "part 3"
+META_PATH = DATA_DIR / "meta-Pennsylvania.json" / "meta-Pennsylvania.json"
+INDEX_PATH = DATA_DIR / "meta-Pennsylvania.sqlite"
+
+# Bumped when the index layout or contents change, so older indexes are rebuilt
+SCHEMA_VERSION = "2"
+
+SCHEMA = """
+CREATE TABLE places (
+    gmap_id TEXT PRIMARY KEY,
+    name TEXT,
+    address TEXT,
+    description TEXT,
+    latitude REAL,
+    longitude REAL,
+    category TEXT,
+    avg_rating REAL,
+    num_of_reviews INTEGER,
+    misc TEXT
+);
+CREATE TABLE place_categories (
+    gmap_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY (gmap_id, category)
+) WITHOUT ROWID;
+CREATE TABLE source (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+PLACE_COLUMNS = [
+    "gmap_id",
+    "name",
+    "address",
+    "description",
+    "latitude",
+    "longitude",
+    "category",
+    "avg_rating",
+    "num_of_reviews",
+    "misc",
+]
+
+
+def index_path_for(meta_path: Path) -> Path:
+    """
+    Index location for a meta file: meta-<State>.sqlite in the data folder,
+    i.e. next to a plain meta-<State>.json dump, or next to the
+    meta-<State>.json/ folder it was unpacked into.
+    """
+    meta_path = Path(meta_path)
+    data_dir = meta_path.parent
+    if data_dir.name.startswith("meta-") and data_dir.suffix == ".json":
+        data_dir = data_dir.parent
+    return data_dir / f"{meta_path.stem}.sqlite"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _place_row(place: dict) -> tuple:
+    # Same .get() defaults as load_brewpub_metadata() so lookups match it
+    return (
+        place.get("gmap_id"),
+        place.get("name", ""),
+        place.get("address", ""),
+        place.get("description", ""),
+        place.get("latitude"),
+        place.get("longitude"),
+        json.dumps(place.get("category", [])),
+        place.get("avg_rating"),
+        place.get("num_of_reviews"),
+        json.dumps(place.get("MISC", {})),
+    )
+
+
+def _insert_places(conn: sqlite3.Connection, places: list, categories: dict):
+    """
+    Insert a batch of places. Like load_brewpub_metadata(), the last record
+    of a duplicated gmap_id wins, for its categories as well as its fields.
+    """
+    conn.executemany(
+        "INSERT OR REPLACE INTO places VALUES (?,?,?,?,?,?,?,?,?,?)", places
+    )
+    conn.executemany(
+        "DELETE FROM place_categories WHERE gmap_id = ?",
+        ((gmap_id,) for gmap_id in categories),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO place_categories VALUES (?,?)",
+        (
+            (gmap_id, cat.lower())
+            for gmap_id, cats in categories.items()
+            for cat in cats
+        ),
+    )
+
+
+def build_index(meta_path: Path = META_PATH, index_path: Path = INDEX_PATH) -> int:
+    """
+    (Re)build the SQLite index from the meta JSONL file.
+
+    Written to a temporary file and renamed into place, so an interrupted
+    build never leaves a half-filled index behind. Returns places indexed.
+    """
+    print(f"Building metadata index from: {meta_path}")
+    tmp_path = Path(str(index_path) + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    conn.executescript(SCHEMA)
+
+    decode = jsonl_decoder.make_decoder()
+    total_places = 0
+    digest = hashlib.sha256()
+    places = []
+    # gmap_id -> categories of its last record in this batch
+    categories = {}
+
+    with open(meta_path, "rb") as f:
+        for line in f:
+            digest.update(line)
+            if not line.strip():
+                continue
+            try:
+                place = decode(line)
+            except json.JSONDecodeError:
+                continue
+
+            total_places += 1
+            gmap_id = place.get("gmap_id")
+            if not gmap_id:
+                continue
+            places.append(_place_row(place))
+            categories[gmap_id] = place.get("category") or []
+
+            if len(places) >= 50_000:
+                _insert_places(conn, places, categories)
+                places, categories = [], {}
+
+    _insert_places(conn, places, categories)
+    conn.execute("CREATE INDEX idx_place_categories ON place_categories (category)")
+
+    stat = Path(meta_path).stat()
+    conn.executemany(
+        "INSERT INTO source VALUES (?, ?)",
+        [
+            ("size", str(stat.st_size)),
+            ("mtime_ns", str(stat.st_mtime_ns)),
+            ("sha256", digest.hexdigest()),
+            ("total_places", str(total_places)),
+            ("schema_version", SCHEMA_VERSION),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    tmp_path.replace(index_path)
+    print(f"  ✓ Indexed {total_places:,} places -> {index_path}")
+    return total_places
+
+
+def _source_info(conn: sqlite3.Connection) -> dict:
+    return dict(conn.execute("SELECT key, value FROM source"))
+
+
+def is_current(conn: sqlite3.Connection, meta_path: Path = META_PATH) -> bool:
+    """
+    True if the index was built from meta_path as it is now.
+
+    Size and mtime are checked first; the content hash is only computed when
+    the mtime changed but the size did not (e.g. the file was copied).
+    """
+    info = _source_info(conn)
+    if info.get("schema_version") != SCHEMA_VERSION:
+        return False
+    stat = Path(meta_path).stat()
+    if int(info["size"]) != stat.st_size:
+        return False
+    if int(info["mtime_ns"]) == stat.st_mtime_ns:
+        return True
+    if file_sha256(meta_path) != info["sha256"]:
+        return False
+
+    # Same content - remember the new mtime so the next open is fast again
+    conn.execute(
+        "UPDATE source SET value = ? WHERE key = 'mtime_ns'", (str(stat.st_mtime_ns),)
+    )
+    conn.commit()
+    return True
+
+
+def open_index(
+    meta_path: Path = META_PATH, index_path: Path = INDEX_PATH
+) -> sqlite3.Connection:
+    """Open the index, building or rebuilding it if it is missing or stale."""
+    if Path(index_path).exists():
+        conn = sqlite3.connect(index_path)
+        try:
+            if is_current(conn, meta_path):
+                return conn
+        except (sqlite3.DatabaseError, KeyError):
+            pass
+        conn.close()
+        print("  Metadata index is stale - rebuilding")
+
+    build_index(meta_path, index_path)
+    return sqlite3.connect(index_path)
+
+
+def total_places(conn: sqlite3.Connection) -> int:
+    return int(_source_info(conn)["total_places"])
+
+
+def _place_dict(row: tuple) -> dict:
+    place = dict(zip(PLACE_COLUMNS, row))
+    place["category"] = json.loads(place["category"])
+    place["misc"] = json.loads(place["misc"])
+    return place
+
+
+def lookup(conn: sqlite3.Connection, gmap_id: str) -> dict:
+    """Metadata for one place, or None if the gmap_id is not indexed."""
+    row = conn.execute(
+        f"SELECT {', '.join(PLACE_COLUMNS)} FROM places WHERE gmap_id = ?",
+        (gmap_id,),
+    ).fetchone()
+    return _place_dict(row) if row else None
+
+
+def places_in_categories(
+    conn: sqlite3.Connection, categories: list, prefixes: list = ()
+) -> dict:
+    """
+    All places having any of the given categories (case-insensitive).
+
+    prefixes additionally match categories starting with each prefix; both
+    lookups use the place_categories index.
+
+    Returns:
+        dict of gmap_id -> place metadata, in meta file order
+    """
+    conditions = []
+    params = []
+    if categories:
+        conditions.append(f"category IN ({', '.join('?' for _ in categories)})")
+        params.extend(cat.lower() for cat in categories)
+    for prefix in prefixes:
+        # Range scan instead of LIKE, so '%' and '_' need no escaping
+        conditions.append("(category >= ? AND category < ?)")
+        params.extend([prefix.lower(), prefix.lower() + "\uffff"])
+    if not conditions:
+        return {}
+
+    rows = conn.execute(
+        f"""
+        SELECT {', '.join(PLACE_COLUMNS)} FROM places
+        WHERE gmap_id IN (
+            SELECT gmap_id FROM place_categories WHERE {' OR '.join(conditions)}
+        )
+        ORDER BY rowid
+        """,
+        params,
+    )
+    return {row[0]: _place_dict(row) for row in rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("categories", nargs="*", help="Categories to count")
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        build_index()
+    conn = open_index()
+    print(f"Places indexed: {total_places(conn):,}")
+
+    for category in args.categories:
+        print(f"  {category}: {len(places_in_categories(conn, [category])):,} places")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
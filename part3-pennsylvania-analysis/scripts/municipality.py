@@ -0,0 +1,142 @@
+"""
+Municipality (city) extraction from Google Local addresses.
+
+Addresses look like "Business Name, Street, City, PA 19107": the municipality
+is the comma-separated part just before the first part with "PA <ZIP>".
+
+Two paths give identical results:
+- extract_municipality(): one address at a time. A single precompiled regex
+  search finds the PA ZIP part, and the split of the address suffix from the
+  city onwards ("City, PA 19107") is LRU-cached, since many places share it.
+- municipality_column(): a whole pandas column. Distinct addresses are
+  factorized and parsed with one .str.extract, with the scalar path only for
+  the rare rows it cannot decide.
+
+Usage:
+    python municipality.py [CSV]   # re-derive and check a CSV's municipality column
+"""
+
+import argparse
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+import review_writer
+
+# Paths
+OUTPUT_DIR = Path(__file__).parent.parent / "outputs"
+MERGED_CSV_PATH = OUTPUT_DIR / "brewpub_reviews_with_meta.csv"
+
+PA_ZIP_PATTERN = re.compile(r"\bPA\s+\d{5}")
+CITY_PA_ZIP_PATTERN = re.compile(r"^(.+?)\s+PA\s+\d{5}")
+
+# Part before the first part containing "PA <ZIP>". The leftmost match starts
+# at the earliest such part, as in the part-by-part loop.
+CITY_BEFORE_PA_ZIP = r"(?:^|,)([^,]*),[^,]*?\bPA\s+\d{5}"
+# Rows whose first part already holds "PA <ZIP>" take the scalar path
+PA_ZIP_IN_FIRST_PART = r"^[^,]*\bPA\s+\d{5}"
+
+
+def _municipality_from_parts(address: str) -> str:
+    """Part-by-part extraction (the reference algorithm)."""
+    # Split by comma and try to find city
+    parts = [p.strip() for p in address.split(",")]
+
+    # Typical format: Name, Street, City, State ZIP
+    # We want the second-to-last part before "PA XXXXX"
+    for i, part in enumerate(parts):
+        if PA_ZIP_PATTERN.search(part):
+            # This part contains state and ZIP, city is the previous part
+            if i > 0:
+                return parts[i - 1]
+            # If state/zip is in same part as city (rare), try to extract
+            match = CITY_PA_ZIP_PATTERN.match(part)
+            if match:
+                return match.group(1).strip()
+
+    # Fallback: if no PA ZIP found, try last meaningful part
+    if len(parts) >= 3:
+        return parts[-2]  # Second to last
+
+    return ""
+
+
+@lru_cache(maxsize=65_536)
+def _municipality_from_suffix(suffix: str) -> str:
+    return _municipality_from_parts(suffix)
+
+
+def extract_municipality(address: str) -> str:
+    """
+    Extract municipality (city) from address string.
+    Format: "Business Name, Street, City, State ZIP"
+    """
+    if not address:
+        return ""
+
+    match = PA_ZIP_PATTERN.search(address)
+    if match is not None:
+        zip_part_start = address.rfind(",", 0, match.start())
+        if zip_part_start != -1:
+            # Suffix from the city part on; its first PA ZIP part is the same
+            # one, so the reference algorithm gives the same city for it
+            city_start = address.rfind(",", 0, zip_part_start) + 1
+            return _municipality_from_suffix(address[city_start:])
+
+    return _municipality_from_parts(address)
+
+
+def municipality_column(addresses: pd.Series) -> pd.Series:
+    """
+    Vectorized extract_municipality() over a column of addresses.
+
+    Each distinct address is parsed once (the merged CSV repeats a brewpub's
+    address on every review), then results are broadcast back by code.
+    Missing addresses give "", like the scalar function.
+    """
+    codes, uniques = pd.factorize(addresses.fillna("").astype(str))
+    uniques = pd.Series(uniques, dtype=object)
+    cities = uniques.str.extract(CITY_BEFORE_PA_ZIP, expand=False).str.strip()
+
+    # No PA ZIP after a comma, or one already in the first part: scalar path
+    undecided = cities.isna() | uniques.str.contains(PA_ZIP_IN_FIRST_PART)
+    if undecided.any():
+        cities[undecided] = uniques[undecided].map(extract_municipality)
+
+    return pd.Series(
+        cities.to_numpy(dtype=object)[codes], index=addresses.index, dtype=object
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "csv", nargs="?", type=Path, default=review_writer.find_output(MERGED_CSV_PATH)
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Municipality Extraction Check")
+    print("=" * 60)
+
+    df = pd.read_csv(args.csv, usecols=["address", "municipality"])
+    print(f"\nLoaded {len(df):,} rows from {args.csv}")
+
+    began = time.perf_counter()
+    vectorized = municipality_column(df["address"])
+    print(f"  Vectorized:  {time.perf_counter() - began:.3f}s")
+
+    began = time.perf_counter()
+    scalar = df["address"].map(lambda a: extract_municipality(a if pd.notna(a) else ""))
+    print(f"  Memoized:    {time.perf_counter() - began:.3f}s")
+
+    stored = df["municipality"].fillna("")
+    print(f"\nVectorized == memoized: {(vectorized == scalar).all()}")
+    print(f"Rows differing from the CSV: {(vectorized != stored).sum():,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Buffered writer for the merged review CSVs, plain or compressed.
+
+Rows are tuples in the output column order and are written a batch at a time:
+each batch is formatted into memory with one csv.writer.writerows() call and
+written as one block of bytes. Compression is picked from the file suffix:
+
+    brewpub_reviews_with_meta.csv        plain
+    brewpub_reviews_with_meta.csv.gz     gzip
+    brewpub_reviews_with_meta.csv.zst    zstd (needs: pip install zstandard)
+
+A compressed batch is written as its own gzip member / zstd frame. Readers
+(pandas, gzip, zstandard) decode the concatenation as one file, and the file
+can be cut back to any batch boundary and appended to, which the merge needs
+for --resume and --incremental.
+
+find_output() lets readers find whichever variant the last merge wrote.
+"""
+
+import csv
+import gzip
+import io
+import os
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, only needed for .zst output
+    zstandard = None
+
+# Compression name -> file suffix
+COMPRESSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise ImportError(
+            "zstd output needs zstandard. Install it with: pip install zstandard"
+        )
+
+
+def compression_of(path: Path) -> str:
+    """Compression name implied by the file suffix."""
+    for name, suffix in COMPRESSIONS.items():
+        if suffix and str(path).endswith(suffix):
+            return name
+    return "none"
+
+
+def strip_compression(path: Path) -> Path:
+    """path without its compression suffix (x.csv.gz -> x.csv)."""
+    suffix = COMPRESSIONS[compression_of(path)]
+    return Path(str(path)[: -len(suffix)]) if suffix else Path(path)
+
+
+def compressed_path(path: Path, compression: str) -> Path:
+    """The path of a plain CSV path's variant for compression."""
+    return Path(str(strip_compression(path)) + COMPRESSIONS[compression])
+
+
+def find_output(path: Path) -> Path:
+    """
+    The existing plain or compressed variant of a CSV path.
+
+    If several exist the most recently written wins; if none do, path itself.
+    """
+    candidates = [
+        compressed_path(path, compression)
+        for compression in COMPRESSIONS
+        if compressed_path(path, compression).exists()
+    ]
+    if not candidates:
+        return Path(path)
+    return max(candidates, key=lambda p: p.stat().st_mtime_ns)
+
+
+def open_text(path: Path):
+    """Open a plain or compressed CSV for reading as text."""
+    compression = compression_of(path)
+    if compression == "gzip":
+        return gzip.open(path, "rt", newline="", encoding="utf-8")
+    if compression == "zstd":
+        _require_zstandard()
+        return io.TextIOWrapper(
+            zstandard.ZstdDecompressor().stream_reader(
+                open(path, "rb"), read_across_frames=True, closefd=True
+            ),
+            newline="",
+            encoding="utf-8",
+        )
+    return open(path, "r", newline="", encoding="utf-8")
+
+
+class ReviewWriter:
+    """
+    Write header + tuple rows to a CSV, compressing each batch if asked.
+
+    With append_at, an existing file is cut back to that many bytes (a
+    position from tell() after an earlier batch) and appended to; no header
+    is written.
+    """
+
+    def __init__(self, path: Path, fieldnames: list, append_at: int = None):
+        self.path = Path(path)
+        self.compression = compression_of(path)
+        if self.compression == "zstd":
+            _require_zstandard()
+            self._zstd = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+
+        self._buffer = io.StringIO(newline="")
+        self._csv = csv.writer(self._buffer)
+
+        if append_at is None:
+            self._file = open(self.path, "wb")
+            self.writerows([fieldnames])
+        else:
+            self._file = open(self.path, "r+b")
+            self._file.truncate(append_at)
+            self._file.seek(append_at)
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == "gzip":
+            # mtime=0 keeps the output identical from run to run
+            return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        if self.compression == "zstd":
+            return self._zstd.compress(data)
+        return data
+
+    def writerows(self, rows: list):
+        """Format and write one batch of rows."""
+        if not rows:
+            return
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._csv.writerows(rows)
+        self._file.write(self._compress(self._buffer.getvalue().encode("utf-8")))
+
+    def tell(self) -> int:
+        """Bytes written so far (a valid append_at)."""
+        return self._file.tell()
+
+    def sync(self):
+        """Flush to disk, so tell() survives a crash."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
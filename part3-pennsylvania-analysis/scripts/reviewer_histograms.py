@@ -2,28 +2,120 @@
 Histograms of reviewer activity:
 1. Number of review locations (brewpubs) per reviewer
 2. Number of review municipalities per reviewer
+
+Both columns are binned once with np.bincount into reviewers per value, and
+every figure (combined, single, log scale) is drawn from those counts. The
+counts can come from reviewer_tally.csv or straight from the state a
+StreamingTally saves (--from-state), without building the tally table:
+
+    counts = reviewer_histograms.counts_from_state(tally.state)
+    reviewer_histograms.plot_histograms(counts)
 """
 
+import argparse
+import json
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+import reviewer_tally
+
 # Paths
 OUTPUT_DIR = Path(__file__).parent.parent / "outputs"
 FIGURES_DIR = OUTPUT_DIR / "figures"
 FIGURES_DIR.mkdir(exist_ok=True)
 INPUT_PATH = OUTPUT_DIR / "reviewer_tally.csv"
 
+# Values at or above these are grouped into one "N+" bar
+REVIEW_CAP = 20
+MUNICIPALITY_CAP = 15
 
-def main():
-    print("=" * 60)
-    print("Generating Reviewer Activity Histograms")
-    print("=" * 60)
+COLUMNS = ["num_reviews", "unique_municipalities"]
+
+
+def counts_from_tally(df: pd.DataFrame) -> dict:
+    """Reviewers per value (array index) of each column of a tally table."""
+    return {
+        column: np.bincount(df[column].to_numpy(dtype=np.int64), minlength=1)
+        for column in COLUMNS
+    }
+
+
+def counts_from_state(state: dict) -> dict:
+    """The same counts from a reviewer_tally state, one pass over reviewers."""
+    entries = state["reviewers"].values()
+    num_reviews = np.fromiter(
+        (entry[1] for entry in entries), dtype=np.int64, count=len(entries)
+    )
+    unique_municipalities = np.fromiter(
+        (len(entry[3]) for entry in entries), dtype=np.int64, count=len(entries)
+    )
+    return {
+        "num_reviews": np.bincount(num_reviews, minlength=1),
+        "unique_municipalities": np.bincount(unique_municipalities, minlength=1),
+    }
+
+
+def cap_counts(counts: np.ndarray, cap: int) -> np.ndarray:
+    """Counts for values 0..cap, with everything above cap added to cap."""
+    capped = np.zeros(cap + 1, dtype=np.int64)
+    capped[: min(len(counts), cap + 1)] = counts[: cap + 1]
+    capped[cap] = counts[cap:].sum()
+    return capped
+
+
+def summarize_counts(counts: np.ndarray) -> dict:
+    """Mean, median, max and sample std of the values behind the counts."""
+    values = np.arange(len(counts))
+    n = counts.sum()
+    mean = (values * counts).sum() / n
+    # Middle value(s) of the sorted values, averaged as Series.median() does
+    cumulative = np.cumsum(counts)
+    lower = np.searchsorted(cumulative, (n - 1) // 2, side="right")
+    upper = np.searchsorted(cumulative, n // 2, side="right")
+    return {
+        "mean": mean,
+        "median": (lower + upper) / 2,
+        "max": int(np.flatnonzero(counts)[-1]),
+        "std": np.sqrt((counts * (values - mean) ** 2).sum() / (n - 1)),
+    }
+
+
+def draw_histogram(ax, capped: np.ndarray, color: str, log: bool = False):
+    """Bars of width 1 at 1..cap (+ an empty one), as ax.hist would bin them."""
+    heights = np.append(capped[1:], 0)
+    ax.bar(
+        np.arange(1, len(capped) + 1),
+        heights,
+        width=1,
+        align="edge",
+        edgecolor="black",
+        alpha=0.7,
+        color=color,
+        log=log,
+    )
+
+
+def load_counts(from_state: Path = None) -> dict:
+    if from_state is None:
+        print("\nLoading reviewer tally data...")
+        return counts_from_tally(pd.read_csv(INPUT_PATH, usecols=COLUMNS))
+
+    print(f"\nLoading reviewer tally state from {from_state}...")
+    with open(from_state, "r", encoding="utf-8") as f:
+        return counts_from_state(json.load(f))
 
-    # Load reviewer tally data
-    print("\nLoading reviewer tally data...")
-    df = pd.read_csv(INPUT_PATH)
-    print(f"  Loaded {len(df):,} reviewers")
+
+def plot_histograms(counts: dict):
+    """Save the combined, single and log-scale figures from bincount counts."""
+    review_stats = summarize_counts(counts["num_reviews"])
+    muni_stats = summarize_counts(counts["unique_municipalities"])
+    reviews_capped = cap_counts(counts["num_reviews"], REVIEW_CAP)
+    municipalities_capped = cap_counts(
+        counts["unique_municipalities"], MUNICIPALITY_CAP
+    )
 
     # Create figure with two subplots
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
@@ -31,16 +123,7 @@ def main():
     # ========== Histogram 1: Number of Reviews (Locations) ==========
     ax1 = axes[0]
 
-    # Cap at 20 for visualization (group 20+ together)
-    reviews_capped = df["num_reviews"].clip(upper=20)
-
-    ax1.hist(
-        reviews_capped,
-        bins=range(1, 23),
-        edgecolor="black",
-        alpha=0.7,
-        color="steelblue",
-    )
+    draw_histogram(ax1, reviews_capped, "steelblue")
     ax1.set_xlabel("Number of Reviews per Reviewer", fontsize=11)
     ax1.set_ylabel("Number of Reviewers", fontsize=11)
     ax1.set_title(
@@ -50,8 +133,8 @@ def main():
     ax1.set_xticklabels([str(i) if i < 20 else "20+" for i in range(1, 22)])
 
     # Add summary stats
-    mean_reviews = df["num_reviews"].mean()
-    median_reviews = df["num_reviews"].median()
+    mean_reviews = review_stats["mean"]
+    median_reviews = review_stats["median"]
     ax1.axvline(
         mean_reviews,
         color="red",
@@ -69,12 +152,12 @@ def main():
     ax1.legend()
 
     # Add count annotations for first few bars
-    counts = reviews_capped.value_counts().sort_index()
-    for i in range(1, min(6, len(counts) + 1)):
-        if i in counts.index:
+    shown = min(6, np.count_nonzero(reviews_capped) + 1)
+    for i in range(1, shown):
+        if reviews_capped[i]:
             ax1.annotate(
-                f"{counts[i]:,}",
-                xy=(i, counts[i]),
+                f"{reviews_capped[i]:,}",
+                xy=(i, reviews_capped[i]),
                 ha="center",
                 va="bottom",
                 fontsize=8,
@@ -83,16 +166,7 @@ def main():
     # ========== Histogram 2: Number of Unique Municipalities ==========
     ax2 = axes[1]
 
-    # Cap at 15 for visualization
-    municipalities_capped = df["unique_municipalities"].clip(upper=15)
-
-    ax2.hist(
-        municipalities_capped,
-        bins=range(1, 18),
-        edgecolor="black",
-        alpha=0.7,
-        color="forestgreen",
-    )
+    draw_histogram(ax2, municipalities_capped, "forestgreen")
     ax2.set_xlabel("Number of Unique Municipalities per Reviewer", fontsize=11)
     ax2.set_ylabel("Number of Reviewers", fontsize=11)
     ax2.set_title(
@@ -104,8 +178,8 @@ def main():
     ax2.set_xticklabels([str(i) if i < 15 else "15+" for i in range(1, 17)])
 
     # Add summary stats
-    mean_muni = df["unique_municipalities"].mean()
-    median_muni = df["unique_municipalities"].median()
+    mean_muni = muni_stats["mean"]
+    median_muni = muni_stats["median"]
     ax2.axvline(
         mean_muni,
         color="red",
@@ -123,12 +197,12 @@ def main():
     ax2.legend()
 
     # Add count annotations for first few bars
-    counts_muni = municipalities_capped.value_counts().sort_index()
-    for i in range(1, min(6, len(counts_muni) + 1)):
-        if i in counts_muni.index:
+    shown = min(6, np.count_nonzero(municipalities_capped) + 1)
+    for i in range(1, shown):
+        if municipalities_capped[i]:
             ax2.annotate(
-                f"{counts_muni[i]:,}",
-                xy=(i, counts_muni[i]),
+                f"{municipalities_capped[i]:,}",
+                xy=(i, municipalities_capped[i]),
                 ha="center",
                 va="bottom",
                 fontsize=8,
@@ -144,13 +218,7 @@ def main():
     # Also save individual figures
     # Figure 1: Reviews histogram
     fig1, ax1_single = plt.subplots(figsize=(10, 6))
-    ax1_single.hist(
-        reviews_capped,
-        bins=range(1, 23),
-        edgecolor="black",
-        alpha=0.7,
-        color="steelblue",
-    )
+    draw_histogram(ax1_single, reviews_capped, "steelblue")
     ax1_single.set_xlabel("Number of Reviews per Reviewer", fontsize=12)
     ax1_single.set_ylabel("Number of Reviewers", fontsize=12)
     ax1_single.set_title(
@@ -183,13 +251,7 @@ def main():
 
     # Figure 2: Municipalities histogram
     fig2, ax2_single = plt.subplots(figsize=(10, 6))
-    ax2_single.hist(
-        municipalities_capped,
-        bins=range(1, 18),
-        edgecolor="black",
-        alpha=0.7,
-        color="forestgreen",
-    )
+    draw_histogram(ax2_single, municipalities_capped, "forestgreen")
     ax2_single.set_xlabel("Number of Unique Municipalities per Reviewer", fontsize=12)
     ax2_single.set_ylabel("Number of Reviewers", fontsize=12)
     ax2_single.set_title(
@@ -228,14 +290,7 @@ def main():
 
     # Log Histogram 1: Number of Reviews
     ax1_log = axes_log[0]
-    ax1_log.hist(
-        reviews_capped,
-        bins=range(1, 23),
-        edgecolor="black",
-        alpha=0.7,
-        color="steelblue",
-        log=True,
-    )
+    draw_histogram(ax1_log, reviews_capped, "steelblue", log=True)
     ax1_log.set_xlabel("Number of Reviews per Reviewer", fontsize=11)
     ax1_log.set_ylabel("Number of Reviewers (Log Scale)", fontsize=11)
     ax1_log.set_title(
@@ -246,14 +301,7 @@ def main():
 
     # Log Histogram 2: Municipalities
     ax2_log = axes_log[1]
-    ax2_log.hist(
-        municipalities_capped,
-        bins=range(1, 18),
-        edgecolor="black",
-        alpha=0.7,
-        color="forestgreen",
-        log=True,
-    )
+    draw_histogram(ax2_log, municipalities_capped, "forestgreen", log=True)
     ax2_log.set_xlabel("Number of Unique Municipalities per Reviewer", fontsize=11)
     ax2_log.set_ylabel("Number of Reviewers (Log Scale)", fontsize=11)
     ax2_log.set_title(
@@ -276,21 +324,44 @@ def main():
     print("=" * 60)
 
     print("\nReview Counts:")
-    print(f"  Mean:   {df['num_reviews'].mean():.2f}")
-    print(f"  Median: {df['num_reviews'].median():.0f}")
-    print(f"  Max:    {df['num_reviews'].max()}")
-    print(f"  Std:    {df['num_reviews'].std():.2f}")
+    print(f"  Mean:   {review_stats['mean']:.2f}")
+    print(f"  Median: {review_stats['median']:.0f}")
+    print(f"  Max:    {review_stats['max']}")
+    print(f"  Std:    {review_stats['std']:.2f}")
 
     print("\nMunicipality Counts:")
-    print(f"  Mean:   {df['unique_municipalities'].mean():.2f}")
-    print(f"  Median: {df['unique_municipalities'].median():.0f}")
-    print(f"  Max:    {df['unique_municipalities'].max()}")
-    print(f"  Std:    {df['unique_municipalities'].std():.2f}")
+    print(f"  Mean:   {muni_stats['mean']:.2f}")
+    print(f"  Median: {muni_stats['median']:.0f}")
+    print(f"  Max:    {muni_stats['max']}")
+    print(f"  Std:    {muni_stats['std']:.2f}")
 
     print("\n" + "=" * 60)
     print("Done!")
     print("=" * 60)
 
 
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--from-state",
+        nargs="?",
+        type=Path,
+        const=reviewer_tally.STATE_PATH,
+        help=(
+            "Read counts from a saved reviewer tally state instead of "
+            f"reviewer_tally.csv (default: {reviewer_tally.STATE_PATH.name})"
+        ),
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Generating Reviewer Activity Histograms")
+    print("=" * 60)
+
+    counts = load_counts(args.from_state)
+    print(f"  Loaded {counts['num_reviews'].sum():,} reviewers")
+    plot_histograms(counts)
+
+
 if __name__ == "__main__":
     main()
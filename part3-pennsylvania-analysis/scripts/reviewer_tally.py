@@ -1,29 +1,275 @@
 """
 Tally statistics for each reviewer in the brewpub dataset.
+
+With --incremental the per-reviewer counts and municipality sets are kept in
+reviewer_tally_state.json together with how far into the merged CSV they go.
+After merge_brewery_reviews.py --incremental appends reviews, only the new
+rows are read and folded into the saved state.
+
+The same state can be built without reading the merged CSV back in at all:
+merge_brewery_reviews.py --tally feeds each batch of rows it writes to a
+StreamingTally, and --stream here folds the CSV in chunks instead of loading
+it whole. Both give a reviewer_tally.csv byte-identical to the default mode.
 """
 
-import pandas as pd
+import argparse
+import csv
+import hashlib
+import json
 from pathlib import Path
 
+import pandas as pd
+
+import columnar_cache
+import review_writer
+
 # Paths
 OUTPUT_DIR = Path(__file__).parent.parent / "outputs"
 INPUT_PATH = OUTPUT_DIR / "brewpub_reviews_with_meta.csv"
 OUTPUT_PATH = OUTPUT_DIR / "reviewer_tally.csv"
+STATE_PATH = OUTPUT_DIR / "reviewer_tally_state.json"
 
+# Bytes of the merged CSV hashed at its start and before the tallied offset,
+# to tell an appended CSV from a regenerated one
+STATE_HASH_BYTES = 64 * 1024
 
-def main():
-    print("=" * 60)
-    print("Reviewer Tally Analysis")
-    print("=" * 60)
+# Strings pd.read_csv reads as missing by default (its documented na_values)
+CSV_NA_VALUES = {
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+}
 
-    # Load data
-    print("\nLoading brewpub reviews...")
-    df = pd.read_csv(INPUT_PATH)
-    print(f"  Loaded {len(df):,} reviews")
+# Rows per chunk with --stream
+CHUNK_ROWS = 500_000
 
-    # Aggregate by reviewer (using user_id only - users can change display names)
-    print("\nCalculating reviewer statistics...")
+# Only these columns are needed for the tally
+COLUMNS = [
+    "review_user_id",
+    "review_user_name",
+    "rating",
+    "municipality",
+    "has_response",
+]
+
+
+def csv_fingerprint(path: Path, offset: int) -> dict:
+    """Hashes of the CSV's first bytes and of the bytes just before offset."""
+    with open(path, "rb") as f:
+        head = f.read(min(offset, STATE_HASH_BYTES))
+        f.seek(max(0, offset - STATE_HASH_BYTES))
+        tail = f.read(offset - max(0, offset - STATE_HASH_BYTES))
+    return {
+        "offset": offset,
+        "head_sha256": hashlib.sha256(head).hexdigest(),
+        "tail_sha256": hashlib.sha256(tail).hexdigest(),
+    }
+
+
+def load_state(state_path: Path, input_path: Path) -> dict:
+    """
+    Saved tally state, or an empty one if there is none or the merged CSV
+    was regenerated (not just appended to) since it was saved.
+    """
+    empty = {"input_path": str(input_path), "offset": None, "reviewers": {}}
+    if not Path(state_path).exists():
+        print("  No saved tally state - tallying the whole file")
+        return empty
+
+    with open(state_path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    offset = state["offset"]
+    if (
+        state["input_path"] != str(input_path)
+        or Path(input_path).stat().st_size < offset
+        or csv_fingerprint(input_path, offset) != state["fingerprint"]
+    ):
+        print("  Merged CSV was regenerated - tallying the whole file")
+        return empty
+    return state
+
+
+def read_new_rows(input_path: Path, offset: int) -> pd.DataFrame:
+    """
+    Rows of the merged CSV from byte offset on (None: the whole file).
+
+    A compressed merge output is appended to in whole gzip members / zstd
+    frames, so the new rows of one start at a member boundary too.
+    """
+    with review_writer.open_text(input_path) as f:
+        header = next(csv.reader(f))
+    if offset is None:
+        return columnar_cache.read_merged_csv(input_path, COLUMNS)
+
+    compression = review_writer.compression_of(input_path)
+
+    with open(input_path, "rb") as f:
+        f.seek(offset)
+        if not f.read(1):
+            return pd.DataFrame(columns=COLUMNS)
+        f.seek(offset)
+        df = pd.read_csv(
+            f,
+            header=None,
+            names=header,
+            usecols=COLUMNS,
+            dtype=columnar_cache.merged_csv_dtypes(COLUMNS),
+            compression=None if compression == "none" else compression,
+        )
+        return columnar_cache.apply_merged_schema(df)
+
+
+def rows_frame(rows: list, fieldnames: list) -> pd.DataFrame:
+    """
+    The COLUMNS of merge output rows (tuples in fieldnames order), with the
+    values read_csv would give after a round trip through the CSV: strings
+    it reads as missing ("", "NA", "None", ...) become None.
+    """
+
+    def read_back(value):
+        if value is None:
+            return None
+        text = str(value)
+        return None if text in CSV_NA_VALUES else text
+
+    values = list(zip(*rows))
+    columns = {
+        column: [read_back(value) for value in values[fieldnames.index(column)]]
+        for column in COLUMNS
+        if column != "has_response"
+    }
+    # Written as True/False, never missing
+    columns["has_response"] = list(values[fieldnames.index("has_response")])
+    return pd.DataFrame(columns, columns=COLUMNS)
+
+
+def update_state(state: dict, df: pd.DataFrame):
+    """
+    Fold new reviews into the per-reviewer state.
+
+    Each reviewer keeps [name, num_reviews, num_responses, municipalities],
+    which is enough to give the same numbers as the groupby in tally(): the
+    first non-missing name, the count of ratings, the response count and the
+    number of distinct municipalities.
+    """
+    reviewers = state["reviewers"]
+    df = df[df["review_user_id"].notna()]
+    grouped = df.groupby("review_user_id", sort=False).agg(
+        review_user_name=("review_user_name", "first"),
+        num_reviews=("rating", "count"),
+        num_responses=("has_response", "sum"),
+    )
+    # Distinct (reviewer, municipality) pairs, collected in one pass
+    pairs = df[["review_user_id", "municipality"]].dropna().drop_duplicates()
+    visited = {}
+    for user_id, municipality in zip(
+        pairs["review_user_id"].tolist(), pairs["municipality"].tolist()
+    ):
+        visited.setdefault(user_id, []).append(municipality)
+
+    for user_id, name, num_reviews, num_responses in zip(
+        grouped.index.tolist(),
+        grouped["review_user_name"].tolist(),
+        grouped["num_reviews"].tolist(),
+        grouped["num_responses"].tolist(),
+    ):
+        entry = reviewers.setdefault(user_id, [None, 0, 0, []])
+        if entry[0] is None and pd.notna(name):
+            entry[0] = name
+        entry[1] += int(num_reviews)
+        entry[2] += int(num_responses)
+        new = set(visited.get(user_id, ())).difference(entry[3])
+        if new:
+            entry[3] = sorted(new.union(entry[3]))
 
+
+def save_state(state: dict, state_path: Path, input_path: Path, offset: int):
+    state["offset"] = offset
+    state["fingerprint"] = csv_fingerprint(input_path, offset)
+    tmp_path = Path(str(state_path) + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        # dumps() runs the C encoder in one go, json.dump() does not
+        f.write(json.dumps(state))
+    tmp_path.replace(state_path)
+
+
+def stats_from_state(state: dict) -> pd.DataFrame:
+    """Per-reviewer aggregates from the saved state, as tally() groups them."""
+    # groupby sorts the user ids, which are read as strings
+    user_ids = sorted(state["reviewers"])
+    entries = [state["reviewers"][user_id] for user_id in user_ids]
+    return pd.DataFrame(
+        {
+            "review_user_id": user_ids,
+            "review_user_name": [entry[0] for entry in entries],
+            "num_reviews": [entry[1] for entry in entries],
+            "unique_municipalities": [len(entry[3]) for entry in entries],
+            "num_responses": [entry[2] for entry in entries],
+        }
+    )
+
+
+def stream_state(input_path: Path, chunk_rows: int = CHUNK_ROWS) -> dict:
+    """Tally state of the whole merged CSV, folded in chunk_rows chunks."""
+    state = {"input_path": str(input_path), "offset": None, "reviewers": {}}
+    chunks = pd.read_csv(
+        input_path,
+        usecols=COLUMNS,
+        dtype=columnar_cache.merged_csv_dtypes(COLUMNS),
+        chunksize=chunk_rows,
+    )
+    for chunk in chunks:
+        update_state(state, columnar_cache.apply_merged_schema(chunk))
+    return state
+
+
+class StreamingTally:
+    """
+    Reviewer tally kept up to date while the merged CSV is being written.
+
+    Created once the output file holds everything written before this run
+    (the header, or the rows kept on --resume / --incremental). The saved
+    state is brought up to that point first: rows it does not cover yet are
+    read from the file, so only those are ever read back. Each batch of rows
+    written afterwards goes to add_rows().
+    """
+
+    def __init__(self, input_path: Path, fieldnames: list, state_path: Path = None):
+        self.input_path = Path(input_path)
+        self.fieldnames = list(fieldnames)
+        self.state_path = Path(state_path or STATE_PATH)
+        self.state = load_state(self.state_path, self.input_path)
+        update_state(self.state, read_new_rows(self.input_path, self.state["offset"]))
+
+    def add_rows(self, rows: list):
+        if rows:
+            update_state(self.state, rows_frame(rows, self.fieldnames))
+
+    def finish(self, output_path: Path = None) -> pd.DataFrame:
+        """Save the state for the file as written and write the tally CSV."""
+        offset = self.input_path.stat().st_size
+        save_state(self.state, self.state_path, self.input_path, offset)
+        return write_tally(stats_from_state(self.state), output_path or OUTPUT_PATH)
+
+
+def tally(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-reviewer aggregates of the merged reviews."""
     reviewer_stats = (
         df.groupby("review_user_id")
         .agg(
@@ -37,7 +283,11 @@ def main():
         )
         .reset_index()
     )
+    return reviewer_stats
 
+
+def write_tally(reviewer_stats: pd.DataFrame, output_path: Path) -> pd.DataFrame:
+    """Add response rates, sort by review count and save as reviewer_tally.csv."""
     # Convert has_response sum to integer
     reviewer_stats["num_responses"] = reviewer_stats["num_responses"].astype(int)
 
@@ -61,8 +311,58 @@ def main():
         ]
     ]
 
+    reviewer_stats.to_csv(output_path, index=False)
+    return reviewer_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Update the tally from rows appended to the merged CSV since the "
+        f"last --incremental run ({STATE_PATH.name})",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=f"Read the merged CSV in chunks of {CHUNK_ROWS:,} rows instead of "
+        "loading it whole",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Reviewer Tally Analysis")
+    print("=" * 60)
+
+    # Aggregate by reviewer (using user_id only - users can change display names)
+    if args.incremental:
+        print("\nLoading tally state...")
+        input_path = review_writer.find_output(INPUT_PATH)
+        state = load_state(STATE_PATH, input_path)
+        offset = input_path.stat().st_size
+        df = read_new_rows(input_path, state["offset"])
+        print(f"  Loaded {len(df):,} new reviews")
+
+        print("\nUpdating reviewer statistics...")
+        update_state(state, df)
+        save_state(state, STATE_PATH, input_path, offset)
+        reviewer_stats = stats_from_state(state)
+    elif args.stream:
+        print("\nTallying brewpub reviews in chunks...")
+        state = stream_state(review_writer.find_output(INPUT_PATH))
+        reviewer_stats = stats_from_state(state)
+    else:
+        # Load data
+        print("\nLoading brewpub reviews...")
+        df = columnar_cache.read_merged(COLUMNS, INPUT_PATH)
+        print(f"  Loaded {len(df):,} reviews")
+
+        print("\nCalculating reviewer statistics...")
+        reviewer_stats = tally(df)
+
     # Save to CSV
-    reviewer_stats.to_csv(OUTPUT_PATH, index=False)
+    reviewer_stats = write_tally(reviewer_stats, OUTPUT_PATH)
     print(f"\nSaved to: {OUTPUT_PATH}")
 
     # Summary statistics